@@ -0,0 +1,125 @@
+"""Payload size and serialization time of the query result formats.
+
+Compares the default row-object response of ``POST /dbs/{name}/query``
+with ``?format=columnar`` on a result of 1000 rows by 50 columns, timing
+everything from the raw driver rows to the encoded response body.
+
+Usage (from the backend directory, with the application's .env in place):
+    uv run python -m benchmarks.result_formats [--rows 1000] [--columns 50] [--repeat 20]
+"""
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy import create_engine, text
+
+from src.models.query import ColumnarQueryResponse, QueryResponse
+from src.services.query_service import QueryService
+
+
+def _result(rows: int, columns: int) -> list[Any]:
+    """Build a result of integer, float, text and nullable columns."""
+    kinds = ("INTEGER", "REAL", "TEXT", "TEXT")
+    definitions = ", ".join(f"c{i} {kinds[i % len(kinds)]}" for i in range(columns))
+    values = {
+        "INTEGER": lambda r, c: r * c,
+        "REAL": lambda r, c: r / (c + 1),
+        "TEXT": lambda r, c: None if c % 8 == 3 and r % 5 == 0 else f"value {r}-{c}",
+    }
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE TABLE bench ({definitions})"))
+        placeholders = ", ".join(f":c{i}" for i in range(columns))
+        conn.execute(
+            text(f"INSERT INTO bench VALUES ({placeholders})"),
+            [
+                {f"c{c}": values[kinds[c % len(kinds)]](r, c) for c in range(columns)}
+                for r in range(rows)
+            ],
+        )
+        result = list(conn.execute(text("SELECT * FROM bench")).fetchall())
+    engine.dispose()
+    return result
+
+
+def _render(response: BaseModel) -> bytes:
+    """Encode a response the way FastAPI's JSONResponse does."""
+    content = response.model_dump(mode="json", by_alias=True)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _rows_response(service: QueryService, result: list[Any]) -> bytes:
+    """Build and encode the default response."""
+    columns, rows = service._serialize_results(result)
+    return _render(
+        QueryResponse(
+            success=True,
+            executed_sql="SELECT * FROM bench LIMIT 1000",
+            row_count=len(rows),
+            execution_time_ms=0,
+            columns=columns,
+            rows=rows,
+            has_limit=True,
+            limit_value=1000,
+        )
+    )
+
+
+def _columnar_response(service: QueryService, result: list[Any]) -> bytes:
+    """Build and encode the columnar response."""
+    columns, values = service._serialize_columns(result)
+    return _render(
+        ColumnarQueryResponse(
+            success=True,
+            executed_sql="SELECT * FROM bench LIMIT 1000",
+            row_count=len(result),
+            execution_time_ms=0,
+            columns=columns,
+            values=values,
+            has_limit=True,
+            limit_value=1000,
+        )
+    )
+
+
+def _best_ms(build: Callable[[], bytes], repeat: int) -> float:
+    """Return the fastest of ``repeat`` runs in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        build()
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000, help="rows in the result")
+    parser.add_argument("--columns", type=int, default=50, help="columns in the result")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per measurement")
+    args = parser.parse_args()
+
+    service = QueryService()
+    result = _result(args.rows, args.columns)
+    measured = []
+    for label, build in (("rows", _rows_response), ("columnar", _columnar_response)):
+        size = len(build(service, result))
+        ms = _best_ms(lambda build=build: build(service, result), args.repeat)
+        measured.append((label, size, ms))
+
+    _, base_size, base_ms = measured[0]
+    print(f"{args.rows} rows x {args.columns} columns")
+    print(f"{'format':<10}{'bytes':>12}{'size':>8}{'ms':>10}{'time':>8}")
+    for label, size, ms in measured:
+        print(f"{label:<10}{size:>12,}{size / base_size:>8.0%}{ms:>10.1f}{ms / base_ms:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
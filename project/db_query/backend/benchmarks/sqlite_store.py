@@ -0,0 +1,115 @@
+"""Throughput benchmark for the internal SQLite store.
+
+Compares the pooled ``SQLiteDB`` against the previous connection-per-call
+access pattern for query-history inserts and database lookups.
+
+Usage (from the backend directory, with the application's .env in place):
+    uv run python -m benchmarks.sqlite_store [--ops 2000] [--concurrency 16]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+import aiosqlite
+
+from src.core.sqlite_db import SQLiteDB
+
+_INSERT_HISTORY = """
+    INSERT INTO query_history (
+        database_id, database_name, query_type, input_text, executed_sql,
+        row_count, execution_time_ms, status
+    )
+    VALUES (1, 'bench', 'sql', 'SELECT 1', 'SELECT 1 LIMIT 1000', 1, 3, 'success')
+"""
+_LOOKUP = "SELECT * FROM databases WHERE name = :name"
+
+
+class PerCallSQLiteDB(SQLiteDB):
+    """The store as it was: a fresh connection for every statement.
+
+    Every connection, including the one ``initialize_schema`` creates the
+    schema on, is opened without the pooled store's PRAGMAs, so the file
+    stays in rollback-journal mode with full syncs as it used to.
+    """
+
+    async def connect(self, read_only: bool = False) -> aiosqlite.Connection:
+        conn = await aiosqlite.connect(self.db_path)
+        await conn.execute("PRAGMA foreign_keys = ON")
+        conn.row_factory = aiosqlite.Row
+        return conn
+
+    async def execute(self, sql: str, params: dict[str, Any] | None = None) -> aiosqlite.Cursor:
+        conn = await self.connect()
+        try:
+            cursor = await conn.execute(sql, params or {})
+            await conn.commit()
+            return cursor
+        finally:
+            await conn.close()
+
+    async def fetch_one(
+        self, sql: str, params: dict[str, Any] | None = None
+    ) -> dict[str, Any] | None:
+        conn = await self.connect()
+        try:
+            cursor = await conn.execute(sql, params or {})
+            row = await cursor.fetchone()
+            return dict(row) if row else None
+        finally:
+            await conn.close()
+
+
+async def _throughput(
+    operation: Callable[[], Awaitable[Any]], ops: int, concurrency: int
+) -> float:
+    """Run ``ops`` operations from ``concurrency`` workers and return ops/second."""
+    remaining = ops
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await operation()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return ops / (time.perf_counter() - started)
+
+
+async def _run(store: SQLiteDB, ops: int, concurrency: int) -> tuple[float, float]:
+    """Benchmark history inserts and lookups on a freshly initialized store."""
+    await store.initialize_schema()
+    await store.execute(
+        "INSERT INTO databases (id, name, url, db_type) VALUES (1, 'bench', 'sqlite://', 'sqlite')"
+    )
+    inserts = await _throughput(lambda: store.execute(_INSERT_HISTORY), ops, concurrency)
+    lookups = await _throughput(
+        lambda: store.fetch_one(_LOOKUP, {"name": "bench"}), ops, concurrency
+    )
+    await store.close()
+    return inserts, lookups
+
+
+async def main() -> None:
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=2000, help="operations per measurement")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent workers")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before = await _run(PerCallSQLiteDB(Path(tmp) / "per_call.db"), args.ops, args.concurrency)
+        after = await _run(SQLiteDB(Path(tmp) / "pooled.db"), args.ops, args.concurrency)
+
+    print(f"{'operation':<18}{'per-call ops/s':>16}{'pooled ops/s':>16}{'speedup':>10}")
+    for label, old, new in zip(("history insert", "lookup by name"), before, after, strict=True):
+        print(f"{label:<18}{old:>16,.0f}{new:>16,.0f}{new / old:>9.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
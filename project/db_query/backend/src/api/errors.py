@@ -5,6 +5,10 @@ from typing import Any
 
 from fastapi import HTTPException, status
 
+from ..core.admission import AdmissionRejectedError
+from ..core.query_executor import ExecutorSaturatedError
+from ..core.result_spool import ResultSpoolFullError
+
 
 class ErrorCode(str, Enum):
     """Standard error codes for API responses."""
@@ -14,6 +18,7 @@ class ErrorCode(str, Enum):
     SQL_SYNTAX_ERROR = "SQL_SYNTAX_ERROR"
     INVALID_STATEMENT_TYPE = "INVALID_STATEMENT_TYPE"
     INVALID_QUERY_TYPE = "INVALID_QUERY_TYPE"
+    NOT_ACCEPTABLE = "NOT_ACCEPTABLE"
 
     # Not found errors (404)
     DATABASE_NOT_FOUND = "DATABASE_NOT_FOUND"
@@ -22,6 +27,13 @@ class ErrorCode(str, Enum):
     # Rate limiting (429)
     RATE_LIMIT_EXCEEDED = "RATE_LIMIT_EXCEEDED"
     REQUEST_TOO_LARGE = "REQUEST_TOO_LARGE"
+    DATABASE_OVERLOADED = "DATABASE_OVERLOADED"
+
+    # Overload (503)
+    DATABASE_BUSY = "DATABASE_BUSY"
+
+    # Insufficient storage (507)
+    RESULT_SPOOL_FULL = "RESULT_SPOOL_FULL"
 
     # Server errors (5xx)
     QUERY_EXECUTION_ERROR = "QUERY_EXECUTION_ERROR"
@@ -106,6 +118,28 @@ def handle_api_error(e: Exception) -> HTTPException:
             detail={"code": ErrorCode.VALIDATION_ERROR, "message": error_msg},
         )
 
+    # For a query the database's admission control turned away
+    if isinstance(e, AdmissionRejectedError):
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail={"code": ErrorCode.DATABASE_OVERLOADED, "message": str(e)},
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+    # For a saturated per-database executor
+    if isinstance(e, ExecutorSaturatedError):
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"code": ErrorCode.DATABASE_BUSY, "message": str(e)},
+        )
+
+    # For a result that does not fit in the result spool's disk quota
+    if isinstance(e, ResultSpoolFullError):
+        return HTTPException(
+            status_code=status.HTTP_507_INSUFFICIENT_STORAGE,
+            detail={"code": ErrorCode.RESULT_SPOOL_FULL, "message": str(e)},
+        )
+
     # For TimeoutError
     if isinstance(e, TimeoutError):
         return HTTPException(
@@ -2,14 +2,20 @@
 
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 
 from ..core.config import get_config
+from ..core.engine_registry import get_engine_registry
 from ..core.logging import configure_logging, get_logger
-from ..core.sqlite_db import initialize_database
+from ..core.query_executor import get_query_executors
+from ..core.result_spool import get_result_spool
+from ..core.sqlite_db import get_db, initialize_database
+
+if TYPE_CHECKING:
+    from ..services.warmup_service import WarmupService
 
 # Configure structured logging
 config = get_config()
@@ -23,6 +29,9 @@ logger = get_logger(__name__)
 # Global reference to metrics service
 _metrics_service: Any | None = None
 
+# Global reference to the startup warm-up service
+_warmup_service: "WarmupService | None" = None  # noqa: UP037 - only imported for type checking
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
@@ -34,29 +43,63 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     Yields:
         None
     """
-    global _metrics_service
+    global _metrics_service, _warmup_service
 
     # Startup
     logger.info("application_starting", log_level=config.log_level)
     await initialize_database()
 
+    # Engines are shared across requests and live as long as the application
+    engine_registry = get_engine_registry()
+    await engine_registry.start()
+
+    # History records are written behind the queries that produce them
+    from ..services.history_writer import get_history_writer
+
+    history_writer = get_history_writer()
+    await history_writer.start()
+
+    # Expire server-side result sets and their spill files in the background
+    result_spool = get_result_spool()
+    await result_spool.start()
+
     # Start metrics collection service
     from ..services.metrics_service import MetricsService
 
     _metrics_service = MetricsService()
     await _metrics_service.start_collection()
+
+    # Expire old history in the background
+    from ..services.retention_service import get_retention_service
+
+    retention_service = get_retention_service()
+    retention_service.retention_days = config.retention_days
+    if config.retention_enabled:
+        await retention_service.start()
+
+    # Warm up pools and metadata in the background; readiness waits for it
+    from ..services.warmup_service import WarmupService
+
+    _warmup_service = WarmupService(concurrency=config.warmup_concurrency)
+    if config.warmup_on_startup:
+        await _warmup_service.start()
+    else:
+        _warmup_service.mark_ready()
     logger.info("application_started")
     yield
     # Shutdown - cleanup database connections (M-5)
     logger.info("application_shutting_down")
-    from ..services.db_service import DatabaseService
-
-    db_service = DatabaseService()
-    await db_service.close()
+    await _warmup_service.stop()
+    await retention_service.stop()
+    get_query_executors().shutdown_all()
+    await engine_registry.close()
+    await result_spool.close()
 
     # Stop metrics collection
     if _metrics_service:
         await _metrics_service.stop_collection()
+    await history_writer.stop()
+    await get_db().close()
     logger.info("database_connections_closed")
 
 app = FastAPI(
@@ -116,6 +159,27 @@ async def health() -> dict[str, Any]:
     return {"status": "healthy", "timestamp": "unknown"}
 
 
+@app.get("/health/ready")
+async def readiness(response: Response) -> dict[str, Any]:
+    """Readiness check endpoint.
+
+    Unlike ``/health`` (liveness), this returns 503 until startup warm-up has
+    finished, so load balancers only route traffic to a warm instance.
+
+    Args:
+        response: The response, used to set the status code.
+
+    Returns:
+        Readiness status and warm-up progress.
+    """
+    if _warmup_service is None:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "starting"}
+    if not _warmup_service.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return _warmup_service.get_status()
+
+
 def get_metrics_service() -> Any:
     """Get the global metrics service instance.
 
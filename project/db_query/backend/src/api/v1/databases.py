@@ -107,6 +107,19 @@ async def create_database(
     }
     ```
 
+    ## Connection Pool Settings (optional)
+
+    - **poolSize**: Connections kept open in the pool (1-100)
+    - **maxOverflow**: Extra connections allowed under load (0-100)
+    - **poolTimeout**: Seconds to wait for a free connection (1-300)
+    - **poolRecycle**: Seconds after which a connection is replaced
+    - **poolPrePing**: Check connections for liveness before use
+    - **poolClass**: `queue`, `null`, `static` or `singleton_thread`
+
+    Sizing options apply to queue pools. SQLite targets keep SQLAlchemy's
+    default pool unless `poolClass` is set. The same fields can be changed
+    later with `PATCH /dbs/{name}`.
+
     ## Validation Rules
 
     - **name**: 1-100 characters, must be unique
@@ -156,11 +169,9 @@ async def get_database(
     try:
         database = await db_service.get_database_by_name(name)
 
-        # Get metadata
-        from sqlalchemy import create_engine
-
+        # Get metadata through the shared, pooled engine
         connection_url = await db_service.get_connection_url_with_driver(name)
-        engine = create_engine(connection_url)
+        engine = db_service.get_query_engine(database.id, connection_url, database)
 
         metadata = await metadata_service.fetch_metadata(database, engine, force_refresh=refresh)
 
@@ -245,10 +256,8 @@ async def get_database_metadata(
     try:
         database = await db_service.get_database_by_name(name)
 
-        from sqlalchemy import create_engine
-
         connection_url = await db_service.get_connection_url_with_driver(name)
-        engine = create_engine(connection_url)
+        engine = db_service.get_query_engine(database.id, connection_url, database)
 
         return await metadata_service.fetch_metadata(database, engine, force_refresh=refresh)
 
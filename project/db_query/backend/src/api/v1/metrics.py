@@ -4,9 +4,15 @@ from typing import Any
 
 from fastapi import APIRouter, Depends, Query
 
+from ...core.admission import get_admission_controllers
 from ...core.constants import Performance
+from ...core.query_executor import get_query_executors
+from ...core.result_cache import get_result_cache
+from ...core.result_spool import get_result_spool
+from ...core.single_flight import get_single_flight
 from ...lib.json_encoder import CamelModel
 from ...services.metrics_service import MetricsService
+from ...services.retention_service import get_retention_service
 
 router = APIRouter()
 
@@ -46,11 +52,20 @@ class QueryPerformanceStatsResponse(CamelModel):
     avg_execution_time_ms: float
     min_execution_time_ms: int
     max_execution_time_ms: int
+    p50_execution_time_ms: float
+    p95_execution_time_ms: float
+    p99_execution_time_ms: float
     total_rows: int
     slow_queries: int
     slow_query_rate: float
 
 
+class DatabaseQueryPerformanceStatsResponse(QueryPerformanceStatsResponse):
+    """Response model for the query performance statistics of one database."""
+
+    database_name: str
+
+
 class SystemMetricsResponse(CamelModel):
     """Response model for system metrics."""
 
@@ -61,6 +76,67 @@ class SystemMetricsResponse(CamelModel):
     process: dict[str, Any]
 
 
+class ExecutorStatsResponse(CamelModel):
+    """Response model for a per-database query executor."""
+
+    database_name: str
+    max_workers: int
+    active_workers: int
+    max_queue: int
+    queue_depth: int
+    completed: int
+    rejected: int
+    avg_wait_ms: float
+    max_wait_ms: float
+
+
+class AdmissionStatsResponse(CamelModel):
+    """Response model for per-database admission control."""
+
+    database_name: str
+    max_concurrent: int
+    active: int
+    max_queue: int
+    queue_depth: int
+    max_wait_seconds: float
+    admitted: int
+    rejected: int
+
+
+class ResultCacheStatsResponse(CamelModel):
+    """Response model for the query result cache."""
+
+    entries: int
+    bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    hit_ratio: float | None
+    evictions: int
+
+
+class ResultSpoolStatsResponse(CamelModel):
+    """Response model for the server-side result sets."""
+
+    results: int
+    max_results: int
+    rows: int
+    memory_bytes: int
+    spilled_results: int
+    disk_bytes: int
+    disk_quota: int
+    ttl_seconds: float
+
+
+class CoalescingStatsResponse(CamelModel):
+    """Response model for the coalescing of identical concurrent queries."""
+
+    in_flight: int
+    executions: int
+    coalesced: int
+    coalesced_ratio: float | None
+
+
 def get_metrics_service() -> MetricsService:
     """Dependency to get the metrics service instance.
 
@@ -151,7 +227,7 @@ async def get_query_performance_stats(
         metrics_service: The metrics service instance.
 
     Returns:
-        Query performance statistics.
+        Query performance statistics, including latency percentiles.
     """
     return await metrics_service.get_query_performance_stats(
         database_name=database_name,
@@ -159,6 +235,77 @@ async def get_query_performance_stats(
     )
 
 
+@router.get(
+    "/query-performance/databases",
+    response_model=list[DatabaseQueryPerformanceStatsResponse],
+    tags=["metrics"],
+)
+async def get_query_performance_by_database(
+    hours: int = Query(24, description="Number of hours to look back", ge=1, le=720),
+    metrics_service: MetricsService = Depends(get_metrics_service),
+) -> list[dict[str, Any]]:
+    """Get query performance statistics for each database.
+
+    Args:
+        hours: Number of hours to look back.
+        metrics_service: The metrics service instance.
+
+    Returns:
+        Per-database query performance statistics, busiest database first.
+    """
+    return await metrics_service.get_query_performance_by_database(hours=hours)
+
+
+@router.get("/executors", response_model=list[ExecutorStatsResponse], tags=["metrics"])
+async def get_executor_stats() -> list[dict[str, Any]]:
+    """Get load statistics for the per-database query executors.
+
+    Returns:
+        Worker usage, queue depth and queue wait times for each database.
+    """
+    return get_query_executors().stats()
+
+
+@router.get("/admission", response_model=list[AdmissionStatsResponse], tags=["metrics"])
+async def get_admission_stats() -> list[dict[str, Any]]:
+    """Get admission control statistics for each database.
+
+    Returns:
+        Running queries, queue depth and rejections for each database.
+    """
+    return get_admission_controllers().stats()
+
+
+@router.get("/result-cache", response_model=ResultCacheStatsResponse, tags=["metrics"])
+async def get_result_cache_stats() -> dict[str, Any]:
+    """Get query result cache statistics.
+
+    Returns:
+        Cached results, their estimated size, and hit and miss counts.
+    """
+    return get_result_cache().stats()
+
+
+@router.get("/result-spool", response_model=ResultSpoolStatsResponse, tags=["metrics"])
+async def get_result_spool_stats() -> dict[str, Any]:
+    """Get statistics on the server-side result sets kept for paging.
+
+    Returns:
+        Results held, their rows, and the memory and disk they use.
+    """
+    return get_result_spool().stats()
+
+
+@router.get("/coalescing", response_model=CoalescingStatsResponse, tags=["metrics"])
+async def get_coalescing_stats() -> dict[str, Any]:
+    """Get statistics on identical concurrent queries sharing one execution.
+
+    Returns:
+        Running executions, executions started and queries that joined one.
+    """
+    return get_single_flight().stats()
+
+
 @router.get("/system", response_model=SystemMetricsResponse, tags=["metrics"])
 async def get_system_metrics(
     metrics_service: MetricsService = Depends(get_metrics_service),
@@ -205,6 +352,19 @@ class MetricsCleanupResponse(CamelModel):
 
     deleted_count: int
     days_retained: int
+    chunks: int
+    reclaimed_bytes: int
+    duration_ms: int
+
+
+@router.get("/retention", tags=["metrics"])
+async def get_retention_status() -> dict[str, Any]:
+    """Get the status of the background history retention job.
+
+    Returns:
+        Retention settings, the progress of a running job and the last result.
+    """
+    return get_retention_service().get_status()
 
 
 @router.post("/cleanup", response_model=MetricsCleanupResponse, tags=["metrics"])
@@ -215,21 +375,25 @@ async def cleanup_old_metrics(
         ge=1,
         le=365,
     ),
-    metrics_service: MetricsService = Depends(get_metrics_service),
 ) -> dict[str, Any]:
     """Clean up old metrics from the database.
 
+    Runs the retention job immediately: history is deleted in short
+    chunks and the freed space is returned to the file system.
+
     Args:
         days: Number of days to retain metrics.
-        metrics_service: The metrics service instance.
 
     Returns:
-        Number of records deleted.
+        Number of records deleted, chunks used and bytes reclaimed.
     """
-    deleted_count = await metrics_service.cleanup_old_metrics(days=days)
+    result = await get_retention_service().run(retention_days=days)
     return {
-        "deleted_count": deleted_count,
+        "deleted_count": result["deleted_rows"],
         "days_retained": days,
+        "chunks": result["chunks"],
+        "reclaimed_bytes": result["reclaimed_bytes"],
+        "duration_ms": result["duration_ms"],
     }
 
 
@@ -1,17 +1,29 @@
 """Query execution endpoints."""
 
+import json
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Any, Literal, cast
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from ...core.constants import Pagination
+from ...core.constants import Query as QueryConstants
 from ...middleware.rate_limit import limiter
 from ...models.query import (
+    CacheMode,
+    ColumnarQueryResponse,
     ExportRequest,
     NaturalQueryRequest,
     NaturalQueryResponse,
     QueryHistoryResponse,
+    QueryHistorySearchResponse,
     QueryRequest,
     QueryResponse,
+    ResultFormat,
+    ResultPageResponse,
 )
 from ...services.db_service import DatabaseService
 from ...services.llm_service import LLMService
@@ -43,15 +55,25 @@ class DeleteHistoryRequest(BaseModel):
     status_code=status.HTTP_200_OK,
     summary="Execute SQL query",
     description="Executes a SELECT query on the specified database. Only SELECT queries are allowed for security.",
+    response_model=QueryResponse | ColumnarQueryResponse,
 )
 @limiter.limit("30/minute")  # type: ignore[untyped-decorator]
 async def execute_query(
     request: Request,
     name: str,
     query_req: QueryRequest,
+    result_format: ResultFormat = Query(
+        "rows", alias="format", description="Row encoding: rows (objects) or columnar (arrays)"
+    ),
+    cache: CacheMode = Query(
+        "use", description="Result cache use: use, refresh (re-run and store) or bypass"
+    ),
+    coalesce: bool = Query(
+        True, description="Share the execution of an identical query that is already running"
+    ),
     db_service: DatabaseService = Depends(get_db_service),
     query_service: QueryService = Depends(get_query_service),
-) -> QueryResponse:
+) -> QueryResponse | ColumnarQueryResponse | StreamingResponse:
     """Execute a SQL query on the database.
 
     ## Query Examples
@@ -95,12 +117,55 @@ async def execute_query(
     - **hasLimit**: Whether LIMIT was present or added
     - **limitValue**: The LIMIT value if present
 
+    ## Arrow Format
+
+    With ``Accept: application/vnd.apache.arrow.stream`` the result is
+    streamed as an Apache Arrow IPC stream instead, with typed columns
+    (integers, floats, decimals, timestamps, ...) converted straight from
+    the driver's values. Queries without a LIMIT get a high one rather than
+    the default of 1000. Requires the server's optional ``arrow`` extra
+    (pyarrow); without it such requests get **406 Not Acceptable** unless
+    they also accept JSON.
+
+    ## Columnar Format
+
+    With ``?format=columnar``, ``rows`` is replaced by **values**: one array
+    per column, in the order of ``columns``, so column names are not
+    repeated in every row. Row ``i`` is ``values[0][i], values[1][i], ...``.
+    For a 1000 x 50 result the body is about a third smaller, more with long
+    column names, and takes about half the time to build.
+
+    ## Result Cache
+
+    When the database has a result cache TTL (``resultCacheTtl``, or the
+    server's ``RESULT_CACHE_TTL``), identical queries within the TTL are
+    served from memory without running them again; queries match if they
+    differ only in formatting. ``cacheStatus`` is ``hit`` (with
+    ``cacheAgeMs``), ``miss``, ``refresh`` or ``bypass``. Pass
+    ``?cache=refresh`` to force a fresh result that replaces the cached one,
+    or ``?cache=bypass`` to leave the cache alone. Cached results are
+    dropped when the database is updated or its metadata is refreshed.
+    Arrow streams are never cached.
+
+    ## Coalescing
+
+    Identical queries (same database, normalized SQL, LIMIT and format)
+    that arrive while one of them is still running share its execution and
+    all receive its result, so a dashboard refreshed by many viewers at
+    once costs the database one query. Pass ``?coalesce=false`` to start an
+    execution of your own when you need a read that begins after your
+    request. Arrow streams are never coalesced.
+
     ## Error Responses
 
     - **400 Bad Request**: Invalid SQL syntax or non-SELECT query
     - **404 Not Found**: Database not found
+    - **406 Not Acceptable**: Arrow requested but not available on this server
     - **422 Unprocessable Entity**: SQL exceeds maximum length (100,000 characters)
+    - **429 Too Many Requests**: Database admission queue full or wait budget exceeded
+      (see the ``Retry-After`` header)
     - **500 Internal Server Error**: Query execution error
+    - **503 Service Unavailable**: Too many queries waiting on this database
 
     ## Rate Limiting
 
@@ -110,11 +175,14 @@ async def execute_query(
         request: The FastAPI request.
         name: The database name.
         query_req: The query request.
+        result_format: The row encoding of JSON responses.
+        cache: How to use the result cache.
+        coalesce: Whether to share the execution of an identical running query.
         db_service: The database service instance.
         query_service: The query service instance.
 
     Returns:
-        The query response.
+        The query response, the columnar query response, or an Arrow stream.
 
     Raises:
         HTTPException: If the database is not found or query fails.
@@ -125,15 +193,351 @@ async def execute_query(
 
         # Get engine with driver
         connection_url = await db_service.get_connection_url_with_driver(name)
-        engine = db_service.get_engine(database.id, connection_url)
+        engine = db_service.get_query_engine(database.id, connection_url, database)
 
         # Execute query
-        return await query_service.execute_query(database, engine, query_req.sql)
+        if _accepts_arrow(request, query_service):
+            return await _arrow_response(
+                query_service.stream_query_arrow(database, engine, query_req.sql)
+            )
+        if result_format == "columnar":
+            return await query_service.execute_query_columnar(
+                database, engine, query_req.sql, cache=cache, coalesce=coalesce
+            )
+        return await query_service.execute_query(
+            database, engine, query_req.sql, cache=cache, coalesce=coalesce
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise handle_api_error(e) from e
+
+
+@router.post(
+    "/dbs/{name}/query/stream",
+    status_code=status.HTTP_200_OK,
+    summary="Stream SQL query results",
+    description="Executes a SELECT query and streams the result as newline-delimited JSON.",
+    response_class=StreamingResponse,
+)
+@limiter.limit("30/minute")  # type: ignore[untyped-decorator]
+async def stream_query(
+    request: Request,
+    name: str,
+    query_req: QueryRequest,
+    db_service: DatabaseService = Depends(get_db_service),
+    query_service: QueryService = Depends(get_query_service),
+) -> StreamingResponse:
+    """Execute a SQL query and stream its result.
+
+    Rows are read from a server-side cursor and sent as they are fetched,
+    so large results neither wait for the whole result nor need to fit in
+    memory. Queries without a LIMIT get a high one rather than the default
+    of 1000.
+
+    ## Response Format
 
+    The body is ``application/x-ndjson``, one JSON object per line:
+    - ``{"type": "header", "columns": [...], "executedSql", "hasLimit", "limitValue"}``
+    - ``{"type": "rows", "rows": [[...], ...]}``, repeated, with rows as arrays
+      in column order
+    - ``{"type": "end", "rowCount", "executionTimeMs"}``
+
+    Errors before the header get the same status codes as
+    ``POST /dbs/{name}/query``. An error after the header ends the stream
+    with ``{"type": "error", "code", "message"}`` instead of an ``end`` line.
+
+    Args:
+        request: The FastAPI request.
+        name: The database name.
+        query_req: The query request.
+        db_service: The database service instance.
+        query_service: The query service instance.
+
+    Returns:
+        The streaming response.
+
+    Raises:
+        HTTPException: If the database is not found or the query fails to start.
+    """
+    try:
+        database = await db_service.get_database_by_name(name)
+        connection_url = await db_service.get_connection_url_with_driver(name)
+        engine = db_service.get_query_engine(database.id, connection_url, database)
+
+        frames = query_service.stream_query(database, engine, query_req.sql)
+        # Run up to the header, so failures to start still get a status code
+        header = await anext(frames)
+    except Exception as e:
+        raise handle_api_error(e) from e
+
+    return StreamingResponse(_ndjson(header, frames), media_type="application/x-ndjson")
+
+
+@router.post(
+    "/dbs/{name}/query/results",
+    status_code=status.HTTP_200_OK,
+    summary="Execute SQL query into a server-side result set",
+    description="Executes a SELECT query once and keeps its result for paging by handle.",
+    response_model=ResultPageResponse,
+)
+@limiter.limit("30/minute")  # type: ignore[untyped-decorator]
+async def spool_query(
+    request: Request,
+    name: str,
+    query_req: QueryRequest,
+    page_size: int = Query(
+        QueryConstants.RESULT_PAGE_SIZE,
+        ge=1,
+        le=QueryConstants.RESULT_PAGE_SIZE_MAX,
+        description="Number of rows in the first page",
+    ),
+    db_service: DatabaseService = Depends(get_db_service),
+    query_service: QueryService = Depends(get_query_service),
+) -> ResultPageResponse:
+    """Execute a SQL query and keep its result on the server.
+
+    The whole result is read once, without the default LIMIT of 1000, and
+    kept in memory up to a budget and, beyond it, written to a local SQLite
+    file as it is fetched. A result that would take the server's spill
+    files over their disk quota fails with **507 Insufficient Storage**.
+    The response is the first page with a **handle**; fetch further pages with
+    ``GET /results/{handle}?cursor=<nextCursor>`` instead of re-running the
+    query with a bigger LIMIT. A result is kept for ``expiresInSeconds``
+    after it was created or a page was last read, or until it is deleted
+    with ``DELETE /results/{handle}``.
+
+    Args:
+        request: The FastAPI request.
+        name: The database name.
+        query_req: The query request.
+        page_size: Rows in the first page.
+        db_service: The database service instance.
+        query_service: The query service instance.
+
+    Returns:
+        The first page of the result.
+
+    Raises:
+        HTTPException: If the database is not found or the query fails.
+    """
+    try:
+        database = await db_service.get_database_by_name(name)
+        connection_url = await db_service.get_connection_url_with_driver(name)
+        engine = db_service.get_query_engine(database.id, connection_url, database)
+
+        return await query_service.spool_query(
+            database, engine, query_req.sql, page_size=page_size
+        )
+    except Exception as e:
+        raise handle_api_error(e) from e
+
+
+@router.get(
+    "/results/{handle}",
+    summary="Get a page of a server-side result set",
+    response_model=ResultPageResponse,
+)
+async def get_result_page(
+    handle: str,
+    cursor: str | None = Query(None, description="Cursor from a previous page's nextCursor"),
+    page_size: int = Query(
+        QueryConstants.RESULT_PAGE_SIZE,
+        ge=1,
+        le=QueryConstants.RESULT_PAGE_SIZE_MAX,
+        description="Number of rows per page",
+    ),
+    sort: str | None = Query(None, description="Column to sort the result by"),
+    order: Literal["asc", "desc"] = Query("asc", description="Sort order"),
+    query_service: QueryService = Depends(get_query_service),
+) -> ResultPageResponse:
+    """Get a page of a result created by ``POST /dbs/{name}/query/results``.
+
+    Pages are read from the kept result; the query is not run again.
+
+    ## Sorting
+
+    With ``sort=<column>`` (and ``order=desc``) pages follow the order of
+    that column, NULLs first, without re-running the query; a result kept
+    on disk gets an index on the column the first time it is sorted by it.
+    Pass the same ``sort`` and ``order`` together with a ``cursor``.
+
+    Args:
+        handle: The result handle.
+        cursor: The cursor of the page to fetch; omitted for the first page.
+        page_size: Rows per page.
+        sort: The column to sort by.
+        order: The sort order.
+        query_service: The query service instance.
+
+    Returns:
+        The page.
+
+    Raises:
+        HTTPException: 404 if the result is unknown or has expired, 400 if
+            the cursor is invalid.
+    """
+    try:
+        return await query_service.get_result_page(
+            handle, cursor, page_size, sort=sort, descending=order == "desc"
+        )
     except Exception as e:
         raise handle_api_error(e) from e
 
 
+@router.get(
+    "/results/{handle}/export",
+    summary="Export a server-side result set",
+    response_class=StreamingResponse,
+)
+async def export_result(
+    handle: str,
+    export_format: Literal["csv", "json"] = Query(
+        "csv", alias="format", description="Export format: csv or json"
+    ),
+    include_headers: bool = Query(True, description="Include column headers (CSV)"),
+    sort: str | None = Query(None, description="Column to sort the result by"),
+    order: Literal["asc", "desc"] = Query("asc", description="Sort order"),
+    query_service: QueryService = Depends(get_query_service),
+) -> StreamingResponse:
+    """Download a result created by ``POST /dbs/{name}/query/results``.
+
+    The whole result is exported, streamed from the kept result in chunks
+    so neither the query nor the full export is held in memory. CSV and
+    JSON output match ``POST /dbs/{name}/query/export``.
+
+    Args:
+        handle: The result handle.
+        export_format: The export format.
+        include_headers: Whether CSV output starts with the column names.
+        sort: The column to sort by.
+        order: The sort order.
+        query_service: The query service instance.
+
+    Returns:
+        A file download streaming the exported data.
+
+    Raises:
+        HTTPException: If the result is unknown or has expired, or the sort
+            column is invalid.
+    """
+    try:
+        chunks = query_service.export_result(
+            handle, export_format, include_headers, sort=sort, descending=order == "desc"
+        )
+    except Exception as e:
+        raise handle_api_error(e) from e
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return StreamingResponse(
+        chunks,
+        media_type="text/csv" if export_format == "csv" else "application/json",
+        headers={
+            "Content-Disposition": f'attachment; filename="result_{timestamp}.{export_format}"'
+        },
+    )
+
+
+@router.delete(
+    "/results/{handle}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Delete a server-side result set",
+)
+async def delete_result(
+    handle: str,
+    query_service: QueryService = Depends(get_query_service),
+) -> None:
+    """Drop a kept result before it expires.
+
+    Args:
+        handle: The result handle.
+        query_service: The query service instance.
+
+    Raises:
+        HTTPException: If the result is unknown or has expired.
+    """
+    if not query_service.release_result(handle):
+        raise handle_api_error(ValueError(f"Result '{handle}' not found or expired"))
+
+
+async def _ndjson(
+    header: dict[str, Any], frames: AsyncIterator[dict[str, Any]]
+) -> AsyncIterator[str]:
+    """Encode result frames as NDJSON lines, ending with an error line on failure.
+
+    Args:
+        header: The header frame, already fetched.
+        frames: The remaining frames.
+
+    Yields:
+        One JSON line per frame.
+    """
+    yield json.dumps(header) + "\n"
+    try:
+        async for frame in frames:
+            yield json.dumps(frame) + "\n"
+    except Exception as e:
+        # The status line is already sent, so report the error in-band
+        detail = cast(dict[str, Any], handle_api_error(e).detail)
+        yield json.dumps({"type": "error", **detail}) + "\n"
+
+
+def _accepts_arrow(request: Request, query_service: QueryService) -> bool:
+    """Check whether a request asks for its result as an Arrow stream.
+
+    Args:
+        request: The FastAPI request.
+        query_service: The query service instance.
+
+    Returns:
+        True if the Accept header names the Arrow stream media type.
+
+    Raises:
+        HTTPException: If only Arrow is acceptable but it is not available.
+    """
+    accept = request.headers.get("accept", "").lower()
+    if QueryConstants.ARROW_MEDIA_TYPE not in accept:
+        return False
+    if query_service.arrow_available():
+        return True
+    if "json" in accept or "*/*" in accept:
+        return False
+    raise HTTPException(
+        status_code=status.HTTP_406_NOT_ACCEPTABLE,
+        detail={
+            "code": ErrorCode.NOT_ACCEPTABLE,
+            "message": "Arrow results require pyarrow, which is not installed on this server",
+        },
+    )
+
+
+async def _arrow_response(
+    chunks: AsyncIterator[bytes], headers: dict[str, str] | None = None
+) -> StreamingResponse:
+    """Start an Arrow stream and wrap it in a response.
+
+    The first chunk is produced before responding, so a query that fails to
+    start still gets an error status. A failure after that aborts the
+    response, which leaves the stream without its end-of-stream marker.
+
+    Args:
+        chunks: The Arrow stream bytes.
+        headers: Additional response headers.
+
+    Returns:
+        The streaming response.
+    """
+    first = await anext(chunks)
+
+    async def body() -> AsyncIterator[bytes]:
+        yield first
+        async for chunk in chunks:
+            yield chunk
+
+    return StreamingResponse(body(), media_type=QueryConstants.ARROW_MEDIA_TYPE, headers=headers)
+
+
 @router.get(
     "/dbs/{name}/history",
     summary="Get query history",
@@ -143,11 +547,20 @@ async def get_query_history(
     name: str,
     page: int = Query(1, ge=1, description="Page number (1-indexed)"),
     page_size: int = Query(20, ge=1, le=100, description="Number of items per page"),
+    cursor: str | None = Query(
+        None, description="Cursor from a previous page's nextCursor (overrides page)"
+    ),
     db_service: DatabaseService = Depends(get_db_service),
     query_service: QueryService = Depends(get_query_service),
 ) -> QueryHistoryResponse:
     """Get query history for a database.
 
+    ## Pagination
+
+    Pass the ``nextCursor`` of a page as ``cursor`` to fetch the next one.
+    Cursor pages seek an index, so deep pages cost the same as the first;
+    ``page`` offsets remain supported but get slower the deeper they go.
+
     ## Response Format
 
     The response includes:
@@ -155,6 +568,7 @@ async def get_query_history(
     - **totalCount**: Total number of history items
     - **page**: Current page number
     - **pageSize**: Items per page
+    - **nextCursor**: Cursor for the next page (null on the last page)
 
     ## History Item Fields
 
@@ -174,6 +588,7 @@ async def get_query_history(
         name: The database name.
         page: The page number.
         page_size: The page size.
+        cursor: The cursor of the page to fetch.
         db_service: The database service instance.
         query_service: The query service instance.
 
@@ -181,14 +596,16 @@ async def get_query_history(
         The query history response.
 
     Raises:
-        HTTPException: If the database is not found.
+        HTTPException: If the database is not found or the cursor is invalid.
     """
     try:
         # Verify database exists
         await db_service.get_database_by_name(name)
 
         # Get history
-        items = await query_service.get_query_history(name, page, page_size)
+        items, next_cursor = await query_service.get_query_history_page(
+            name, page_size, cursor=cursor, page=page
+        )
         total_count = await query_service.get_query_history_count(name)
 
         return QueryHistoryResponse(
@@ -196,6 +613,7 @@ async def get_query_history(
             total_count=total_count,
             page=page,
             page_size=page_size,
+            next_cursor=next_cursor,
         )
 
     except Exception as e:
@@ -256,7 +674,10 @@ async def natural_query(
     - **400 Bad Request**: Prompt exceeds maximum length (5,000 characters)
     - **404 Not Found**: Database not found
     - **422 Unprocessable Entity**: Invalid request format
+    - **429 Too Many Requests**: Database admission queue full or wait budget exceeded
+      (see the ``Retry-After`` header)
     - **500 Internal Server Error**: SQL generation or execution failed
+    - **503 Service Unavailable**: Too many queries waiting on this database
 
     ## Rate Limiting
 
@@ -283,7 +704,7 @@ async def natural_query(
 
         # Get connection URL and engine
         connection_url = await db_service.get_connection_url_with_driver(name)
-        engine = db_service.get_engine(database.id, connection_url)
+        engine = db_service.get_query_engine(database.id, connection_url, database)
 
         # Fetch metadata for context
         metadata_response = await metadata_service.fetch_metadata(
@@ -409,10 +830,17 @@ async def export_query_results(
     }
     ```
 
+    ## Arrow Format
+
+    With ``Accept: application/vnd.apache.arrow.stream`` the full result
+    (not limited to 1000 rows) is streamed as an Apache Arrow IPC stream
+    with typed columns, and ``format`` and ``includeHeaders`` are ignored.
+    Requires the server's optional ``arrow`` extra (pyarrow).
+
     ## Response
 
     Returns a file download with:
-    - **Content-Type**: `text/csv` or `application/json`
+    - **Content-Type**: `text/csv`, `application/json` or `application/vnd.apache.arrow.stream`
     - **Content-Disposition**: Attachment with filename `{database}_query_{timestamp}.{ext}`
 
     ## Rate Limiting
@@ -438,15 +866,24 @@ async def export_query_results(
 
         # Get engine with driver
         connection_url = await db_service.get_connection_url_with_driver(name)
-        engine = db_service.get_engine(database.id, connection_url)
+        engine = db_service.get_query_engine(database.id, connection_url, database)
+
+        if _accepts_arrow(request, query_service):
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            return await _arrow_response(
+                query_service.stream_query_arrow(database, engine, export_req.sql),
+                headers={
+                    "Content-Disposition": (
+                        f'attachment; filename="{name}_query_{timestamp}.arrows"'
+                    )
+                },
+            )
 
         # Execute query
         query_response = await query_service.execute_query(database, engine, export_req.sql)
 
         # Export results directly with format and include_headers
         import csv
-        import json
-        from datetime import datetime
         from io import StringIO
 
         export_format = export_req.format.lower()
@@ -552,7 +989,7 @@ async def get_suggested_queries(
 
         # Get connection URL and engine
         connection_url = await db_service.get_connection_url_with_driver(name)
-        engine = db_service.get_engine(database.id, connection_url)
+        engine = db_service.get_query_engine(database.id, connection_url, database)
 
         # Fetch metadata for context
         metadata_response = await metadata_service.fetch_metadata(
@@ -636,6 +1073,87 @@ async def delete_query_history(
         raise handle_api_error(e) from e
 
 
+@router.get(
+    "/dbs/{name}/history/search",
+    summary="Search query history",
+    description="Full-text search over the query history of a database.",
+)
+async def search_query_history(
+    name: str,
+    q: str = Query(..., min_length=1, max_length=500, description="Words to search for"),
+    limit: int = Query(
+        Pagination.DEFAULT_SEARCH_LIMIT,
+        ge=1,
+        le=Pagination.MAX_SEARCH_LIMIT,
+        description="Maximum number of results",
+    ),
+    prefix: bool = Query(True, description="Match words starting with each search word"),
+    status_filter: Literal["success", "error"] | None = Query(
+        None, alias="status", description="Only items with this status"
+    ),
+    query_type: Literal["sql", "natural"] | None = Query(
+        None, description="Only items of this type"
+    ),
+    created_after: datetime | None = Query(
+        None, description="Only items created at or after this time"
+    ),
+    created_before: datetime | None = Query(
+        None, description="Only items created before this time"
+    ),
+    min_execution_time_ms: int | None = Query(
+        None, ge=0, description="Only items that ran at least this long"
+    ),
+    db_service: DatabaseService = Depends(get_db_service),
+    query_service: QueryService = Depends(get_query_service),
+) -> QueryHistorySearchResponse:
+    """Search query history for a database.
+
+    Every word of ``q`` must appear in the item's input text or executed
+    SQL; with ``prefix`` enabled, ``ord`` also matches ``orders``. Results
+    are ranked by relevance, with matches in the input text ranked above
+    matches in the SQL, and each item carries its ``score``.
+
+    Args:
+        name: The database name.
+        q: The search words.
+        limit: Maximum number of results.
+        prefix: Whether to use prefix matching.
+        status_filter: Status filter.
+        query_type: Query type filter.
+        created_after: Lower bound on the creation time.
+        created_before: Upper bound on the creation time.
+        min_execution_time_ms: Minimum execution time filter.
+        db_service: The database service instance.
+        query_service: The query service instance.
+
+    Returns:
+        The ranked search results.
+
+    Raises:
+        HTTPException: If the database is not found or the search has no words.
+    """
+    try:
+        # Verify database exists
+        await db_service.get_database_by_name(name)
+
+        items = await query_service.search_query_history(
+            name,
+            q,
+            limit=limit,
+            prefix=prefix,
+            status=status_filter,
+            query_type=query_type,
+            created_after=created_after,
+            created_before=created_before,
+            min_execution_time_ms=min_execution_time_ms,
+        )
+
+        return QueryHistorySearchResponse(query=q, items=items, limit=limit)
+
+    except Exception as e:
+        raise handle_api_error(e) from e
+
+
 @router.get("/dbs/{name}/history/summary", status_code=status.HTTP_200_OK)
 async def get_history_summary(
     name: str,
@@ -1,12 +1,23 @@
 """Core module for configuration and infrastructure."""
 
+from .admission import AdmissionControllers, get_admission_controllers
 from .config import config, get_config
+from .engine_registry import EngineRegistry, get_engine_registry
+from .query_cancel import QueryCancelHandle
+from .query_executor import QueryExecutors, get_query_executors
 from .sql_parser import SQLParser, get_parser
 from .sqlite_db import SQLiteDB, get_db, initialize_database
 
 __all__ = [
     "config",
     "get_config",
+    "AdmissionControllers",
+    "get_admission_controllers",
+    "EngineRegistry",
+    "get_engine_registry",
+    "QueryCancelHandle",
+    "QueryExecutors",
+    "get_query_executors",
     "SQLiteDB",
     "get_db",
     "initialize_database",
@@ -0,0 +1,246 @@
+"""Per-database admission control with FIFO queuing."""
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from .constants import Query
+from .logging import get_logger
+
+
+class AdmissionRejectedError(RuntimeError):
+    """Raised when a query is not admitted to a busy database."""
+
+    def __init__(self, database_name: str, reason: str, retry_after: int) -> None:
+        """Initialize the exception.
+
+        Args:
+            database_name: The database that rejected the query.
+            reason: Why the query was rejected.
+            retry_after: Suggested seconds before retrying.
+        """
+        self.database_name = database_name
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(f"Database '{database_name}' is overloaded: {reason}")
+
+
+class AdmissionController:
+    """Concurrency limiter for one database with a bounded FIFO wait queue.
+
+    At most ``max_concurrent`` queries run at once. Further queries wait in
+    arrival order; a freed slot is handed directly to the oldest waiter so
+    newcomers cannot overtake it. Queries are rejected immediately when
+    ``max_queue`` queries are already waiting, and after ``max_wait``
+    seconds in the queue.
+    """
+
+    def __init__(
+        self, database_name: str, max_concurrent: int, max_queue: int, max_wait: float
+    ) -> None:
+        """Initialize the controller.
+
+        Args:
+            database_name: The database the controller guards.
+            max_concurrent: Maximum queries running at once.
+            max_queue: Maximum queries waiting for a slot.
+            max_wait: Maximum seconds a query may wait for a slot.
+        """
+        self.database_name = database_name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._active = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._admitted = 0
+        self._rejected = 0
+        # Moving average of how long a query holds its slot, for Retry-After
+        self._avg_hold = 0.0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold an execution slot for the duration of the block.
+
+        Yields:
+            None once the query is admitted.
+
+        Raises:
+            AdmissionRejectedError: If the queue is full or the wait budget is exceeded.
+        """
+        await self._acquire()
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            held = time.monotonic() - started
+            self._avg_hold = held if not self._avg_hold else 0.8 * self._avg_hold + 0.2 * held
+            self._release()
+
+    async def _acquire(self) -> None:
+        """Wait for an execution slot.
+
+        Raises:
+            AdmissionRejectedError: If the queue is full or the wait budget is exceeded.
+        """
+        if self._active < self.max_concurrent and not self._waiters:
+            self._active += 1
+            self._admitted += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self._reject(f"{len(self._waiters)} queries already waiting")
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=self.max_wait)
+        except (TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over as we gave up; pass it on
+                self._release()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self._reject(f"no slot within {self.max_wait:g} seconds")
+        self._admitted += 1
+
+    def _release(self) -> None:
+        """Hand the slot to the oldest waiter, or free it."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # The slot moves to the waiter without being freed
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    def _reject(self, reason: str) -> None:
+        """Record and raise a rejection.
+
+        Args:
+            reason: Why the query was rejected.
+
+        Raises:
+            AdmissionRejectedError: Always.
+        """
+        self._rejected += 1
+        raise AdmissionRejectedError(self.database_name, reason, self.retry_after())
+
+    def retry_after(self) -> int:
+        """Estimate how many seconds the current backlog needs to drain.
+
+        Returns:
+            Whole seconds, at least 1.
+        """
+        backlog = len(self._waiters) + 1
+        estimate = self._avg_hold * backlog / self.max_concurrent
+        return max(1, math.ceil(min(estimate, self.max_wait)))
+
+    def stats(self) -> dict[str, Any]:
+        """Get a snapshot of the controller's load.
+
+        Returns:
+            Dictionary with concurrency, queue and rejection statistics.
+        """
+        return {
+            "database_name": self.database_name,
+            "max_concurrent": self.max_concurrent,
+            "active": self._active,
+            "max_queue": self.max_queue,
+            "queue_depth": len(self._waiters),
+            "max_wait_seconds": self.max_wait,
+            "admitted": self._admitted,
+            "rejected": self._rejected,
+        }
+
+
+class AdmissionControllers:
+    """Registry of admission controllers keyed by database ID."""
+
+    def __init__(self) -> None:
+        """Initialize the registry."""
+        self.logger = get_logger(__name__)
+        self._controllers: dict[int, AdmissionController] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        database_id: int,
+        database_name: str,
+        max_concurrent: int | None = None,
+        max_queue: int | None = None,
+        max_wait: float | None = None,
+    ) -> AdmissionController:
+        """Get the controller for a database, replacing it if its limits changed.
+
+        Queries holding or awaiting a slot on a replaced controller finish
+        there; new queries are admitted by the new one.
+
+        Args:
+            database_id: The database ID.
+            database_name: The database name.
+            max_concurrent: Concurrent query limit, or None for the default.
+            max_queue: Wait queue length, or None for the default.
+            max_wait: Wait budget in seconds, or None for the default.
+
+        Returns:
+            The database's admission controller.
+        """
+        limits = (
+            max_concurrent or Query.ADMISSION_MAX_CONCURRENT,
+            Query.ADMISSION_MAX_QUEUE if max_queue is None else max_queue,
+            max_wait or Query.ADMISSION_MAX_WAIT,
+        )
+        with self._lock:
+            controller = self._controllers.get(database_id)
+            if controller is None or (
+                (controller.max_concurrent, controller.max_queue, controller.max_wait) != limits
+                or controller.database_name != database_name
+            ):
+                controller = AdmissionController(database_name, *limits)
+                self._controllers[database_id] = controller
+                self.logger.debug(
+                    "admission_controller_created",
+                    database=database_name,
+                    max_concurrent=limits[0],
+                    max_queue=limits[1],
+                    max_wait=limits[2],
+                )
+            return controller
+
+    def remove(self, database_id: int) -> None:
+        """Forget the controller for a database.
+
+        Args:
+            database_id: The database ID.
+        """
+        with self._lock:
+            self._controllers.pop(database_id, None)
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Get load statistics for every controller.
+
+        Returns:
+            List of per-database admission statistics.
+        """
+        with self._lock:
+            controllers = list(self._controllers.values())
+        return [controller.stats() for controller in controllers]
+
+
+# Global admission controller registry instance
+_controllers: AdmissionControllers | None = None
+
+
+def get_admission_controllers() -> AdmissionControllers:
+    """Get the global admission controller registry."""
+    global _controllers
+    if _controllers is None:
+        _controllers = AdmissionControllers()
+    return _controllers
@@ -0,0 +1,253 @@
+"""Encoding of query result batches as an Apache Arrow IPC stream.
+
+Requires the optional ``pyarrow`` package (``pip install db-query-backend[arrow]``).
+"""
+
+import io
+import re
+from collections.abc import Sequence
+from decimal import Decimal, InvalidOperation
+from typing import Any
+
+import pyarrow as pa
+
+# PostgreSQL type OIDs, as psycopg and asyncpg report them in cursor descriptions
+_POSTGRESQL_TYPES: dict[int, pa.DataType] = {
+    16: pa.bool_(),
+    17: pa.binary(),
+    18: pa.string(),  # "char"
+    19: pa.string(),  # name
+    20: pa.int64(),
+    21: pa.int16(),
+    23: pa.int32(),
+    25: pa.string(),
+    26: pa.int64(),  # oid
+    700: pa.float32(),
+    701: pa.float64(),
+    1042: pa.string(),  # char(n)
+    1043: pa.string(),  # varchar
+    1082: pa.date32(),
+    1083: pa.time64("us"),
+    1114: pa.timestamp("us"),
+    1184: pa.timestamp("us", tz="UTC"),
+}
+_POSTGRESQL_NUMERIC = 1700
+
+# MySQL field types, as the MySQL drivers report them in cursor descriptions.
+# Integer columns may be unsigned, which descriptions do not tell, so all map
+# to int64; text and binary columns share type codes, so neither is listed.
+_MYSQL_TYPES: dict[int, pa.DataType] = {
+    1: pa.int64(),  # TINYINT
+    2: pa.int64(),  # SMALLINT
+    3: pa.int64(),  # INT
+    4: pa.float32(),
+    5: pa.float64(),
+    7: pa.timestamp("us"),  # TIMESTAMP
+    8: pa.int64(),  # BIGINT
+    9: pa.int64(),  # MEDIUMINT
+    10: pa.date32(),
+    11: pa.duration("us"),  # TIME, returned as a timedelta
+    12: pa.timestamp("us"),  # DATETIME
+    13: pa.int64(),  # YEAR
+    245: pa.string(),  # JSON
+}
+_MYSQL_DECIMALS = (0, 246)
+
+_DECLARED_DECIMAL = re.compile(r"^(?:DECIMAL|NUMERIC)\s*\(\s*(\d+)\s*,\s*(\d+)\s*\)$")
+
+
+def _decimal_type(precision: Any, scale: Any) -> pa.DataType | None:
+    """Get the Arrow type of a decimal column, or None if its scale is not declared."""
+    if not isinstance(scale, int) or scale < 0:
+        return None
+    if not isinstance(precision, int) or precision < 1:
+        precision = 38
+    # Precision must cover the scale; wider than declared is harmless
+    precision = max(precision, scale, 1)
+    if precision <= 38:
+        return pa.decimal128(precision, scale)
+    return pa.decimal256(min(precision, 76), scale)
+
+
+def description_types(
+    db_type: str, description: Sequence[Sequence[Any]] | None
+) -> list[pa.DataType | None]:
+    """Get the Arrow types of a result's columns from its cursor description.
+
+    Args:
+        db_type: The database type (mysql, postgresql).
+        description: The DBAPI cursor description.
+
+    Returns:
+        The type of each column; None where the description does not say.
+    """
+    types: list[pa.DataType | None] = []
+    for column in description or []:
+        type_code, precision, scale = column[1], column[4], column[5]
+        data_type = None
+        if db_type == "postgresql":
+            if type_code == _POSTGRESQL_NUMERIC:
+                data_type = _decimal_type(precision, scale)
+            else:
+                data_type = _POSTGRESQL_TYPES.get(type_code)
+        elif db_type == "mysql":
+            if type_code in _MYSQL_DECIMALS:
+                data_type = _decimal_type(precision, scale)
+            else:
+                data_type = _MYSQL_TYPES.get(type_code)
+        types.append(data_type)
+    return types
+
+
+def declared_types(declared: Sequence[str]) -> list[pa.DataType | None]:
+    """Get the Arrow types of SQLite result columns from their declared types.
+
+    Follows SQLite's rules for a declared type's affinity. Dates and times
+    are declared types SQLite stores as text, so they map to strings.
+
+    Args:
+        declared: The declared type of each column; empty for expressions.
+
+    Returns:
+        The type of each column; None where no type is declared or it does
+        not determine one (such as NUMERIC without a scale).
+    """
+    types: list[pa.DataType | None] = []
+    for name in declared:
+        name = name.strip().upper()
+        data_type: pa.DataType | None = None
+        decimal = _DECLARED_DECIMAL.match(name)
+        if "BOOL" in name:
+            data_type = pa.bool_()
+        elif "INT" in name:
+            data_type = pa.int64()
+        elif any(word in name for word in ("CHAR", "CLOB", "TEXT", "DATE", "TIME")):
+            data_type = pa.string()
+        elif "BLOB" in name:
+            data_type = pa.binary()
+        elif any(word in name for word in ("REAL", "FLOA", "DOUB")):
+            data_type = pa.float64()
+        elif decimal:
+            data_type = _decimal_type(int(decimal[1]), int(decimal[2]))
+        types.append(data_type)
+    return types
+
+
+class ArrowStreamEncoder:
+    """Encodes batches of driver rows as the messages of one Arrow IPC stream.
+
+    Each batch is transposed into columns and converted by pyarrow without
+    building per-row objects. Column types come from the database (see
+    ``description_types`` and ``declared_types``), not from the values, so
+    they hold for every batch: integers stay integers and decimals keep
+    their declared precision and scale. Columns of undetermined type are
+    encoded as strings. Values are converted with checked casts, so a value
+    that does not fit its column's type (possible in SQLite, which does not
+    enforce declared types) raises instead of being truncated.
+    """
+
+    def __init__(
+        self, column_names: list[str], column_types: Sequence[pa.DataType | None] | None = None
+    ) -> None:
+        """Initialize the encoder.
+
+        Args:
+            column_names: The result's column names.
+            column_types: The type of each column; None (or missing) for
+                columns of undetermined type.
+        """
+        types = list(column_types or [])[: len(column_names)]
+        types += [None] * (len(column_names) - len(types))
+        self.column_names = column_names
+        self.schema = pa.schema(
+            [
+                (name, pa.string() if data_type is None else data_type)
+                for name, data_type in zip(column_names, types, strict=True)
+            ]
+        )
+        self._sink = io.BytesIO()
+        self._writer: pa.ipc.RecordBatchStreamWriter | None = None
+
+    def encode(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        """Encode a batch of rows; the first call also writes the schema.
+
+        Args:
+            rows: The batch of rows.
+
+        Returns:
+            The stream bytes for the batch.
+
+        Raises:
+            pyarrow.ArrowException: If a value does not fit its column's type.
+        """
+        if self._writer is None:
+            self._writer = pa.ipc.new_stream(self._sink, self.schema)
+        if rows:
+            columns = list(zip(*rows, strict=True))
+            arrays = [
+                self._to_array(values, field.type)
+                for values, field in zip(columns, self.schema, strict=True)
+            ]
+            self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        return self._take()
+
+    def finish(self) -> bytes:
+        """End the stream.
+
+        Returns:
+            The remaining stream bytes, including the end-of-stream marker.
+        """
+        if self._writer is None:
+            self.encode([])
+        assert self._writer is not None
+        self._writer.close()
+        return self._take()
+
+    def _take(self) -> bytes:
+        """Return and clear the bytes written so far."""
+        data = self._sink.getvalue()
+        self._sink.seek(0)
+        self._sink.truncate()
+        return data
+
+    @staticmethod
+    def _to_array(values: Sequence[Any], data_type: pa.DataType) -> pa.Array:
+        """Convert a column of a batch to an array of the column's type.
+
+        Args:
+            values: The column's values in the batch.
+            data_type: The column type.
+
+        Returns:
+            The array.
+
+        Raises:
+            pyarrow.ArrowException: If a value cannot be converted without loss.
+        """
+        if pa.types.is_string(data_type):
+            return pa.array(
+                [None if value is None else str(value) for value in values], type=data_type
+            )
+        if pa.types.is_decimal(data_type):
+            try:
+                decimals = [
+                    value if value is None or isinstance(value, Decimal) else Decimal(str(value))
+                    for value in values
+                ]
+            except InvalidOperation as e:
+                raise pa.ArrowInvalid(f"Could not convert a value to {data_type}") from e
+            # Checked: raises rather than rounding a value to the column's scale
+            return pa.array(decimals, type=data_type)
+        numeric = (
+            pa.types.is_integer(data_type)
+            or pa.types.is_floating(data_type)
+            or pa.types.is_boolean(data_type)
+        )
+        if numeric:
+            # Converting straight to the type would truncate 1.5 to 1; infer the
+            # values' own type and cast checked instead
+            try:
+                return pa.array(values).cast(data_type, safe=True)
+            except OverflowError as e:
+                raise pa.ArrowInvalid(f"Could not convert a value to {data_type}") from e
+        return pa.array(values, type=data_type)
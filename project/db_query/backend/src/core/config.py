@@ -6,6 +6,8 @@ from typing import Literal
 from pydantic import Field, ValidationError
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from .constants import Database, Performance, Query
+
 
 class AppConfig(BaseSettings):
     """Application configuration loaded from environment variables."""
@@ -41,6 +43,77 @@ class AppConfig(BaseSettings):
         default=1_000_000,
         description="Maximum request size in bytes",
     )
+    async_engines: bool = Field(
+        default=False,
+        description=(
+            "Run queries and metadata crawls on SQLAlchemy async engines "
+            "(aiosqlite, aiomysql, asyncpg) when the async driver is installed"
+        ),
+    )
+    warmup_on_startup: bool = Field(
+        default=False,
+        description=(
+            "Pre-build connection pools and load metadata for active databases "
+            "on startup; /health/ready reports not ready until it finishes"
+        ),
+    )
+    warmup_concurrency: int = Field(
+        default=Database.WARMUP_CONCURRENCY,
+        ge=1,
+        description="Maximum number of databases warmed up at once",
+    )
+    retention_enabled: bool = Field(
+        default=True,
+        description=(
+            "Delete query history older than the retention period in the "
+            "background and reclaim the space it used"
+        ),
+    )
+    retention_days: int = Field(
+        default=Performance.METRICS_RETENTION_DAYS,
+        ge=1,
+        description="Days of query history kept by background retention",
+    )
+    result_cache_ttl: float = Field(
+        default=Query.RESULT_CACHE_TTL,
+        ge=0,
+        description=(
+            "Seconds query results are reused for identical queries, unless a "
+            "database sets its own; 0 disables the result cache"
+        ),
+    )
+    result_cache_max_bytes: int = Field(
+        default=Query.RESULT_CACHE_MAX_BYTES,
+        ge=0,
+        description="Estimated memory the result cache may use",
+    )
+    result_spool_ttl: float = Field(
+        default=Query.RESULT_SPOOL_TTL,
+        gt=0,
+        description="Seconds a spooled result set is kept after it was stored or last read",
+    )
+    result_spool_memory_bytes: int = Field(
+        default=Query.RESULT_SPOOL_MEMORY_BYTES,
+        ge=0,
+        description="Estimated memory of one spooled result set before it spills to disk",
+    )
+    result_spool_total_memory_bytes: int = Field(
+        default=Query.RESULT_SPOOL_TOTAL_MEMORY_BYTES,
+        ge=0,
+        description="Estimated memory of all spooled result sets before new rows spill to disk",
+    )
+    result_spool_disk_quota: int = Field(
+        default=Query.RESULT_SPOOL_DISK_QUOTA,
+        ge=0,
+        description="Bytes of spilled result sets this process may keep on disk",
+    )
+    result_spool_dir: str | None = Field(
+        default=None,
+        description=(
+            "Directory for spilled result sets; a db_query_spool directory in "
+            "the system temporary directory by default"
+        ),
+    )
 
     def get_resolved_db_path(self) -> Path:
         """Get the resolved database path, expanding ~ and creating parent dirs."""
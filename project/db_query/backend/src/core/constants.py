@@ -8,6 +8,20 @@ class Database:
 
     ENGINE_IDLE_TIMEOUT = 3600  # seconds (1 hour)
     CLEANUP_INTERVAL = 300  # seconds (5 minutes)
+    MAX_ENGINES = 50  # engines kept before least-recently-used eviction
+    WARMUP_CONCURRENCY = 4  # databases warmed up at once on startup
+    WARMUP_TIMEOUT = 60  # seconds allowed to warm up a single database
+    DESCRIPTOR_CACHE_TTL = 300  # seconds (bounds staleness across worker processes)
+    CONNECTION_TEST_TIMEOUT = 5  # seconds allowed to validate a new connection
+    CONNECTION_TEST_CONCURRENCY = 8  # connection tests run at once
+    CONNECTION_TEST_MAX_QUEUE = 100  # connection tests waiting before rejection
+
+    # Internal SQLite store
+    SQLITE_READ_POOL_SIZE = 4  # long-lived reader connections
+    SQLITE_BUSY_TIMEOUT_MS = 5000
+    SQLITE_MMAP_SIZE = 256 * 1024 * 1024  # bytes
+    SQLITE_CACHE_SIZE_KB = 16 * 1024  # page cache per connection
+    ROLLUP_BACKFILL_BATCH_SIZE = 1000  # history rows summarized per step on first start
 
 
 class Query:
@@ -16,6 +30,28 @@ class Query:
     DEFAULT_LIMIT = 1000
     QUERY_TIMEOUT = 30  # seconds
     TYPE_INFERENCE_SAMPLE_ROWS = 100  # rows to check for type inference
+    EXECUTOR_WORKERS = 4  # default worker threads per target database
+    EXECUTOR_MAX_QUEUE = 32  # default queries waiting for a worker per database
+    ADMISSION_MAX_CONCURRENT = 8  # default concurrent queries admitted per database
+    ADMISSION_MAX_QUEUE = 50  # default queries waiting for admission per database
+    ADMISSION_MAX_WAIT = 10  # default seconds a query may wait for admission
+    HISTORY_QUEUE_SIZE = 10_000  # history records buffered before overflow
+    HISTORY_BATCH_SIZE = 200  # history records written per transaction
+    HISTORY_FLUSH_INTERVAL = 0.5  # seconds between history flushes
+    STREAM_BATCH_SIZE = 500  # rows per streamed batch
+    STREAM_DEFAULT_LIMIT = 1_000_000  # LIMIT added to streamed queries without one
+    ARROW_BATCH_SIZE = 10_000  # rows per Arrow record batch
+    ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+    RESULT_CACHE_TTL = 0  # default seconds results are cached; 0 disables caching
+    RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024  # estimated size of all cached results
+    RESULT_SPOOL_TTL = 600  # seconds a spooled result is kept after its last read
+    RESULT_SPOOL_MEMORY_BYTES = 8 * 1024 * 1024  # per result, before spilling to disk
+    RESULT_SPOOL_TOTAL_MEMORY_BYTES = 64 * 1024 * 1024  # of all results, before spilling
+    RESULT_SPOOL_MAX_RESULTS = 100  # spooled results held at once
+    RESULT_SPOOL_DISK_QUOTA = 1024 * 1024 * 1024  # bytes of spill files per process
+    RESULT_SPOOL_SWEEP_INTERVAL = 60  # seconds between janitor runs
+    RESULT_PAGE_SIZE = 1000  # default rows per page of a spooled result
+    RESULT_PAGE_SIZE_MAX = 10_000  # maximum rows per page of a spooled result
 
 
 class Pagination:
@@ -23,6 +59,8 @@ class Pagination:
 
     DEFAULT_PAGE_SIZE = 20
     MAX_PAGE_SIZE = 100
+    DEFAULT_SEARCH_LIMIT = 20
+    MAX_SEARCH_LIMIT = 100
 
 
 class Metadata:
@@ -42,6 +80,17 @@ class Validation:
     DATABASE_URL_MIN_LENGTH = 10
     DATABASE_URL_MAX_LENGTH = 2000
 
+    # Connection pool settings
+    POOL_SIZE_MAX = 100
+    POOL_MAX_OVERFLOW_MAX = 100
+    POOL_TIMEOUT_MAX = 300  # seconds
+    EXECUTOR_WORKERS_MAX = 64
+    EXECUTOR_QUEUE_MAX = 1000
+    MAX_CONCURRENT_QUERIES_MAX = 256
+    ADMISSION_QUEUE_MAX = 10_000
+    ADMISSION_WAIT_MAX = 300  # seconds
+    RESULT_CACHE_TTL_MAX = 86_400  # seconds
+
     # SQL query
     SQL_QUERY_MIN_LENGTH = 1
     SQL_QUERY_MAX_LENGTH = 100_000
@@ -79,3 +128,15 @@ class Performance:
     # Monitoring intervals
     SYSTEM_METRICS_INTERVAL = 60  # Collect system metrics every 60 seconds
     PERFORMANCE_STATS_INTERVAL = 300  # Calculate performance stats every 5 minutes
+
+    # Relative error of latency percentiles computed from rollup sketches
+    LATENCY_SKETCH_ACCURACY = 0.01
+
+    # Background retention of query history
+    RETENTION_INTERVAL = 3600  # seconds between retention runs
+    RETENTION_CHUNK_SIZE = 500  # initial rows deleted per transaction
+    RETENTION_MIN_CHUNK_SIZE = 50
+    RETENTION_MAX_CHUNK_SIZE = 5000
+    RETENTION_CHUNK_TARGET_MS = 50  # chunk size adapts to hold the write lock about this long
+    RETENTION_CHUNK_PAUSE = 0.01  # seconds between chunks so other writers get the lock
+    RETENTION_VACUUM_PAGES = 1024  # free pages released per incremental_vacuum step
@@ -0,0 +1,336 @@
+"""Process-wide registry of SQLAlchemy engines for target databases."""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, SingletonThreadPool
+
+from .constants import Database
+from .logging import get_logger
+
+
+@dataclass
+class _EngineEntry:
+    """A registered engine and its bookkeeping."""
+
+    url: str
+    options: dict[str, Any]
+    engine: Engine
+    async_engine: AsyncEngine | None = None
+    last_used: float = field(default_factory=time.monotonic)
+
+
+def _async_engine_options(options: dict[str, Any]) -> dict[str, Any]:
+    """Adapt create_engine options for create_async_engine.
+
+    Args:
+        options: Options used for the synchronous engine.
+
+    Returns:
+        Equivalent options accepted by an async engine.
+    """
+    async_options = dict(options)
+    poolclass = async_options.get("poolclass")
+    if poolclass is QueuePool:
+        async_options["poolclass"] = AsyncAdaptedQueuePool
+    elif poolclass is SingletonThreadPool:
+        # Thread-bound pools make no sense on the event loop, use the default
+        del async_options["poolclass"]
+        async_options.pop("pool_size", None)
+    return async_options
+
+
+class EngineRegistry:
+    """Application-scoped cache of pooled engines keyed by database ID.
+
+    Engines are reused across requests so that queries hit a warm connection
+    pool. The registry evicts the least recently used engine when more than
+    ``max_engines`` databases are registered, disposes engines that have been
+    idle longer than ``idle_timeout`` and rebuilds an engine when the
+    connection URL or engine options of its database change. Each entry may
+    also carry an ``AsyncEngine`` for the same database, which shares the
+    entry's lifecycle.
+    """
+
+    def __init__(
+        self,
+        max_engines: int = Database.MAX_ENGINES,
+        idle_timeout: float = Database.ENGINE_IDLE_TIMEOUT,
+        cleanup_interval: float = Database.CLEANUP_INTERVAL,
+    ) -> None:
+        """Initialize the engine registry.
+
+        Args:
+            max_engines: Maximum number of engines kept before LRU eviction.
+            idle_timeout: Seconds of inactivity after which an engine is disposed.
+            cleanup_interval: Seconds between idle-engine sweeps.
+        """
+        self.logger = get_logger(__name__)
+        self.max_engines = max_engines
+        self.idle_timeout = idle_timeout
+        self.cleanup_interval = cleanup_interval
+        self._entries: OrderedDict[int, _EngineEntry] = OrderedDict()
+        # Engines may be looked up from worker threads as well as the event loop
+        self._lock = threading.Lock()
+        self._cleanup_task: asyncio.Task[None] | None = None
+        self._pending_disposals: set[asyncio.Task[None]] = set()
+
+    def __len__(self) -> int:
+        """Return the number of registered engines."""
+        return len(self._entries)
+
+    def __contains__(self, database_id: object) -> bool:
+        """Return True if an engine is registered for the database ID."""
+        return database_id in self._entries
+
+    def get_engine(
+        self, database_id: int, url: str, options: dict[str, Any] | None = None
+    ) -> Engine:
+        """Get the pooled engine for a database, creating it if needed.
+
+        Args:
+            database_id: The database ID.
+            url: The connection string (should include driver).
+            options: Keyword arguments passed to ``create_engine`` (pool tuning).
+
+        Returns:
+            A SQLAlchemy engine shared by all callers for this database.
+        """
+        stale: list[_EngineEntry] = []
+        with self._lock:
+            engine = self._touch(database_id, url, options or {}, stale).engine
+        self._dispose_entries(stale)
+        return engine
+
+    def get_async_engine(
+        self,
+        database_id: int,
+        url: str,
+        async_url: str,
+        options: dict[str, Any] | None = None,
+    ) -> AsyncEngine:
+        """Get the pooled async engine for a database, creating it if needed.
+
+        Args:
+            database_id: The database ID.
+            url: The connection string with the synchronous driver.
+            async_url: The same connection string with an async driver.
+            options: Keyword arguments for the synchronous engine (pool tuning).
+
+        Returns:
+            A SQLAlchemy async engine shared by all callers for this database.
+        """
+        options = options or {}
+        stale: list[_EngineEntry] = []
+        with self._lock:
+            entry = self._touch(database_id, url, options, stale)
+            if entry.async_engine is None:
+                entry.async_engine = create_async_engine(
+                    async_url, **_async_engine_options(options)
+                )
+                self.logger.debug("async_engine_created", database_id=database_id)
+            async_engine = entry.async_engine
+        self._dispose_entries(stale)
+        return async_engine
+
+    def _touch(
+        self,
+        database_id: int,
+        url: str,
+        options: dict[str, Any],
+        stale: list[_EngineEntry],
+    ) -> _EngineEntry:
+        """Get or create the entry for a database and mark it as recently used.
+
+        Must be called with the lock held. Entries that have to be disposed are
+        appended to ``stale`` so the caller can dispose them outside the lock.
+
+        Args:
+            database_id: The database ID.
+            url: The connection string (should include driver).
+            options: Keyword arguments passed to ``create_engine``.
+            stale: Collector for replaced or evicted entries.
+
+        Returns:
+            The entry registered for the database.
+        """
+        entry = self._entries.get(database_id)
+        if entry is not None and (entry.url != url or entry.options != options):
+            # Connection settings changed underneath us, never reuse the old pool
+            stale.append(self._entries.pop(database_id))
+            entry = None
+        if entry is None:
+            entry = _EngineEntry(url=url, options=options, engine=create_engine(url, **options))
+            self._entries[database_id] = entry
+            self.logger.debug("engine_created", database_id=database_id)
+            self._evict_overflow(stale)
+        else:
+            self._entries.move_to_end(database_id)
+        entry.last_used = time.monotonic()
+        return entry
+
+    def _evict_overflow(self, stale: list[_EngineEntry]) -> None:
+        """Evict least recently used entries beyond ``max_engines``.
+
+        Must be called with the lock held.
+
+        Args:
+            stale: Collector for evicted entries.
+        """
+        while len(self._entries) > self.max_engines:
+            evicted_id, evicted = self._entries.popitem(last=False)
+            stale.append(evicted)
+            self.logger.info("engine_evicted", database_id=evicted_id)
+
+    def adopt(
+        self,
+        database_id: int,
+        url: str,
+        engine: Engine,
+        options: dict[str, Any] | None = None,
+    ) -> None:
+        """Register an engine that was built and connected elsewhere.
+
+        Used to keep the engine that validated a connection, so the first
+        query reuses its already-authenticated pooled connection. Any engine
+        previously registered for the database is disposed.
+
+        Args:
+            database_id: The database ID.
+            url: The connection string the engine was built from.
+            engine: The engine to register.
+            options: The ``create_engine`` options later lookups will pass;
+                they must match for the engine to be reused.
+        """
+        stale: list[_EngineEntry] = []
+        with self._lock:
+            previous = self._entries.pop(database_id, None)
+            if previous is not None:
+                stale.append(previous)
+            self._entries[database_id] = _EngineEntry(
+                url=url, options=options or {}, engine=engine
+            )
+            self._evict_overflow(stale)
+        self._dispose_entries(stale)
+        self.logger.debug("engine_adopted", database_id=database_id)
+
+    def dispose(self, database_id: int) -> None:
+        """Dispose of the engines registered for a database, if any.
+
+        Args:
+            database_id: The database ID.
+        """
+        with self._lock:
+            entry = self._entries.pop(database_id, None)
+        if entry is not None:
+            self._dispose_entries([entry])
+            self.logger.debug("engine_disposed", database_id=database_id)
+
+    def dispose_idle(self) -> int:
+        """Dispose of engines that have been idle longer than the idle timeout.
+
+        Returns:
+            The number of databases whose engines were disposed.
+        """
+        now = time.monotonic()
+        with self._lock:
+            idle_ids = [
+                db_id
+                for db_id, entry in self._entries.items()
+                if now - entry.last_used > self.idle_timeout
+            ]
+            idle = [self._entries.pop(db_id) for db_id in idle_ids]
+        if idle:
+            self.logger.info("cleaning_idle_engines", count=len(idle))
+        self._dispose_entries(idle)
+        return len(idle)
+
+    def dispose_all(self) -> None:
+        """Dispose of all registered engines."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        self._dispose_entries(entries)
+
+    def _dispose_entries(self, entries: list[_EngineEntry]) -> None:
+        """Dispose of the engines held by entries, logging rather than raising.
+
+        Args:
+            entries: The entries to dispose.
+        """
+        for entry in entries:
+            try:
+                entry.engine.dispose()
+                if entry.async_engine is not None:
+                    self._dispose_async(entry.async_engine)
+            except Exception as e:
+                self.logger.warning("engine_dispose_failed", error=str(e))
+
+    def _dispose_async(self, engine: AsyncEngine) -> None:
+        """Dispose of an async engine from synchronous code.
+
+        Connections are closed by a task on the running loop; ``close`` waits
+        for those tasks. Without a running loop the pool is only dereferenced.
+
+        Args:
+            engine: The async engine to dispose.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            engine.sync_engine.dispose(close=False)
+            return
+        task = loop.create_task(engine.dispose())
+        self._pending_disposals.add(task)
+        task.add_done_callback(self._pending_disposals.discard)
+
+    async def start(self) -> None:
+        """Start the background task that disposes idle engines."""
+        if self._cleanup_task is None or self._cleanup_task.done():
+            self._cleanup_task = asyncio.create_task(self._cleanup_idle_engines())
+
+    async def _cleanup_idle_engines(self) -> None:
+        """Background task to clean up idle engines."""
+        self.logger.info("engine_cleanup_started")
+        while True:
+            try:
+                await asyncio.sleep(self.cleanup_interval)
+                self.dispose_idle()
+            except asyncio.CancelledError:
+                self.logger.info("engine_cleanup_cancelled")
+                break
+            except Exception as e:
+                # Log but don't stop the cleanup task
+                self.logger.error("engine_cleanup_error", error=str(e))
+
+    async def close(self) -> None:
+        """Stop the cleanup task and dispose of all engines."""
+        if self._cleanup_task and not self._cleanup_task.done():
+            self._cleanup_task.cancel()
+            try:
+                await self._cleanup_task
+            except asyncio.CancelledError:
+                pass
+        self._cleanup_task = None
+        self.dispose_all()
+        if self._pending_disposals:
+            await asyncio.gather(*self._pending_disposals, return_exceptions=True)
+
+
+# Global engine registry instance
+_registry: EngineRegistry | None = None
+
+
+def get_engine_registry() -> EngineRegistry:
+    """Get the global engine registry instance."""
+    global _registry
+    if _registry is None:
+        _registry = EngineRegistry()
+    return _registry
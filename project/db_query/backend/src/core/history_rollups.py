@@ -0,0 +1,182 @@
+"""Hourly per-database rollups of query history."""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Self
+
+import aiosqlite
+
+from .constants import Performance
+from .latency_sketch import LatencySketch
+
+_UPSERT_ROLLUP = """
+    INSERT INTO query_history_rollups (
+        database_name, bucket_start, total_queries, successful_queries, failed_queries,
+        slow_queries, latency_count, latency_sum_ms, latency_min_ms, latency_max_ms,
+        total_rows, latency_sketch
+    ) VALUES (
+        :database_name, :bucket_start, :total_queries, :successful_queries, :failed_queries,
+        :slow_queries, :latency_count, :latency_sum_ms, :latency_min_ms, :latency_max_ms,
+        :total_rows, :latency_sketch
+    )
+    ON CONFLICT(database_name, bucket_start) DO UPDATE SET
+        total_queries = excluded.total_queries,
+        successful_queries = excluded.successful_queries,
+        failed_queries = excluded.failed_queries,
+        slow_queries = excluded.slow_queries,
+        latency_count = excluded.latency_count,
+        latency_sum_ms = excluded.latency_sum_ms,
+        latency_min_ms = excluded.latency_min_ms,
+        latency_max_ms = excluded.latency_max_ms,
+        total_rows = excluded.total_rows,
+        latency_sketch = excluded.latency_sketch
+"""
+
+
+def rollup_bucket(created_at: datetime | str) -> str:
+    """Get the start of the hourly bucket a history timestamp falls in.
+
+    Args:
+        created_at: The history item's creation time, as stored or as a datetime.
+
+    Returns:
+        The bucket start in the stored timestamp format.
+    """
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at)
+    return created_at.replace(minute=0, second=0, microsecond=0).isoformat(" ")
+
+
+@dataclass
+class HistoryRollup:
+    """Aggregated statistics of the queries in one bucket.
+
+    Every field merges exactly, so rollups of adjacent buckets (or of
+    several databases) combine into the statistics of the whole range.
+    """
+
+    total_queries: int = 0
+    successful_queries: int = 0
+    failed_queries: int = 0
+    slow_queries: int = 0
+    latency_count: int = 0
+    latency_sum_ms: int = 0
+    latency_min_ms: int | None = None
+    latency_max_ms: int | None = None
+    total_rows: int = 0
+    sketch: LatencySketch = field(default_factory=LatencySketch)
+
+    @classmethod
+    def from_row(cls, row: dict[str, Any]) -> Self:
+        """Load a rollup from a ``query_history_rollups`` row.
+
+        Args:
+            row: The stored row.
+
+        Returns:
+            The rollup.
+        """
+        return cls(
+            total_queries=row["total_queries"],
+            successful_queries=row["successful_queries"],
+            failed_queries=row["failed_queries"],
+            slow_queries=row["slow_queries"],
+            latency_count=row["latency_count"],
+            latency_sum_ms=row["latency_sum_ms"],
+            latency_min_ms=row["latency_min_ms"],
+            latency_max_ms=row["latency_max_ms"],
+            total_rows=row["total_rows"],
+            sketch=LatencySketch.from_json(row["latency_sketch"]),
+        )
+
+    def add(self, record: dict[str, Any]) -> None:
+        """Count one history record.
+
+        Args:
+            record: The record's ``query_history`` column values.
+        """
+        self.total_queries += 1
+        if record["status"] == "success":
+            self.successful_queries += 1
+        elif record["status"] == "error":
+            self.failed_queries += 1
+        self.total_rows += record.get("row_count") or 0
+
+        elapsed = record.get("execution_time_ms")
+        if elapsed is None:
+            return
+        self.latency_count += 1
+        self.latency_sum_ms += elapsed
+        if self.latency_min_ms is None or elapsed < self.latency_min_ms:
+            self.latency_min_ms = elapsed
+        if self.latency_max_ms is None or elapsed > self.latency_max_ms:
+            self.latency_max_ms = elapsed
+        if elapsed >= Performance.SLOW_QUERY_THRESHOLD:
+            self.slow_queries += 1
+        self.sketch.add(elapsed)
+
+    def merge(self, other: Self) -> None:
+        """Add the statistics of another rollup.
+
+        Args:
+            other: The rollup to merge into this one.
+        """
+        self.total_queries += other.total_queries
+        self.successful_queries += other.successful_queries
+        self.failed_queries += other.failed_queries
+        self.slow_queries += other.slow_queries
+        self.latency_count += other.latency_count
+        self.latency_sum_ms += other.latency_sum_ms
+        self.total_rows += other.total_rows
+        mins = [m for m in (self.latency_min_ms, other.latency_min_ms) if m is not None]
+        maxes = [m for m in (self.latency_max_ms, other.latency_max_ms) if m is not None]
+        self.latency_min_ms = min(mins) if mins else None
+        self.latency_max_ms = max(maxes) if maxes else None
+        self.sketch.merge(other.sketch)
+
+
+async def apply_history_rollups(
+    conn: aiosqlite.Connection, records: Iterable[dict[str, Any]]
+) -> None:
+    """Fold history records into their hourly rollups.
+
+    Must run on the writer connection inside the transaction that inserts
+    the records, so rollups and history cannot drift apart.
+
+    Args:
+        conn: The writer connection.
+        records: The inserted records' ``query_history`` column values.
+    """
+    deltas: dict[tuple[str, str], HistoryRollup] = {}
+    for record in records:
+        key = (record["database_name"], rollup_bucket(record["created_at"]))
+        deltas.setdefault(key, HistoryRollup()).add(record)
+
+    for (database_name, bucket_start), delta in deltas.items():
+        cursor = await conn.execute(
+            "SELECT * FROM query_history_rollups "
+            "WHERE database_name = :database_name AND bucket_start = :bucket_start",
+            {"database_name": database_name, "bucket_start": bucket_start},
+        )
+        row = await cursor.fetchone()
+        await cursor.close()
+        rollup = HistoryRollup.from_row(dict(row)) if row else HistoryRollup()
+        rollup.merge(delta)
+        await conn.execute(
+            _UPSERT_ROLLUP,
+            {
+                "database_name": database_name,
+                "bucket_start": bucket_start,
+                "total_queries": rollup.total_queries,
+                "successful_queries": rollup.successful_queries,
+                "failed_queries": rollup.failed_queries,
+                "slow_queries": rollup.slow_queries,
+                "latency_count": rollup.latency_count,
+                "latency_sum_ms": rollup.latency_sum_ms,
+                "latency_min_ms": rollup.latency_min_ms,
+                "latency_max_ms": rollup.latency_max_ms,
+                "total_rows": rollup.total_rows,
+                "latency_sketch": rollup.sketch.to_json(),
+            },
+        )
@@ -0,0 +1,122 @@
+"""Mergeable quantile sketch for latency percentiles."""
+
+import json
+import math
+from typing import Self
+
+from .constants import Performance
+
+
+class LatencySketch:
+    """Quantile sketch with a bounded relative error, in the style of DDSketch.
+
+    Values are counted in logarithmically sized bins, so any quantile is
+    estimated within ``relative_accuracy`` of a value actually observed.
+    Sketches with the same accuracy merge exactly by adding bin counts,
+    which lets per-hour sketches be combined into any larger window.
+    """
+
+    def __init__(self, relative_accuracy: float = Performance.LATENCY_SKETCH_ACCURACY) -> None:
+        """Initialize an empty sketch.
+
+        Args:
+            relative_accuracy: Maximum relative error of quantile estimates.
+
+        Raises:
+            ValueError: If the accuracy is not between 0 and 1.
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._bins: dict[int, int] = {}
+        # Values of 0 (and below) have no logarithm and are counted apart
+        self._zero_count = 0
+        self.count = 0
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Record a value.
+
+        Args:
+            value: The value, e.g. a latency in milliseconds.
+            count: How many times the value was observed.
+        """
+        if value <= 0:
+            self._zero_count += count
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self._bins[index] = self._bins.get(index, 0) + count
+        self.count += count
+
+    def merge(self, other: Self) -> None:
+        """Add the values recorded by another sketch.
+
+        Args:
+            other: The sketch to merge into this one.
+
+        Raises:
+            ValueError: If the sketches have different accuracies.
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracies")
+        for index, count in other._bins.items():
+            self._bins[index] = self._bins.get(index, 0) + count
+        self._zero_count += other._zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate a quantile.
+
+        Args:
+            q: The quantile, between 0 and 1.
+
+        Returns:
+            The estimated value, or None if the sketch is empty.
+
+        Raises:
+            ValueError: If q is not between 0 and 1.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if not self.count:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = self._zero_count
+        if seen > rank:
+            return 0.0
+        for index in sorted(self._bins):
+            seen += self._bins[index]
+            if seen > rank:
+                # Midpoint of the bin in relative terms
+                return 2 * self._gamma**index / (self._gamma + 1)
+        return 2 * self._gamma ** max(self._bins) / (self._gamma + 1)
+
+    def to_json(self) -> str:
+        """Serialize the sketch.
+
+        Returns:
+            A compact JSON string.
+        """
+        return json.dumps(
+            {"a": self.relative_accuracy, "z": self._zero_count, "b": self._bins},
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, data: str) -> Self:
+        """Deserialize a sketch produced by ``to_json``.
+
+        Args:
+            data: The JSON string.
+
+        Returns:
+            The sketch.
+        """
+        payload = json.loads(data)
+        sketch = cls(payload["a"])
+        sketch._bins = {int(index): count for index, count in payload["b"].items()}
+        sketch._zero_count = payload["z"]
+        sketch.count = sketch._zero_count + sum(sketch._bins.values())
+        return sketch
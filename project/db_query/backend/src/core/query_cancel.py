@@ -0,0 +1,122 @@
+"""Driver-level cancellation of statements running in worker threads."""
+
+import threading
+from typing import Any
+
+from sqlalchemy.engine import Connection, Engine
+
+from .logging import get_logger
+
+
+class QueryCancelledError(RuntimeError):
+    """Raised in the worker when a query is cancelled before it starts."""
+
+
+class QueryCancelHandle:
+    """Link between an awaiting coroutine and the connection running its query.
+
+    Cancelling an awaited executor future does not stop the worker thread, so
+    the statement keeps running on the server and the pooled connection stays
+    checked out. The worker attaches its connection to the handle before
+    executing; when the awaiting coroutine is cancelled (e.g. on timeout) it
+    calls :meth:`cancel`, which interrupts the statement through the driver:
+
+    - SQLite: ``sqlite3.Connection.interrupt()``
+    - MySQL/MariaDB: ``KILL QUERY`` issued on a separate, unpooled connection
+    - PostgreSQL: the driver's cancel request, backed by a server-side
+      ``statement_timeout`` set when the connection is attached
+    """
+
+    def __init__(self, engine: Engine, timeout: float | None = None) -> None:
+        """Initialize the handle.
+
+        Args:
+            engine: The engine the query runs on.
+            timeout: Query timeout in seconds, used as a server-side limit
+                where the backend supports one.
+        """
+        self.logger = get_logger(__name__)
+        self.engine = engine
+        self.timeout = timeout
+        # Held across cancel() so a connection is never interrupted after its
+        # query finished and it went back to the pool
+        self._lock = threading.Lock()
+        self._dbapi_connection: Any | None = None
+        self._cancelled = False
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation was requested."""
+        return self._cancelled
+
+    def attach(self, conn: Connection) -> None:
+        """Register the connection about to run the query.
+
+        Called from the worker thread right before executing.
+
+        Args:
+            conn: The checked-out SQLAlchemy connection.
+
+        Raises:
+            QueryCancelledError: If the query was cancelled before it started.
+        """
+        if self.engine.dialect.name == "postgresql" and self.timeout:
+            # Transaction-scoped, so the pooled connection's setting is restored
+            conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(self.timeout * 1000)}")
+        with self._lock:
+            if self._cancelled:
+                raise QueryCancelledError("Query was cancelled before it started")
+            self._dbapi_connection = conn.connection.dbapi_connection
+
+    def detach(self) -> None:
+        """Forget the connection once the query has finished."""
+        with self._lock:
+            self._dbapi_connection = None
+
+    def cancel(self) -> bool:
+        """Interrupt the running statement, if any.
+
+        Safe to call from any thread. Errors are logged, not raised.
+
+        Returns:
+            True if a running statement was sent a cancellation.
+        """
+        backend = self.engine.dialect.name
+        with self._lock:
+            self._cancelled = True
+            dbapi_connection = self._dbapi_connection
+            if dbapi_connection is None:
+                return False
+            try:
+                if backend == "sqlite":
+                    dbapi_connection.interrupt()
+                elif backend in ("mysql", "mariadb"):
+                    self._kill_mysql_query(dbapi_connection)
+                elif backend == "postgresql":
+                    dbapi_connection.cancel()
+                else:
+                    return False
+            except Exception as e:
+                self.logger.warning("query_cancel_failed", backend=backend, error=str(e))
+                return False
+        self.logger.info("query_cancelled", backend=backend)
+        return True
+
+    def _kill_mysql_query(self, dbapi_connection: Any) -> None:
+        """Kill the statement running on a MySQL connection.
+
+        The running connection is busy, so ``KILL QUERY`` goes through a new
+        connection that bypasses the pool (which may be exhausted).
+
+        Args:
+            dbapi_connection: The DBAPI connection running the statement.
+        """
+        thread_id = int(dbapi_connection.thread_id())
+        cargs, cparams = self.engine.dialect.create_connect_args(self.engine.url)
+        side_connection = self.engine.dialect.connect(*cargs, **cparams)
+        try:
+            cursor = side_connection.cursor()
+            cursor.execute(f"KILL QUERY {thread_id}")
+            cursor.close()
+        finally:
+            side_connection.close()
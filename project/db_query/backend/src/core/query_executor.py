@@ -0,0 +1,229 @@
+"""Bounded per-database thread pools for blocking query execution."""
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from .constants import Query
+from .logging import get_logger
+
+T = TypeVar("T")
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Raised when a database's executor queue is full."""
+
+    def __init__(self, database_name: str, max_queue: int) -> None:
+        """Initialize the exception.
+
+        Args:
+            database_name: The database whose executor is saturated.
+            max_queue: The queue length that was exceeded.
+        """
+        self.database_name = database_name
+        self.max_queue = max_queue
+        super().__init__(
+            f"Database '{database_name}' is busy: {max_queue} queries already waiting"
+        )
+
+
+class BoundedExecutor:
+    """A thread pool with a bounded wait queue and wait-time statistics.
+
+    Each target database gets its own executor so a storm of slow queries
+    against one database cannot starve queries against the others.
+    """
+
+    def __init__(self, database_name: str, max_workers: int, max_queue: int) -> None:
+        """Initialize the executor.
+
+        Args:
+            database_name: The database the executor serves (for naming and errors).
+            max_workers: Number of worker threads.
+            max_queue: Maximum number of tasks waiting for a free worker.
+        """
+        self.database_name = database_name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"query-{database_name}"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking function on the executor and await its result.
+
+        Args:
+            fn: The function to run.
+            *args: Positional arguments for the function.
+
+        Returns:
+            The function's return value.
+
+        Raises:
+            ExecutorSaturatedError: If the wait queue is full.
+        """
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                raise ExecutorSaturatedError(self.database_name, self.max_queue)
+            self._queued += 1
+        submitted_at = time.monotonic()
+
+        def task() -> T:
+            wait = time.monotonic() - submitted_at
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._completed += 1
+
+        future = self._executor.submit(task)
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def _on_done(self, future: Future[Any]) -> None:
+        """Release the queue slot of a task cancelled before it started.
+
+        Args:
+            future: The finished future.
+        """
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    def stats(self) -> dict[str, Any]:
+        """Get a snapshot of the executor's load.
+
+        Returns:
+            Dictionary with worker, queue and wait-time statistics.
+        """
+        with self._lock:
+            started = self._completed + self._active
+            return {
+                "database_name": self.database_name,
+                "max_workers": self.max_workers,
+                "active_workers": self._active,
+                "max_queue": self.max_queue,
+                "queue_depth": self._queued,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._total_wait / started * 1000, 2) if started else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 2),
+            }
+
+    def shutdown(self, cancel_pending: bool = False) -> None:
+        """Stop accepting work; running and (optionally) queued tasks still finish.
+
+        Args:
+            cancel_pending: If True, cancel tasks that have not started yet.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=cancel_pending)
+
+
+class QueryExecutors:
+    """Registry of bounded executors keyed by database ID."""
+
+    def __init__(self) -> None:
+        """Initialize the registry."""
+        self.logger = get_logger(__name__)
+        self._executors: dict[int, BoundedExecutor] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        database_id: int,
+        database_name: str,
+        max_workers: int | None = None,
+        max_queue: int | None = None,
+    ) -> BoundedExecutor:
+        """Get the executor for a database, creating or resizing it if needed.
+
+        Args:
+            database_id: The database ID.
+            database_name: The database name.
+            max_workers: Worker threads, or None for the default.
+            max_queue: Maximum waiting tasks, or None for the default.
+
+        Returns:
+            The database's executor.
+        """
+        workers = max_workers or Query.EXECUTOR_WORKERS
+        queue = max_queue or Query.EXECUTOR_MAX_QUEUE
+        retired: BoundedExecutor | None = None
+        with self._lock:
+            executor = self._executors.get(database_id)
+            if executor is not None and (
+                executor.max_workers != workers
+                or executor.max_queue != queue
+                or executor.database_name != database_name
+            ):
+                retired, executor = executor, None
+            if executor is None:
+                executor = BoundedExecutor(database_name, workers, queue)
+                self._executors[database_id] = executor
+                self.logger.debug(
+                    "query_executor_created",
+                    database=database_name,
+                    max_workers=workers,
+                    max_queue=queue,
+                )
+        if retired is not None:
+            retired.shutdown()
+        return executor
+
+    def shutdown(self, database_id: int) -> None:
+        """Retire the executor for a database; in-flight queries still finish.
+
+        Args:
+            database_id: The database ID.
+        """
+        with self._lock:
+            executor = self._executors.pop(database_id, None)
+        if executor is not None:
+            executor.shutdown()
+
+    def shutdown_all(self) -> None:
+        """Shut down every executor, cancelling queries that have not started."""
+        with self._lock:
+            executors = list(self._executors.values())
+            self._executors.clear()
+        for executor in executors:
+            executor.shutdown(cancel_pending=True)
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Get load statistics for every executor.
+
+        Returns:
+            List of per-database executor statistics.
+        """
+        with self._lock:
+            executors = list(self._executors.values())
+        return [executor.stats() for executor in executors]
+
+
+# Global executor registry instance
+_executors: QueryExecutors | None = None
+
+
+def get_query_executors() -> QueryExecutors:
+    """Get the global query executor registry."""
+    global _executors
+    if _executors is None:
+        _executors = QueryExecutors()
+    return _executors
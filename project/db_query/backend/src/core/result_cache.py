@@ -0,0 +1,203 @@
+"""Process-wide cache of query results."""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass, field
+from typing import Any
+
+from .config import get_config
+from .constants import Query
+from .logging import get_logger
+
+
+@dataclass
+class CachedResult:
+    """A cached query result and its bookkeeping."""
+
+    database_id: int
+    value: Any
+    size: int
+    expires_at: float
+    stored_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def age_ms(self) -> int:
+        """Milliseconds since the result was stored."""
+        return int((time.monotonic() - self.stored_at) * 1000)
+
+
+def estimate_size(value: Any, sample: int = Query.TYPE_INFERENCE_SAMPLE_ROWS) -> int:
+    """Estimate the memory held by a result's rows or columns.
+
+    Long lists are measured on their first ``sample`` items and scaled, so
+    estimating costs about the same for any result size. Dictionary keys are
+    not counted, as every row shares the column name strings.
+
+    Args:
+        value: The rows (dicts or lists) or column value lists.
+        sample: Items measured per list.
+
+    Returns:
+        The estimated size in bytes.
+    """
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(v, sample) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        if not value:
+            return sys.getsizeof(value)
+        head = value[:sample]
+        measured = sum(estimate_size(v, sample) for v in head)
+        return sys.getsizeof(value) + measured * len(value) // len(head)
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """LRU cache of query results bounded by their estimated size.
+
+    Entries expire after the TTL they were stored with; the least recently
+    used entries are evicted when the total size would exceed ``max_bytes``.
+    A result larger than a quarter of the budget is not cached at all, so
+    one wide query cannot flush everything else.
+    """
+
+    def __init__(self, max_bytes: int = Query.RESULT_CACHE_MAX_BYTES) -> None:
+        """Initialize the result cache.
+
+        Args:
+            max_bytes: Total estimated size of the cached results.
+        """
+        self.logger = get_logger(__name__)
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, CachedResult] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so a result that raced one is not cached
+        self.generation = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached results."""
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> CachedResult | None:
+        """Get a cached result if it has not expired.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            The cached result, or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry
+
+    def put(
+        self,
+        key: Hashable,
+        database_id: int,
+        value: Any,
+        size: int,
+        ttl: float,
+        generation: int,
+    ) -> bool:
+        """Cache a result, evicting least recently used results to make room.
+
+        Args:
+            key: The cache key.
+            database_id: The database the result was read from.
+            value: The result.
+            size: The result's estimated size in bytes.
+            ttl: Seconds the result may be served for.
+            generation: The cache generation read before running the query.
+
+        Returns:
+            True if the result was cached, False if it is too large or stale.
+        """
+        if size > self.max_bytes // 4:
+            self.logger.debug("result_too_large_to_cache", database_id=database_id, size=size)
+            return False
+        entry = CachedResult(database_id, value, size, time.monotonic() + ttl)
+        with self._lock:
+            if generation != self.generation:
+                return False
+            if key in self._entries:
+                self._remove(key)
+            while self._entries and self._bytes + size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+            self._entries[key] = entry
+            self._bytes += size
+        return True
+
+    def invalidate(self, database_id: int) -> int:
+        """Drop all cached results of a database.
+
+        Args:
+            database_id: The database ID.
+
+        Returns:
+            The number of results dropped.
+        """
+        with self._lock:
+            self.generation += 1
+            keys = [k for k, e in self._entries.items() if e.database_id == database_id]
+            for key in keys:
+                self._remove(key)
+        if keys:
+            self.logger.info("result_cache_invalidated", database_id=database_id, count=len(keys))
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        """Remove an entry; the caller holds the lock."""
+        self._bytes -= self._entries.pop(key).size
+
+    def stats(self) -> dict[str, Any]:
+        """Get cache usage statistics.
+
+        Returns:
+            Dictionary with entries, bytes used, hit and miss counts.
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else None,
+                "evictions": self._evictions,
+            }
+
+
+# Global result cache instance
+_cache: ResultCache | None = None
+
+
+def get_result_cache() -> ResultCache:
+    """Get the global result cache instance."""
+    global _cache
+    if _cache is None:
+        _cache = ResultCache(get_config().result_cache_max_bytes)
+    return _cache
@@ -0,0 +1,648 @@
+"""Server-side result sets that are read page by page."""
+
+import asyncio
+import fcntl
+import secrets
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any, TextIO
+
+from .config import get_config
+from .constants import Query
+from .logging import get_logger
+from .result_cache import estimate_size
+
+# Range of values SQLite stores as INTEGER
+_SQLITE_INT_MIN = -(2**63)
+_SQLITE_INT_MAX = 2**63 - 1
+
+# Held locked by the process that owns a spool directory for as long as it runs
+_LOCK_FILE = "lock"
+
+
+class ResultSpoolFullError(RuntimeError):
+    """Raised when spooling a result would exceed the spool's disk quota."""
+
+    def __init__(self, quota: int) -> None:
+        """Initialize the exception.
+
+        Args:
+            quota: The disk quota in bytes.
+        """
+        self.quota = quota
+        super().__init__(
+            f"Result is too large to keep: the result spool's disk quota of "
+            f"{quota // (1024 * 1024)} MiB is in use"
+        )
+
+
+class ResultClosedError(ValueError):
+    """Raised when reading a result that was released or expired."""
+
+    def __init__(self, handle: str) -> None:
+        """Initialize the exception.
+
+        Args:
+            handle: The result handle.
+        """
+        self.handle = handle
+        super().__init__(f"Result '{handle}' not found or expired")
+
+
+def _sort_key(value: Any) -> tuple[int, Any]:
+    """Order values the way SQLite does: NULL, then numbers, then text."""
+    if value is None:
+        return (0, 0)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    return (2, str(value))
+
+
+def _numeric_sort_key(value: Any) -> tuple[int, Any]:
+    """Order numbers kept as text (decimals) by value, as ``CAST(... AS REAL)`` does."""
+    if value is None:
+        return (0, 0)
+    try:
+        return (1, float(value))
+    except ValueError:
+        return _sort_key(value)
+
+
+class SpooledResult:
+    """The rows of one executed query, kept for paging.
+
+    Rows are appended as lists of JSON-serializable values. They are held
+    in memory until their estimated size exceeds ``memory_budget``, or
+    the spool reports that all results together exceed its budget; from
+    then on all rows live in a table of a private SQLite file in
+    ``directory``, written batch by batch as they arrive, so the result never
+    needs to fit in memory. Rows are kept in arrival order (the table's
+    rowid) and can be read in the order of any column.
+    """
+
+    def __init__(
+        self,
+        database_id: int,
+        database_name: str,
+        executed_sql: str,
+        memory_budget: int,
+        directory: Path,
+        on_disk_change: Callable[[int], None] | None = None,
+        on_memory_change: Callable[[int], bool] | None = None,
+    ) -> None:
+        """Initialize an empty result.
+
+        Args:
+            database_id: The database the result was read from.
+            database_name: The database's name.
+            executed_sql: The SQL that produced the result.
+            memory_budget: Estimated bytes kept in memory before spilling to disk.
+            directory: Where the spill file is created.
+            on_disk_change: Called with the change in the spill file's size;
+                may raise to stop the result from growing.
+            on_memory_change: Called with the change in the memory the rows
+                use; returns False to have the result spill.
+        """
+        self.handle = secrets.token_urlsafe(16)
+        self.database_id = database_id
+        self.database_name = database_name
+        self.executed_sql = executed_sql
+        self.memory_budget = memory_budget
+        self.path = directory / f"{self.handle}.sqlite"
+        self.columns: list[Any] = []
+        # Indexes of boolean columns, which SQLite returns as 0 and 1
+        self.boolean_columns: list[int] = []
+        # Indexes of numeric columns whose values are kept as text (decimals)
+        self.numeric_columns: list[int] = []
+        self.has_limit = False
+        self.limit_value: int | None = None
+        self.execution_time_ms = 0
+        self.expires_at = 0.0
+        self.closed = False
+        self.row_count = 0
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+        self._width = 0
+        self._rows: list[list[Any]] = []
+        self._orders: dict[tuple[int, bool], list[int]] = {}
+        self._conn: sqlite3.Connection | None = None
+        self._on_disk_change = on_disk_change
+        self._on_memory_change = on_memory_change
+        self._lock = threading.Lock()
+
+    @property
+    def spilled(self) -> bool:
+        """Whether the rows have moved to disk."""
+        return self._conn is not None
+
+    def append(self, rows: Sequence[list[Any]]) -> None:
+        """Add rows to the end of the result, spilling to disk past the budget.
+
+        Args:
+            rows: Rows of JSON-serializable values.
+
+        Raises:
+            ResultSpoolFullError: If the spill file outgrows the disk quota.
+        """
+        if not rows:
+            return
+        with self._lock:
+            self._width = len(rows[0])
+            self._orders.clear()
+            if self._conn is None:
+                self._rows.extend(rows)
+                size = estimate_size(rows)
+                self.memory_bytes += size
+                within_budget = self._report_memory(size)
+                if self.memory_bytes > self.memory_budget or not within_budget:
+                    self._spill()
+            else:
+                self._write(rows)
+            self.row_count += len(rows)
+            growth = self._measure_disk()
+        if growth and self._on_disk_change is not None:
+            self._on_disk_change(growth)
+
+    def read(
+        self, offset: int, limit: int, sort: int | None = None, descending: bool = False
+    ) -> list[list[Any]]:
+        """Read consecutive rows, in arrival order or sorted by a column.
+
+        Sorting orders NULLs first, then numbers, then text, like SQLite;
+        columns in ``numeric_columns`` are sorted by their numeric value.
+        Rows with equal values keep their arrival order (reversed when
+        descending).
+
+        Args:
+            offset: Index of the first row.
+            limit: Maximum number of rows.
+            sort: Index of the column to sort by, or None for arrival order.
+            descending: Whether to sort in descending order.
+
+        Returns:
+            The rows; fewer than ``limit`` at the end of the result.
+
+        Raises:
+            ResultClosedError: If the result was closed, so its rows are gone.
+        """
+        with self._lock:
+            if self.closed:
+                raise ResultClosedError(self.handle)
+            end = min(offset + limit, self.row_count)
+            if offset >= end:
+                return []
+            if self._conn is None:
+                if sort is None:
+                    return self._rows[offset:end]
+                order = self._memory_order(sort, descending)
+                return [self._rows[i] for i in order[offset:end]]
+            if sort is None:
+                cursor = self._conn.execute(
+                    "SELECT * FROM result WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                    (offset, end - offset),
+                )
+            else:
+                direction = "DESC" if descending else "ASC"
+                key = f"CAST(c{sort} AS REAL)" if sort in self.numeric_columns else f"c{sort}"
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS sort_{sort} ON result ({key})")
+                cursor = self._conn.execute(
+                    f"SELECT * FROM result ORDER BY {key} {direction}, rowid {direction} "
+                    "LIMIT ? OFFSET ?",
+                    (end - offset, offset),
+                )
+            rows = [list(row) for row in cursor]
+            growth = self._measure_disk()
+        for row in rows:
+            for i in self.boolean_columns:
+                if row[i] is not None:
+                    row[i] = bool(row[i])
+        if growth and self._on_disk_change is not None:
+            self._on_disk_change(growth)
+        return rows
+
+    def close(self) -> None:
+        """Release the result's memory and delete its spill file."""
+        with self._lock:
+            self.closed = True
+            self._rows = []
+            self._orders.clear()
+            self._report_memory(-self.memory_bytes)
+            self.memory_bytes = 0
+            freed = self.disk_bytes
+            self.disk_bytes = 0
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                self.path.unlink(missing_ok=True)
+        if freed and self._on_disk_change is not None:
+            self._on_disk_change(-freed)
+
+    def _memory_order(self, sort: int, descending: bool) -> list[int]:
+        """Get the row indexes in the order of a column; the caller holds the lock."""
+        order = self._orders.get((sort, descending))
+        if order is None:
+            rows = self._rows
+            sort_key = _numeric_sort_key if sort in self.numeric_columns else _sort_key
+            order = sorted(range(len(rows)), key=lambda i: sort_key(rows[i][sort]))
+            if descending:
+                order.reverse()
+            self._orders[(sort, descending)] = order
+        return order
+
+    def _spill(self) -> None:
+        """Move the in-memory rows to the spill file; the caller holds the lock."""
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        # The file is private and disposable: no journal, no fsync
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        columns = ", ".join(f"c{i}" for i in range(self._width))
+        conn.execute(f"CREATE TABLE result ({columns})")
+        self._conn = conn
+        self._write(self._rows)
+        self._rows = []
+        self._report_memory(-self.memory_bytes)
+        self.memory_bytes = 0
+
+    def _report_memory(self, change: int) -> bool:
+        """Report a change in the memory the rows use; the caller holds the lock.
+
+        Returns:
+            Whether the spool's memory budget still holds.
+        """
+        if not change or self._on_memory_change is None:
+            return True
+        return self._on_memory_change(change)
+
+    def _write(self, rows: Sequence[list[Any]]) -> None:
+        """Append rows to the spill file; the caller holds the lock."""
+        assert self._conn is not None
+        placeholders = ", ".join("?" * self._width)
+        statement = f"INSERT INTO result VALUES ({placeholders})"
+        try:
+            self._insert(statement, rows)
+        except OverflowError:
+            # Integers beyond 64 bits (unsigned BIGINT) are kept as text
+            self._insert(
+                statement,
+                [
+                    [
+                        str(v)
+                        if isinstance(v, int) and not _SQLITE_INT_MIN <= v <= _SQLITE_INT_MAX
+                        else v
+                        for v in row
+                    ]
+                    for row in rows
+                ],
+            )
+
+    def _insert(self, statement: str, rows: Sequence[Sequence[Any]]) -> None:
+        """Insert rows in one transaction; the caller holds the lock."""
+        assert self._conn is not None
+        self._conn.execute("BEGIN")
+        try:
+            self._conn.executemany(statement, rows)
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def _measure_disk(self) -> int:
+        """Update the spill file size; the caller holds the lock.
+
+        Returns:
+            The growth in bytes since the last measurement.
+        """
+        if self._conn is None:
+            return 0
+        size = self.path.stat().st_size
+        growth = size - self.disk_bytes
+        self.disk_bytes = size
+        return growth
+
+
+class ResultSpool:
+    """Registry of result sets kept for paging, keyed by an unguessable handle.
+
+    A result expires ``ttl`` seconds after it was stored or last read.
+    Expired results are dropped the next time the spool is used and by a
+    background janitor; when ``max_results`` are held, the one closest to
+    expiring is dropped to make room for a new one. Results in memory
+    together use at most about ``total_memory_budget`` bytes: a result
+    whose rows take them over it spills to disk. The spill files of all
+    results of the process together may not exceed ``disk_quota`` bytes.
+
+    Each spool keeps its spill files in its own subdirectory of
+    ``directory``, holding an exclusive ``flock`` on a lock file in it while
+    the process runs. The lock is released by the kernel when the process
+    exits, however it exits, so a subdirectory whose lock can be taken is
+    known to be orphaned; process IDs are not used, as they are reused and
+    differ between containers sharing the directory.
+    """
+
+    def __init__(
+        self,
+        ttl: float = Query.RESULT_SPOOL_TTL,
+        memory_budget: int = Query.RESULT_SPOOL_MEMORY_BYTES,
+        max_results: int = Query.RESULT_SPOOL_MAX_RESULTS,
+        disk_quota: int = Query.RESULT_SPOOL_DISK_QUOTA,
+        directory: Path | None = None,
+        sweep_interval: float = Query.RESULT_SPOOL_SWEEP_INTERVAL,
+        total_memory_budget: int = Query.RESULT_SPOOL_TOTAL_MEMORY_BYTES,
+    ) -> None:
+        """Initialize the spool.
+
+        Args:
+            ttl: Seconds a result is kept after it was stored or last read.
+            memory_budget: Estimated bytes of each result kept in memory.
+            max_results: Maximum results held at once.
+            disk_quota: Maximum bytes of spill files of this process.
+            directory: Where the spool's directory of spill files is created;
+                a directory under the system temporary directory by default.
+            sweep_interval: Seconds between runs of the janitor.
+            total_memory_budget: Estimated bytes of all results kept in memory.
+        """
+        self.logger = get_logger(__name__)
+        self.ttl = ttl
+        self.memory_budget = memory_budget
+        self.max_results = max_results
+        self.disk_quota = disk_quota
+        self.directory = directory or Path(tempfile.gettempdir()) / "db_query_spool"
+        self.sweep_interval = sweep_interval
+        self.total_memory_budget = total_memory_budget
+        self._results: dict[str, SpooledResult] = {}
+        self._lock = threading.Lock()
+        self._disk_bytes = 0
+        self._disk_lock = threading.Lock()
+        self._memory_bytes = 0
+        self._memory_lock = threading.Lock()
+        self._own_directory: Path | None = None
+        self._lock_file: TextIO | None = None
+        self._janitor_task: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        """Return the number of results held."""
+        return len(self._results)
+
+    def create(self, database_id: int, database_name: str, executed_sql: str) -> SpooledResult:
+        """Create an empty result to be filled and then stored with ``add``.
+
+        A result that fails while it is filled must be closed by the caller.
+
+        Args:
+            database_id: The database the result is read from.
+            database_name: The database's name.
+            executed_sql: The SQL that produces the result.
+
+        Returns:
+            The new result.
+        """
+        return SpooledResult(
+            database_id,
+            database_name,
+            executed_sql,
+            self.memory_budget,
+            self._process_directory(),
+            self._account_disk,
+            self._account_memory,
+        )
+
+    def add(self, result: SpooledResult) -> None:
+        """Store a complete result so its pages can be read by handle.
+
+        Args:
+            result: The result.
+        """
+        self.sweep()
+        with self._lock:
+            while len(self._results) >= self.max_results:
+                oldest = min(self._results.values(), key=lambda r: r.expires_at)
+                self._drop(oldest.handle)
+            result.expires_at = time.monotonic() + self.ttl
+            self._results[result.handle] = result
+        self.logger.info(
+            "result_spooled",
+            database=result.database_name,
+            row_count=result.row_count,
+            spilled=result.spilled,
+            disk_bytes=result.disk_bytes,
+        )
+
+    def get(self, handle: str) -> SpooledResult | None:
+        """Get a stored result and extend its lifetime.
+
+        Args:
+            handle: The result handle.
+
+        Returns:
+            The result, or None if it is unknown or has expired.
+        """
+        self.sweep()
+        with self._lock:
+            result = self._results.get(handle)
+            if result is not None:
+                result.expires_at = time.monotonic() + self.ttl
+            return result
+
+    def remove(self, handle: str) -> bool:
+        """Drop a result before it expires.
+
+        Args:
+            handle: The result handle.
+
+        Returns:
+            True if the result was held.
+        """
+        with self._lock:
+            return self._drop(handle)
+
+    def sweep(self) -> int:
+        """Drop expired results.
+
+        Returns:
+            The number of results dropped.
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = [h for h, r in self._results.items() if r.expires_at <= now]
+            for handle in expired:
+                self._drop(handle)
+        if expired:
+            self.logger.debug("spooled_results_expired", count=len(expired))
+        return len(expired)
+
+    def remove_orphans(self) -> int:
+        """Delete the spill directories of processes that have exited.
+
+        A directory is deleted only while holding its lock, which a running
+        owner never releases.
+
+        Returns:
+            The number of directories deleted.
+        """
+        if not self.directory.is_dir():
+            return 0
+        removed = 0
+        for path in self.directory.iterdir():
+            # Dot-prefixed directories are still being set up by their owner
+            if path.name.startswith(".") or path == self._own_directory or not path.is_dir():
+                continue
+            try:
+                with open(path / _LOCK_FILE) as lock:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    shutil.rmtree(path, ignore_errors=True)
+            except (BlockingIOError, FileNotFoundError):
+                # Locked by a running process, or not a spill directory
+                continue
+            removed += 1
+        if removed:
+            self.logger.info("orphaned_spool_directories_removed", count=removed)
+        return removed
+
+    def clear(self) -> None:
+        """Drop all results."""
+        with self._lock:
+            for handle in list(self._results):
+                self._drop(handle)
+
+    def _process_directory(self) -> Path:
+        """Get the spool's own directory of spill files, creating and locking it first."""
+        with self._disk_lock:
+            if self._own_directory is None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                # Lock before the directory gets the name other processes clean up
+                staging = self.directory / f".{secrets.token_hex(8)}"
+                staging.mkdir()
+                # Kept open (and so locked) until the spool is closed
+                lock = open(staging / _LOCK_FILE, "w")
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                self._own_directory = staging.rename(self.directory / staging.name[1:])
+                self._lock_file = lock
+            return self._own_directory
+
+    def _release_directory(self) -> None:
+        """Delete the spool's own directory and release its lock."""
+        with self._disk_lock:
+            if self._own_directory is not None:
+                shutil.rmtree(self._own_directory, ignore_errors=True)
+                if self._lock_file is not None:
+                    self._lock_file.close()
+                self._own_directory = None
+                self._lock_file = None
+
+    def _drop(self, handle: str) -> bool:
+        """Close and forget a result; the caller holds the lock."""
+        result = self._results.pop(handle, None)
+        if result is None:
+            return False
+        result.close()
+        return True
+
+    def _account_disk(self, change: int) -> None:
+        """Track the size of the spill files, enforcing the disk quota.
+
+        Args:
+            change: Bytes a spill file grew (or, if negative, shrank) by.
+
+        Raises:
+            ResultSpoolFullError: If the growth takes the spill files over the quota.
+        """
+        with self._disk_lock:
+            self._disk_bytes += change
+            used = self._disk_bytes
+        if change > 0 and used > self.disk_quota:
+            self.logger.warning(
+                "result_spool_disk_quota_exceeded", disk_bytes=used, quota=self.disk_quota
+            )
+            raise ResultSpoolFullError(self.disk_quota)
+
+    def _account_memory(self, change: int) -> bool:
+        """Track the memory all results use.
+
+        Args:
+            change: Bytes a result's rows grew (or, if negative, shrank) by.
+
+        Returns:
+            Whether the results fit in the total memory budget.
+        """
+        with self._memory_lock:
+            self._memory_bytes += change
+            return self._memory_bytes <= self.total_memory_budget
+
+    async def start(self) -> None:
+        """Remove orphaned spill files and start the background janitor."""
+        await asyncio.to_thread(self.remove_orphans)
+        if self._janitor_task is None or self._janitor_task.done():
+            self._janitor_task = asyncio.create_task(self._janitor())
+
+    async def _janitor(self) -> None:
+        """Background task that drops expired results and orphaned spill files."""
+        self.logger.info("result_spool_janitor_started")
+        while True:
+            try:
+                await asyncio.sleep(self.sweep_interval)
+                await asyncio.to_thread(self.sweep)
+                await asyncio.to_thread(self.remove_orphans)
+            except asyncio.CancelledError:
+                self.logger.info("result_spool_janitor_cancelled")
+                break
+            except Exception as e:
+                # Log but don't stop the janitor
+                self.logger.error("result_spool_janitor_error", error=str(e))
+
+    async def close(self) -> None:
+        """Stop the janitor, drop all results and delete the spool's directory."""
+        if self._janitor_task and not self._janitor_task.done():
+            self._janitor_task.cancel()
+            try:
+                await self._janitor_task
+            except asyncio.CancelledError:
+                pass
+        self._janitor_task = None
+        self.clear()
+        self._release_directory()
+
+    def stats(self) -> dict[str, Any]:
+        """Get spool usage statistics.
+
+        Returns:
+            Dictionary with the results held and the memory and disk they use.
+        """
+        with self._lock:
+            results = list(self._results.values())
+        return {
+            "results": len(results),
+            "max_results": self.max_results,
+            "rows": sum(r.row_count for r in results),
+            # Includes the rows of results still being read
+            "memory_bytes": self._memory_bytes,
+            "total_memory_budget": self.total_memory_budget,
+            "spilled_results": sum(1 for r in results if r.spilled),
+            # Includes the spill files of results still being read
+            "disk_bytes": self._disk_bytes,
+            "disk_quota": self.disk_quota,
+            "ttl_seconds": self.ttl,
+        }
+
+
+# Global result spool instance
+_spool: ResultSpool | None = None
+
+
+def get_result_spool() -> ResultSpool:
+    """Get the global result spool instance."""
+    global _spool
+    if _spool is None:
+        config = get_config()
+        _spool = ResultSpool(
+            config.result_spool_ttl,
+            config.result_spool_memory_bytes,
+            disk_quota=config.result_spool_disk_quota,
+            directory=Path(config.result_spool_dir) if config.result_spool_dir else None,
+            total_memory_budget=config.result_spool_total_memory_bytes,
+        )
+    return _spool
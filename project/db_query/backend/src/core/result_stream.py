@@ -0,0 +1,233 @@
+"""Server-side cursors that fetch query results in batches."""
+
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any, TypeVar, cast
+
+from sqlalchemy import Connection, CursorResult, Engine, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncResult
+
+from .query_cancel import QueryCancelHandle
+from .query_executor import BoundedExecutor
+
+T = TypeVar("T")
+
+
+class ResultStream(ABC):
+    """A query result read batch by batch from a server-side cursor.
+
+    The driver is asked to stream (``yield_per``), so neither the driver
+    nor the application holds more than about one batch of rows at a time.
+    Call ``open`` first and always ``close`` afterwards, which releases
+    the connection.
+    """
+
+    def __init__(self, sql: str, batch_size: int) -> None:
+        """Initialize the stream.
+
+        Args:
+            sql: The SQL to execute.
+            batch_size: Rows fetched per batch.
+        """
+        self.sql = sql
+        self.batch_size = batch_size
+        self.columns: list[str] = []
+        # The DBAPI cursor description, read before the cursor may be closed
+        self.description: Sequence[Sequence[Any]] | None = None
+
+    @abstractmethod
+    async def open(self) -> None:
+        """Execute the query and read the result's column names and description."""
+
+    @abstractmethod
+    async def fetch(self) -> Sequence[Sequence[Any]]:
+        """Fetch the next batch of rows.
+
+        Returns:
+            Up to ``batch_size`` rows; an empty batch at the end of the result.
+        """
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Close the cursor and release the connection."""
+
+
+class SyncResultStream(ResultStream):
+    """Result stream over a blocking engine, with each step run on an executor.
+
+    Steps run one at a time under a lock, so ``close`` after a cancelled
+    ``fetch`` waits for the abandoned fetch to stop (the cancel handle
+    interrupts it) instead of closing the connection under it.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        sql: str,
+        batch_size: int,
+        executor: BoundedExecutor | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        """Initialize the stream.
+
+        Args:
+            engine: The SQLAlchemy engine.
+            sql: The SQL to execute.
+            batch_size: Rows fetched per batch.
+            executor: The database's bounded executor, or None for the loop's default.
+            timeout: Seconds allowed for each step, also enforced server-side where supported.
+        """
+        super().__init__(sql, batch_size)
+        self.engine = engine
+        self.executor = executor
+        self.timeout = timeout
+        self._handle = QueryCancelHandle(engine, timeout)
+        self._step_lock = threading.Lock()
+        self._conn: Connection | None = None
+        self._result: CursorResult[Any] | None = None
+
+    async def open(self) -> None:
+        """Execute the query and read the result's column names."""
+        await self._run(self._open)
+
+    def _open(self) -> None:
+        """Check out a connection and start the query (runs on a worker)."""
+        self._conn = self.engine.connect()
+        self._handle.attach(self._conn)
+        self._result = self._conn.execute(
+            text(self.sql), execution_options={"yield_per": self.batch_size}
+        )
+        self.columns = list(self._result.keys())
+        self.description = self._result.cursor.description
+
+    async def fetch(self) -> Sequence[Sequence[Any]]:
+        """Fetch the next batch of rows.
+
+        Returns:
+            Up to ``batch_size`` rows; an empty batch at the end of the result.
+        """
+        assert self._result is not None
+        return await self._run(self._result.fetchmany, self.batch_size)
+
+    async def close(self) -> None:
+        """Close the cursor and release the connection."""
+        loop = asyncio.get_running_loop()
+        # Not on the bounded executor: closing must never be rejected
+        await loop.run_in_executor(None, self._locked, self._close)
+
+    def _close(self) -> None:
+        """Close the result and return the connection (runs on a worker)."""
+        try:
+            if self._result is not None:
+                self._result.close()
+        finally:
+            self._handle.detach()
+            if self._conn is not None:
+                self._conn.close()
+            self._result = None
+            self._conn = None
+
+    def _locked(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a step under the step lock."""
+        with self._step_lock:
+            return fn(*args)
+
+    async def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a step on the executor, cancelling it through the driver if abandoned.
+
+        Args:
+            fn: The blocking step.
+            *args: Positional arguments for the step.
+
+        Returns:
+            The step's return value.
+        """
+        loop = asyncio.get_running_loop()
+        if self.executor is not None:
+            step: Awaitable[T] = self.executor.run(self._locked, fn, *args)
+        else:
+            step = loop.run_in_executor(None, self._locked, fn, *args)
+        try:
+            return await asyncio.wait_for(step, timeout=self.timeout)
+        except (TimeoutError, asyncio.CancelledError):
+            loop.run_in_executor(None, self._handle.cancel)
+            raise
+
+
+class AsyncResultStream(ResultStream):
+    """Result stream over an async engine."""
+
+    def __init__(
+        self, engine: AsyncEngine, sql: str, batch_size: int, timeout: float | None = None
+    ) -> None:
+        """Initialize the stream.
+
+        Args:
+            engine: The SQLAlchemy async engine.
+            sql: The SQL to execute.
+            batch_size: Rows fetched per batch.
+            timeout: Seconds allowed for each step.
+        """
+        super().__init__(sql, batch_size)
+        self.engine = engine
+        self.timeout = timeout
+        self._conn: AsyncConnection | None = None
+        self._result: AsyncResult[Any] | None = None
+
+    async def open(self) -> None:
+        """Execute the query and read the result's column names."""
+        self._conn = await self.engine.connect()
+        self._result = await asyncio.wait_for(
+            self._conn.stream(text(self.sql), execution_options={"yield_per": self.batch_size}),
+            timeout=self.timeout,
+        )
+        self.columns = list(self._result.keys())
+        # An async result wraps the cursor result that holds the adapted cursor
+        cursor_result = cast(CursorResult[Any], self._result._real_result)
+        self.description = cursor_result.cursor.description
+
+    async def fetch(self) -> Sequence[Sequence[Any]]:
+        """Fetch the next batch of rows.
+
+        Returns:
+            Up to ``batch_size`` rows; an empty batch at the end of the result.
+        """
+        assert self._result is not None
+        return await asyncio.wait_for(self._result.fetchmany(self.batch_size), timeout=self.timeout)
+
+    async def close(self) -> None:
+        """Close the cursor and release the connection."""
+        try:
+            if self._result is not None:
+                await self._result.close()
+        finally:
+            if self._conn is not None:
+                await self._conn.close()
+            self._result = None
+            self._conn = None
+
+
+def create_result_stream(
+    engine: Engine | AsyncEngine,
+    sql: str,
+    batch_size: int,
+    executor: BoundedExecutor | None = None,
+    timeout: float | None = None,
+) -> ResultStream:
+    """Create a result stream for an engine.
+
+    Args:
+        engine: The SQLAlchemy engine or async engine.
+        sql: The SQL to execute.
+        batch_size: Rows fetched per batch.
+        executor: The database's bounded executor (blocking engines only).
+        timeout: Seconds allowed for each step.
+
+    Returns:
+        The unopened result stream.
+    """
+    if isinstance(engine, AsyncEngine):
+        return AsyncResultStream(engine, sql, batch_size, timeout)
+    return SyncResultStream(engine, sql, batch_size, executor, timeout)
@@ -0,0 +1,79 @@
+"""Coalescing of identical concurrent queries into one execution."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Runs at most one execution per key at a time and shares its outcome.
+
+    The first caller for a key starts the execution as a task; callers that
+    arrive while it runs await the same task instead of starting their own,
+    and all of them receive its result or exception. Callers await the task
+    through a shield, so a caller that disconnects does not cancel the
+    execution for the others.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the coalescer."""
+        self._in_flight: dict[Hashable, asyncio.Task[Any]] = {}
+        self._executions = 0
+        self._coalesced = 0
+
+    async def run(self, key: Hashable, execute: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Run ``execute``, or join the execution already running for ``key``.
+
+        Args:
+            key: Identifies executions whose results are interchangeable.
+            execute: Starts the execution.
+
+        Returns:
+            The result, and whether it was shared from another caller's execution.
+        """
+        task = self._in_flight.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(execute())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+            self._executions += 1
+        else:
+            self._coalesced += 1
+        return await asyncio.shield(task), shared
+
+    def _finished(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        """Forget a finished execution so the next caller starts a new one."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception retrieved; every caller may have gone away
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict[str, Any]:
+        """Get coalescing statistics.
+
+        Returns:
+            Dictionary with running, executed and coalesced counts.
+        """
+        requests = self._executions + self._coalesced
+        return {
+            "in_flight": len(self._in_flight),
+            "executions": self._executions,
+            "coalesced": self._coalesced,
+            "coalesced_ratio": round(self._coalesced / requests, 4) if requests else None,
+        }
+
+
+# Global coalescer instance
+_single_flight: SingleFlight | None = None
+
+
+def get_single_flight() -> SingleFlight:
+    """Get the global query coalescer instance."""
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
@@ -148,6 +148,24 @@ class SQLParser:
 
         return sql
 
+    def normalize(self, sql: str) -> str:
+        """Render SQL in the dialect's canonical form.
+
+        Whitespace, keyword case and comments are normalized, so queries that
+        differ only in formatting give the same string. Identifiers are kept
+        as written, as their case may matter to the database.
+
+        Args:
+            sql: The SQL to normalize.
+
+        Returns:
+            The normalized SQL.
+
+        Raises:
+            SQLParseError: If the SQL cannot be parsed.
+        """
+        return self.parse(sql).sql(dialect=self.dialect, comments=False)
+
     def get_error_location(self, sql: str, error_message: str) -> dict[str, int | None]:
         """Extract error location from sqlglot error message.
 
@@ -1,22 +1,76 @@
 """SQLite database layer for storing metadata and connections."""
 
+import asyncio
 import os
+import sqlite3
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar, cast
 
 import aiosqlite
+from pydantic import BaseModel
 
 from .config import get_config
+from .constants import Database
+from .history_rollups import apply_history_rollups
+
+# Applied once to the writer connection; journal_mode persists in the file
+_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    f"PRAGMA busy_timeout = {Database.SQLITE_BUSY_TIMEOUT_MS}",
+    f"PRAGMA mmap_size = {Database.SQLITE_MMAP_SIZE}",
+    f"PRAGMA cache_size = -{Database.SQLITE_CACHE_SIZE_KB}",
+    "PRAGMA foreign_keys = ON",
+)
+
+# Applied once to every reader connection
+_READER_PRAGMAS = (*_PRAGMAS[1:], "PRAGMA query_only = ON")
+
+
+M = TypeVar("M", bound=BaseModel)
+
+# PRAGMA auto_vacuum value for INCREMENTAL
+_AUTO_VACUUM_INCREMENTAL = 2
+
+# Columns added to existing tables after their initial release, applied with
+# ALTER TABLE on startup so older database files keep working
+_ADDED_COLUMNS: dict[str, dict[str, str]] = {
+    "databases": {
+        "pool_size": "INTEGER",
+        "max_overflow": "INTEGER",
+        "pool_timeout": "INTEGER",
+        "pool_recycle": "INTEGER",
+        "pool_pre_ping": "BOOLEAN",
+        "pool_class": "TEXT",
+        "executor_workers": "INTEGER",
+        "executor_queue_size": "INTEGER",
+        "max_concurrent_queries": "INTEGER",
+        "admission_queue_size": "INTEGER",
+        "admission_max_wait": "REAL",
+        "result_cache_ttl": "REAL",
+    },
+}
 
 
 class SQLiteDB:
-    """SQLite database connection and schema management."""
+    """SQLite database connection and schema management.
 
-    def __init__(self, db_path: Path | None = None) -> None:
+    Connections are long-lived: all writes go through a single dedicated
+    writer connection, and reads (``fetch_one``/``fetch_all``) use a small
+    pool of read-only connections, which WAL mode lets run alongside the
+    writer without waiting for it.
+    """
+
+    def __init__(
+        self, db_path: Path | None = None, read_pool_size: int = Database.SQLITE_READ_POOL_SIZE
+    ) -> None:
         """Initialize the SQLite database connection.
 
         Args:
             db_path: Path to the SQLite database file. If None, uses config default.
+            read_pool_size: Maximum number of reader connections.
         """
         if db_path is None:
             # Check if DB_PATH is set in environment (for testing)
@@ -27,28 +81,146 @@ class SQLiteDB:
                 db_path = get_config().get_resolved_db_path()
 
         self.db_path = db_path
+        self.read_pool_size = read_pool_size
+        self._writer: aiosqlite.Connection | None = None
+        self._readers: list[aiosqlite.Connection] = []
+        self._reader_slots = 0
+        # Pool primitives belong to the event loop they were created on
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._write_lock: asyncio.Lock | None = None
+        self._idle_readers: asyncio.Queue[aiosqlite.Connection] | None = None
 
-    async def connect(self) -> aiosqlite.Connection:
+    async def connect(self, read_only: bool = False) -> aiosqlite.Connection:
         """Create a new database connection.
 
+        Args:
+            read_only: Open the file with ``mode=ro`` so the connection can
+                never take the write lock.
+
         Returns:
             An aiosqlite connection object.
         """
-        conn = await aiosqlite.connect(self.db_path)
-        # Enable foreign keys
-        await conn.execute("PRAGMA foreign_keys = ON")
+        if read_only:
+            uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+            # Autocommit: a reader must never hold a transaction open, or it
+            # would keep reading its old snapshot
+            conn = await aiosqlite.connect(uri, uri=True, isolation_level=None)
+            pragmas = _READER_PRAGMAS
+        else:
+            conn = await aiosqlite.connect(self.db_path)
+            pragmas = _PRAGMAS
+        for pragma in pragmas:
+            await conn.execute(pragma)
         # Return rows as dictionaries
         conn.row_factory = aiosqlite.Row
         return conn
 
+    def _bind_loop(self) -> None:
+        """Reset the pool if it was created on another event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        # Connections opened on a previous loop cannot be awaited from this one
+        for conn in [*self._readers, *filter(None, [self._writer])]:
+            conn.stop()
+        self._writer = None
+        self._readers = []
+        self._reader_slots = 0
+        self._loop = loop
+        self._write_lock = asyncio.Lock()
+        self._idle_readers = asyncio.Queue()
+
+    @asynccontextmanager
+    async def _writer_connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Hold the dedicated writer connection exclusively.
+
+        Yields:
+            The writer connection.
+        """
+        self._bind_loop()
+        assert self._write_lock is not None
+        async with self._write_lock:
+            if self._writer is None:
+                self._writer = await self.connect()
+            yield self._writer
+
+    @asynccontextmanager
+    async def _reader_connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a reader connection, opening one if the pool is not full.
+
+        Yields:
+            A reader connection.
+        """
+        self._bind_loop()
+        assert self._idle_readers is not None
+        idle_readers = self._idle_readers
+        if idle_readers.empty() and self._reader_slots < self.read_pool_size:
+            # Reserve the slot before awaiting so concurrent callers respect the limit
+            self._reader_slots += 1
+            try:
+                if self._writer is None:
+                    # Read-only connections need the file to exist in WAL mode
+                    async with self._writer_connection():
+                        pass
+                conn = await self.connect(read_only=True)
+            except BaseException:
+                self._reader_slots -= 1
+                raise
+            self._readers.append(conn)
+        else:
+            conn = await idle_readers.get()
+        try:
+            yield conn
+        finally:
+            idle_readers.put_nowait(conn)
+
+    async def close(self) -> None:
+        """Close all pooled connections."""
+        connections = [*self._readers, *filter(None, [self._writer])]
+        self._writer = None
+        self._readers = []
+        self._reader_slots = 0
+        self._loop = None
+        for conn in connections:
+            await conn.close()
+
     async def initialize_schema(self) -> None:
         """Initialize the database schema if it doesn't exist."""
-        conn = await self.connect()
-        try:
+        async with self._writer_connection() as conn:
+            await self._enable_incremental_vacuum(conn)
             await self._create_tables(conn)
             await conn.commit()
-        finally:
-            await conn.close()
+
+    async def _enable_incremental_vacuum(self, conn: aiosqlite.Connection) -> None:
+        """Switch the file to incremental auto-vacuum so freed pages can be released.
+
+        The pragma alone only applies to a file that has not been written
+        yet; any other file (including one that just had WAL enabled) is
+        rebuilt once with VACUUM for the mode to apply.
+
+        Args:
+            conn: The database connection.
+        """
+        if await self._auto_vacuum(conn) == _AUTO_VACUUM_INCREMENTAL:
+            return
+        await conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        if await self._auto_vacuum(conn) != _AUTO_VACUUM_INCREMENTAL:
+            await conn.execute("VACUUM")
+
+    @staticmethod
+    async def _auto_vacuum(conn: aiosqlite.Connection) -> int:
+        """Read the auto-vacuum mode of the file.
+
+        Args:
+            conn: The database connection.
+
+        Returns:
+            0 (none), 1 (full) or 2 (incremental).
+        """
+        cursor = await conn.execute("PRAGMA auto_vacuum")
+        row = await cursor.fetchone()
+        await cursor.close()
+        return row[0] if row else 0
 
     async def _create_tables(self, conn: aiosqlite.Connection) -> None:
         """Create all database tables.
@@ -66,7 +238,19 @@ class SQLiteDB:
                 created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
                 last_connected_at TIMESTAMP,
                 metadata_json TEXT,
-                is_active BOOLEAN NOT NULL DEFAULT 1
+                is_active BOOLEAN NOT NULL DEFAULT 1,
+                pool_size INTEGER,
+                max_overflow INTEGER,
+                pool_timeout INTEGER,
+                pool_recycle INTEGER,
+                pool_pre_ping BOOLEAN,
+                pool_class TEXT,
+                executor_workers INTEGER,
+                executor_queue_size INTEGER,
+                max_concurrent_queries INTEGER,
+                admission_queue_size INTEGER,
+                admission_max_wait REAL,
+                result_cache_ttl REAL
             )
         """)
 
@@ -98,6 +282,202 @@ class SQLiteDB:
             CREATE INDEX IF NOT EXISTS idx_query_history_created_at
             ON query_history(created_at DESC)
         """)
+        # Serves the per-database history listing (filter, order and keyset seek)
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_query_history_name_created
+            ON query_history(database_name, created_at DESC, id DESC)
+        """)
+
+        await self._create_history_counts(conn)
+        await self._create_history_search(conn)
+        await self._create_history_rollups(conn)
+
+        await self._add_missing_columns(conn)
+
+    async def _create_history_counts(self, conn: aiosqlite.Connection) -> None:
+        """Create the per-database history counter and the triggers maintaining it.
+
+        Args:
+            conn: The database connection.
+        """
+        cursor = await conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'query_history_counts'"
+        )
+        backfill = await cursor.fetchone() is None
+
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS query_history_counts (
+                database_name TEXT PRIMARY KEY,
+                count INTEGER NOT NULL
+            )
+        """)
+        await conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_query_history_count_insert
+            AFTER INSERT ON query_history
+            BEGIN
+                INSERT INTO query_history_counts (database_name, count)
+                VALUES (NEW.database_name, 1)
+                ON CONFLICT(database_name) DO UPDATE SET count = count + 1;
+            END
+        """)
+        await conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_query_history_count_delete
+            AFTER DELETE ON query_history
+            BEGIN
+                UPDATE query_history_counts SET count = count - 1
+                WHERE database_name = OLD.database_name;
+            END
+        """)
+
+        if backfill:
+            # History written before the counter existed
+            await conn.execute("""
+                INSERT INTO query_history_counts (database_name, count)
+                SELECT database_name, COUNT(*) FROM query_history GROUP BY database_name
+            """)
+
+    async def _create_history_search(self, conn: aiosqlite.Connection) -> None:
+        """Create the full-text index over history queries and its sync triggers.
+
+        The FTS5 table is an external-content index on ``query_history``, so
+        the text is stored once. Underscores are token characters to keep
+        identifiers such as ``order_items`` whole, and prefix indexes make
+        short prefix searches cheap.
+
+        Args:
+            conn: The database connection.
+        """
+        cursor = await conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'query_history_fts'"
+        )
+        rebuild = await cursor.fetchone() is None
+
+        await conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS query_history_fts USING fts5(
+                input_text,
+                executed_sql,
+                content='query_history',
+                content_rowid='id',
+                tokenize="unicode61 tokenchars '_'",
+                prefix='2 3'
+            )
+        """)
+        await conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_query_history_fts_insert
+            AFTER INSERT ON query_history
+            BEGIN
+                INSERT INTO query_history_fts (rowid, input_text, executed_sql)
+                VALUES (NEW.id, NEW.input_text, NEW.executed_sql);
+            END
+        """)
+        await conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_query_history_fts_delete
+            AFTER DELETE ON query_history
+            BEGIN
+                INSERT INTO query_history_fts (query_history_fts, rowid, input_text, executed_sql)
+                VALUES ('delete', OLD.id, OLD.input_text, OLD.executed_sql);
+            END
+        """)
+        await conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_query_history_fts_update
+            AFTER UPDATE OF input_text, executed_sql ON query_history
+            BEGIN
+                INSERT INTO query_history_fts (query_history_fts, rowid, input_text, executed_sql)
+                VALUES ('delete', OLD.id, OLD.input_text, OLD.executed_sql);
+                INSERT INTO query_history_fts (rowid, input_text, executed_sql)
+                VALUES (NEW.id, NEW.input_text, NEW.executed_sql);
+            END
+        """)
+
+        if rebuild:
+            # Index history written before the search table existed
+            await conn.execute(
+                "INSERT INTO query_history_fts (query_history_fts) VALUES ('rebuild')"
+            )
+
+    async def _create_history_rollups(self, conn: aiosqlite.Connection) -> None:
+        """Create the hourly per-database query statistics rollups.
+
+        Rollups are written together with the history they summarize (see
+        ``apply_history_rollups``) and outlive deleted history items; they
+        are removed with their database.
+
+        Args:
+            conn: The database connection.
+        """
+        cursor = await conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'query_history_rollups'"
+        )
+        backfill = await cursor.fetchone() is None
+
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS query_history_rollups (
+                database_name TEXT NOT NULL,
+                bucket_start TIMESTAMP NOT NULL,
+                total_queries INTEGER NOT NULL,
+                successful_queries INTEGER NOT NULL,
+                failed_queries INTEGER NOT NULL,
+                slow_queries INTEGER NOT NULL,
+                latency_count INTEGER NOT NULL,
+                latency_sum_ms INTEGER NOT NULL,
+                latency_min_ms INTEGER,
+                latency_max_ms INTEGER,
+                total_rows INTEGER NOT NULL,
+                latency_sketch TEXT NOT NULL,
+                PRIMARY KEY (database_name, bucket_start)
+            )
+        """)
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_query_history_rollups_bucket
+            ON query_history_rollups(bucket_start)
+        """)
+        await conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_databases_rollups_delete
+            AFTER DELETE ON databases
+            BEGIN
+                DELETE FROM query_history_rollups WHERE database_name = OLD.name;
+            END
+        """)
+
+        if backfill:
+            # Summarize history written before the rollups existed
+            cursor = await conn.execute(
+                "SELECT database_name, status, execution_time_ms, row_count, created_at "
+                "FROM query_history"
+            )
+            while rows := await cursor.fetchmany(Database.ROLLUP_BACKFILL_BATCH_SIZE):
+                await apply_history_rollups(conn, [dict(row) for row in rows])
+            await cursor.close()
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Run several statements on the writer connection in one transaction.
+
+        Commits when the block exits normally and rolls back on an exception.
+
+        Yields:
+            The writer connection.
+        """
+        async with self._writer_connection() as conn:
+            try:
+                yield conn
+                await conn.commit()
+            except BaseException:
+                await conn.rollback()
+                raise
+
+    async def _add_missing_columns(self, conn: aiosqlite.Connection) -> None:
+        """Add columns introduced after a table was first created.
+
+        Args:
+            conn: The database connection.
+        """
+        for table, columns in _ADDED_COLUMNS.items():
+            cursor = await conn.execute(f"PRAGMA table_info({table})")
+            existing = {row[1] for row in await cursor.fetchall()}
+            for column, column_type in columns.items():
+                if column not in existing:
+                    await conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
 
     async def execute(self, sql: str, params: dict[str, Any] | None = None) -> aiosqlite.Cursor:
         """Execute a SQL query with optional parameters.
@@ -109,16 +489,35 @@ class SQLiteDB:
         Returns:
             The cursor object.
         """
-        conn = await self.connect()
-        try:
-            if params:
-                cursor = await conn.execute(sql, params)
-            else:
-                cursor = await conn.execute(sql)
-            await conn.commit()
+        async with self._writer_connection() as conn:
+            try:
+                if params:
+                    cursor = await conn.execute(sql, params)
+                else:
+                    cursor = await conn.execute(sql)
+                await conn.commit()
+            except BaseException:
+                # Never leave the shared writer inside a failed transaction
+                await conn.rollback()
+                raise
+            # lastrowid and rowcount stay readable on the closed cursor
+            await cursor.close()
             return cursor
-        finally:
-            await conn.close()
+
+    async def execute_many(self, sql: str, params_seq: list[dict[str, Any]]) -> None:
+        """Execute a SQL statement for each parameter set in one transaction.
+
+        Args:
+            sql: The SQL statement to execute.
+            params_seq: One parameter mapping per execution.
+        """
+        async with self._writer_connection() as conn:
+            try:
+                await conn.executemany(sql, params_seq)
+                await conn.commit()
+            except BaseException:
+                await conn.rollback()
+                raise
 
     async def fetch_one(
         self, sql: str, params: dict[str, Any] | None = None
@@ -132,16 +531,14 @@ class SQLiteDB:
         Returns:
             The row as a dictionary, or None if no row is found.
         """
-        conn = await self.connect()
-        try:
+        async with self._reader_connection() as conn:
             if params:
                 cursor = await conn.execute(sql, params)
             else:
                 cursor = await conn.execute(sql)
             row = await cursor.fetchone()
+            await cursor.close()
             return dict(row) if row else None
-        finally:
-            await conn.close()
 
     async def fetch_all(
         self, sql: str, params: dict[str, Any] | None = None
@@ -155,16 +552,47 @@ class SQLiteDB:
         Returns:
             A list of rows as dictionaries.
         """
-        conn = await self.connect()
-        try:
+        async with self._reader_connection() as conn:
             if params:
                 cursor = await conn.execute(sql, params)
             else:
                 cursor = await conn.execute(sql)
             rows = await cursor.fetchall()
+            await cursor.close()
             return [dict(row) for row in rows]
-        finally:
-            await conn.close()
+
+    async def fetch_models(
+        self, sql: str, params: dict[str, Any] | None, model: type[M]
+    ) -> list[M]:
+        """Fetch rows straight into models.
+
+        Each row is built on the connection's thread by zipping its raw
+        tuple with the column names and validating that dict, skipping the
+        ``aiosqlite.Row`` objects of ``fetch_all`` and any hand-written field
+        copying. Pydantic parses stored timestamps and 0/1 booleans, so the
+        SELECT list only has to name the model's fields.
+
+        Args:
+            sql: The SQL query to execute.
+            params: Optional parameters for the query.
+            model: The model each row is built as.
+
+        Returns:
+            A list of models.
+        """
+        async with self._reader_connection() as conn:
+            cursor = await conn.execute(sql, params or {})
+            names = [column[0] for column in cursor.description]
+            validate = model.model_validate
+
+            def build(_cursor: sqlite3.Cursor, row: tuple[Any, ...]) -> M:
+                return validate(dict(zip(names, row, strict=True)))
+
+            # aiosqlite annotates row factories as classes, like aiosqlite.Row
+            cursor.row_factory = build  # type: ignore[assignment]
+            rows = await cursor.fetchall()
+            await cursor.close()
+            return cast(list[M], rows)
 
 
 # Global database instance
@@ -6,6 +6,7 @@ from .database import (
     DatabaseCreateRequest,
     DatabaseDetail,
     DatabaseListResponse,
+    PoolSettings,
 )
 from .metadata import (
     ColumnMetadata,
@@ -20,6 +21,7 @@ __all__ = [
     "DatabaseCreateRequest",
     "DatabaseDetail",
     "DatabaseListResponse",
+    "PoolSettings",
     "ConnectionString",
     "ColumnMetadata",
     "TableMetadata",
@@ -9,8 +9,80 @@ from ..core.constants import Validation
 from ..lib.json_encoder import CamelModel
 from .metadata import TableMetadata, ViewMetadata
 
+PoolClass = Literal["queue", "null", "static", "singleton_thread"]
 
-class DatabaseCreateRequest(CamelModel):
+
+class PoolSettings(CamelModel):
+    """Connection pool and query executor tuning; unset fields use defaults."""
+
+    pool_size: int | None = Field(
+        None,
+        ge=1,
+        le=Validation.POOL_SIZE_MAX,
+        description="Connections kept open in the pool",
+    )
+    max_overflow: int | None = Field(
+        None,
+        ge=0,
+        le=Validation.POOL_MAX_OVERFLOW_MAX,
+        description="Extra connections allowed beyond pool_size under load",
+    )
+    pool_timeout: int | None = Field(
+        None,
+        ge=1,
+        le=Validation.POOL_TIMEOUT_MAX,
+        description="Seconds to wait for a free connection before failing",
+    )
+    pool_recycle: int | None = Field(
+        None,
+        ge=1,
+        description="Seconds after which a connection is replaced (e.g. below MySQL wait_timeout)",
+    )
+    pool_pre_ping: bool | None = Field(
+        None, description="Test connections for liveness before handing them out"
+    )
+    pool_class: PoolClass | None = Field(
+        None, description="Pool implementation: queue, null, static or singleton_thread"
+    )
+    executor_workers: int | None = Field(
+        None,
+        ge=1,
+        le=Validation.EXECUTOR_WORKERS_MAX,
+        description="Worker threads dedicated to this database's queries",
+    )
+    executor_queue_size: int | None = Field(
+        None,
+        ge=1,
+        le=Validation.EXECUTOR_QUEUE_MAX,
+        description="Queries allowed to wait for a worker before new ones are rejected",
+    )
+    max_concurrent_queries: int | None = Field(
+        None,
+        ge=1,
+        le=Validation.MAX_CONCURRENT_QUERIES_MAX,
+        description="Queries admitted to run against this database at once",
+    )
+    admission_queue_size: int | None = Field(
+        None,
+        ge=0,
+        le=Validation.ADMISSION_QUEUE_MAX,
+        description="Queries allowed to wait for admission before new ones get 429",
+    )
+    admission_max_wait: float | None = Field(
+        None,
+        gt=0,
+        le=Validation.ADMISSION_WAIT_MAX,
+        description="Seconds a query may wait for admission before it gets 429",
+    )
+    result_cache_ttl: float | None = Field(
+        None,
+        ge=0,
+        le=Validation.RESULT_CACHE_TTL_MAX,
+        description="Seconds results are reused for identical queries; 0 disables caching",
+    )
+
+
+class DatabaseCreateRequest(PoolSettings):
     """Request to create a new database connection."""
 
     name: str = Field(
@@ -27,7 +99,7 @@ class DatabaseCreateRequest(CamelModel):
     )
 
 
-class DatabaseUpdateRequest(CamelModel):
+class DatabaseUpdateRequest(PoolSettings):
     """Request to update a database connection."""
 
     name: str | None = Field(
@@ -44,7 +116,7 @@ class DatabaseUpdateRequest(CamelModel):
     )
 
 
-class DatabaseConnection(CamelModel):
+class DatabaseConnection(PoolSettings):
     """A database connection configuration."""
 
     id: int
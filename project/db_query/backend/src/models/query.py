@@ -1,7 +1,7 @@
 """Query and error models."""
 
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import Field
 
@@ -9,6 +9,15 @@ from ..core.constants import Validation
 from ..lib.json_encoder import CamelModel
 from .metadata import ColumnMetadata
 
+# Result encodings of POST /dbs/{name}/query
+ResultFormat = Literal["rows", "columnar"]
+
+# How a query uses the result cache: read and fill it, only fill it, or neither
+CacheMode = Literal["use", "refresh", "bypass"]
+
+# How a query's result was obtained with respect to the result cache
+CacheStatus = Literal["hit", "miss", "refresh", "bypass"]
+
 
 class ErrorDetail(CamelModel):
     """Error detail."""
@@ -76,6 +85,49 @@ class QueryResponse(CamelModel):
     rows: list[dict[str, Any]]
     has_limit: bool = Field(..., description="True if LIMIT was present or added")
     limit_value: int | None = Field(None, description="LIMIT value if present")
+    cache_status: CacheStatus = Field(
+        "bypass", description="hit (served from the result cache), miss, refresh or bypass"
+    )
+    cache_age_ms: int | None = Field(None, description="Age of a cached result (hits only)")
+
+
+class ColumnarQueryResponse(CamelModel):
+    """Response from executing a SQL query, with the rows stored by column."""
+
+    success: bool
+    executed_sql: str = Field(..., description="The SQL that was executed (may have LIMIT added)")
+    row_count: int = Field(..., description="Number of rows returned")
+    execution_time_ms: int = Field(..., description="Query execution time in milliseconds")
+    columns: list[ColumnMetadata]
+    values: list[list[Any]] = Field(
+        ..., description="One array of row values per column, in the order of columns"
+    )
+    has_limit: bool = Field(..., description="True if LIMIT was present or added")
+    limit_value: int | None = Field(None, description="LIMIT value if present")
+    cache_status: CacheStatus = Field(
+        "bypass", description="hit (served from the result cache), miss, refresh or bypass"
+    )
+    cache_age_ms: int | None = Field(None, description="Age of a cached result (hits only)")
+
+
+class ResultPageResponse(CamelModel):
+    """A page of a server-side result set."""
+
+    handle: str = Field(..., description="Handle of the result set, for GET /results/{handle}")
+    executed_sql: str = Field(..., description="The SQL that was executed (may have LIMIT added)")
+    row_count: int = Field(..., description="Number of rows in the whole result set")
+    execution_time_ms: int = Field(..., description="Query execution time in milliseconds")
+    columns: list[ColumnMetadata]
+    rows: list[dict[str, Any]] = Field(..., description="The rows of this page")
+    offset: int = Field(..., description="Index of the page's first row in the result set")
+    next_cursor: str | None = Field(
+        None, description="Opaque cursor for the next page, or null on the last page"
+    )
+    has_limit: bool = Field(..., description="True if LIMIT was present or added")
+    limit_value: int | None = Field(None, description="LIMIT value if present")
+    expires_in_seconds: int = Field(
+        ..., description="Seconds the result set is kept unless another page is read"
+    )
 
 
 class QueryHistoryItem(CamelModel):
@@ -101,6 +153,23 @@ class QueryHistoryResponse(CamelModel):
     total_count: int
     page: int
     page_size: int
+    next_cursor: str | None = Field(
+        None, description="Opaque cursor for the next page, or null on the last page"
+    )
+
+
+class QueryHistorySearchHit(QueryHistoryItem):
+    """A query history item matched by a search."""
+
+    score: float = Field(..., description="Relevance score (higher is more relevant)")
+
+
+class QueryHistorySearchResponse(CamelModel):
+    """Response containing query history search results."""
+
+    query: str
+    items: list[QueryHistorySearchHit]
+    limit: int
 
 
 class ExportRequest(CamelModel):
@@ -2,16 +2,26 @@
 
 import asyncio
 import time
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import cache
+from importlib.util import find_spec
 from typing import Any, Literal
 from urllib.parse import urlparse
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, make_url, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import NullPool, Pool, QueuePool, SingletonThreadPool, StaticPool
 
+from ..core.admission import get_admission_controllers
+from ..core.config import get_config
 from ..core.constants import Database
+from ..core.engine_registry import get_engine_registry
 from ..core.logging import get_logger
+from ..core.query_executor import BoundedExecutor, get_query_executors
+from ..core.result_cache import get_result_cache
 from ..core.sqlite_db import get_db
 from ..models.database import (
     ConnectionString,
@@ -19,8 +29,164 @@ from ..models.database import (
     DatabaseCreateRequest,
     DatabaseDetail,
     DatabaseUpdateRequest,
+    PoolClass,
+    PoolSettings,
 )
 
+_POOL_CLASSES: dict[PoolClass, type[Pool]] = {
+    "queue": QueuePool,
+    "null": NullPool,
+    "static": StaticPool,
+    "singleton_thread": SingletonThreadPool,
+}
+
+# Async SQLAlchemy dialect and the driver module it needs, per backend
+_ASYNC_DRIVERS: dict[str, tuple[str, str]] = {
+    "sqlite": ("sqlite+aiosqlite", "aiosqlite"),
+    "mysql": ("mysql+aiomysql", "aiomysql"),
+    "postgresql": ("postgresql+asyncpg", "asyncpg"),
+}
+
+# The DatabaseConnection fields, for reading rows straight into models
+_CONNECTION_COLUMNS = """
+    id, name, url, db_type, created_at, last_connected_at, is_active,
+    pool_size, max_overflow, pool_timeout, pool_recycle, pool_pre_ping, pool_class,
+    executor_workers, executor_queue_size,
+    max_concurrent_queries, admission_queue_size, admission_max_wait, result_cache_ttl
+"""
+
+
+@cache
+def _module_available(name: str) -> bool:
+    """Check whether an optional module can be imported."""
+    return find_spec(name) is not None
+
+
+@dataclass
+class _Descriptor:
+    """A resolved database record: the redacted detail plus its real URLs."""
+
+    detail: DatabaseDetail
+    url: str
+    driver_url: str
+    loaded_at: float = field(default_factory=time.monotonic)
+
+
+class DescriptorCache:
+    """In-process cache of database descriptors keyed by ID and name.
+
+    Lets the request hot path resolve a database and its driver URL without
+    touching SQLite. Every write to the ``databases`` table must invalidate
+    the affected entry; entries also expire after ``ttl`` seconds so writes
+    made by other worker processes are eventually picked up.
+    """
+
+    def __init__(self, ttl: float = Database.DESCRIPTOR_CACHE_TTL) -> None:
+        """Initialize the cache.
+
+        Args:
+            ttl: Seconds an entry stays valid.
+        """
+        self.ttl = ttl
+        self._by_id: dict[int, _Descriptor] = {}
+        self._by_name: dict[str, _Descriptor] = {}
+        # Bumped on every invalidation so a read that raced a write is not cached
+        self.generation = 0
+
+    def get(self, *, name: str | None = None, db_id: int | None = None) -> _Descriptor | None:
+        """Look up a descriptor by name or ID.
+
+        Args:
+            name: The database name.
+            db_id: The database ID.
+
+        Returns:
+            The cached descriptor, or None if absent or expired.
+        """
+        if name is not None:
+            descriptor = self._by_name.get(name)
+        else:
+            descriptor = self._by_id.get(db_id) if db_id is not None else None
+        if descriptor is None:
+            return None
+        if time.monotonic() - descriptor.loaded_at > self.ttl:
+            self._remove(descriptor)
+            return None
+        return descriptor
+
+    def put(self, descriptor: _Descriptor, generation: int) -> None:
+        """Cache a descriptor loaded while the cache was at ``generation``.
+
+        Args:
+            descriptor: The descriptor to cache.
+            generation: The cache generation read before loading the row.
+        """
+        if generation != self.generation:
+            return
+        self._by_id[descriptor.detail.id] = descriptor
+        self._by_name[descriptor.detail.name] = descriptor
+
+    def invalidate(self, *, name: str | None = None, db_id: int | None = None) -> None:
+        """Drop the descriptor for a database.
+
+        Args:
+            name: The database name.
+            db_id: The database ID.
+        """
+        self.generation += 1
+        if name is not None and name in self._by_name:
+            self._remove(self._by_name[name])
+        if db_id is not None and db_id in self._by_id:
+            self._remove(self._by_id[db_id])
+
+    def clear(self) -> None:
+        """Drop all descriptors."""
+        self.generation += 1
+        self._by_id.clear()
+        self._by_name.clear()
+
+    def _remove(self, descriptor: _Descriptor) -> None:
+        """Remove a descriptor from both indexes.
+
+        Args:
+            descriptor: The descriptor to remove.
+        """
+        self._by_id.pop(descriptor.detail.id, None)
+        self._by_name.pop(descriptor.detail.name, None)
+
+
+# Global descriptor cache instance
+_descriptor_cache: DescriptorCache | None = None
+
+# Global executor for connection tests
+_connection_test_executor: BoundedExecutor | None = None
+
+
+def get_descriptor_cache() -> DescriptorCache:
+    """Get the global database descriptor cache."""
+    global _descriptor_cache
+    if _descriptor_cache is None:
+        _descriptor_cache = DescriptorCache()
+    return _descriptor_cache
+
+
+def _get_connection_test_executor() -> BoundedExecutor:
+    """Get the executor that bounds concurrent connection tests."""
+    global _connection_test_executor
+    if _connection_test_executor is None:
+        _connection_test_executor = BoundedExecutor(
+            "connection-test",
+            max_workers=Database.CONNECTION_TEST_CONCURRENCY,
+            max_queue=Database.CONNECTION_TEST_MAX_QUEUE,
+        )
+    return _connection_test_executor
+
+
+def _dispose_abandoned_engine(test: asyncio.Future[Engine]) -> None:
+    """Dispose of the engine of a connection test that timed out, once it finishes."""
+    if not test.cancelled() and test.exception() is None:
+        test.result().dispose()
+
 
 class DatabaseService:
     """Service for managing database connections."""
@@ -29,70 +195,11 @@ class DatabaseService:
         """Initialize the database service."""
         self.logger = get_logger(__name__)
         self.db = get_db()
-        self._engines: dict[int, Engine] = {}
-        self._engine_last_used: dict[int, float] = {}
-        # Start background task to clean up idle engines
-        self._cleanup_task: asyncio.Task[None] | None = None
-
-    async def _start_cleanup_task(self) -> None:
-        """Start background task to clean up idle engines."""
-        if self._cleanup_task is None or self._cleanup_task.done():
-            self._cleanup_task = asyncio.create_task(self._cleanup_idle_engines())
-
-    async def _cleanup_idle_engines(self) -> None:
-        """Background task to clean up idle engines."""
-        self.logger.info("engine_cleanup_started")
-        while True:
-            try:
-                await asyncio.sleep(Database.CLEANUP_INTERVAL)  # Check every 5 minutes
-                now = time.time()
-                idle_engines = [
-                    db_id
-                    for db_id, last_used in self._engine_last_used.items()
-                    if now - last_used > Database.ENGINE_IDLE_TIMEOUT
-                ]
-                if idle_engines:
-                    self.logger.info("cleaning_idle_engines", count=len(idle_engines))
-                for db_id in idle_engines:
-                    await self._dispose_engine(db_id)
-            except asyncio.CancelledError:
-                self.logger.info("engine_cleanup_cancelled")
-                break
-            except Exception as e:
-                # Log but don't stop the cleanup task
-                self.logger.error("engine_cleanup_error", error=str(e))
-
-    async def _dispose_engine(self, database_id: int) -> None:
-        """Dispose of a database engine.
-
-        Args:
-            database_id: The database ID.
-        """
-        if database_id in self._engines:
-            try:
-                self._engines[database_id].dispose()
-                del self._engines[database_id]
-                del self._engine_last_used[database_id]
-                self.logger.debug("engine_disposed", database_id=database_id)
-            except Exception as e:
-                self.logger.warning("engine_dispose_failed", database_id=database_id, error=str(e))
-
-    async def dispose_all(self) -> None:
-        """Dispose of all database engines."""
-        for db_id in list(self._engines.keys()):
-            await self._dispose_engine(db_id)
-
-    async def close(self) -> None:
-        """Close the service and cleanup resources."""
-        # Cancel cleanup task
-        if self._cleanup_task and not self._cleanup_task.done():
-            self._cleanup_task.cancel()
-            try:
-                await self._cleanup_task
-            except asyncio.CancelledError:
-                pass
-        # Dispose all engines
-        await self.dispose_all()
+        self.engines = get_engine_registry()
+        self.executors = get_query_executors()
+        self.admission = get_admission_controllers()
+        self.descriptors = get_descriptor_cache()
+        self.results = get_result_cache()
 
     def _detect_db_type(self, url: str) -> Literal["mysql", "postgresql", "sqlite"]:
         """Detect the database type from connection string.
@@ -192,25 +299,85 @@ class DatabaseService:
             return url
         return url
 
-    def _test_connection(self, url: str) -> bool:
+    def _test_connection(self, url: str, options: dict[str, Any] | None = None) -> Engine:
         """Test a database connection.
 
+        The engine is built with the database's pool options and returned
+        still holding the pooled connection, so it can serve later queries.
+
         Args:
             url: The connection string.
+            options: Keyword arguments for create_engine (pool tuning).
 
         Returns:
-            True if connection succeeds.
+            The connected engine.
 
         Raises:
             SQLAlchemyError: If connection fails.
         """
-        engine = create_engine(url)
+        engine = create_engine(
+            url, connect_args=self._connect_timeout_args(url), **(options or {})
+        )
         try:
             with engine.connect() as conn:
                 conn.execute(text("SELECT 1"))
-            return True
-        finally:
+        except BaseException:
             engine.dispose()
+            raise
+        return engine
+
+    async def _validate_connection(
+        self, name: str, url: str, options: dict[str, Any]
+    ) -> Engine:
+        """Test a connection off the event loop with bounded concurrency.
+
+        Args:
+            name: The database name (for logging).
+            url: The connection string (should include driver).
+            options: Keyword arguments for create_engine (pool tuning).
+
+        Returns:
+            The connected engine, ready to be adopted by the engine registry.
+
+        Raises:
+            ValueError: If the connection fails or times out.
+            ExecutorSaturatedError: If too many connection tests are queued.
+        """
+        test = asyncio.ensure_future(
+            _get_connection_test_executor().run(self._test_connection, url, options)
+        )
+        try:
+            # Shielded: a worker thread cannot be interrupted, so on timeout the
+            # test runs on and the engine it returns is disposed of when it does
+            engine = await asyncio.wait_for(
+                asyncio.shield(test), timeout=Database.CONNECTION_TEST_TIMEOUT
+            )
+        except SQLAlchemyError as e:
+            self.logger.error("connection_test_failed", name=name, error=str(e))
+            raise ValueError(f"Failed to connect to database: {e}") from e
+        except TimeoutError as e:
+            test.add_done_callback(_dispose_abandoned_engine)
+            self.logger.error("connection_test_timeout", name=name)
+            raise ValueError(
+                f"Failed to connect to database: timed out after "
+                f"{Database.CONNECTION_TEST_TIMEOUT} seconds"
+            ) from e
+        self.logger.info("connection_test_success", name=name)
+        return engine
+
+    @staticmethod
+    def _connect_timeout_args(url: str) -> dict[str, Any]:
+        """Get driver arguments that bound how long connecting may take.
+
+        Args:
+            url: The connection string (should include driver).
+
+        Returns:
+            connect_args for create_engine.
+        """
+        if make_url(url).get_backend_name() in ("mysql", "mariadb", "postgresql"):
+            return {"connect_timeout": Database.CONNECTION_TEST_TIMEOUT}
+        return {}
 
     async def create_database(self, request: DatabaseCreateRequest) -> DatabaseDetail:
         """Create a new database connection.
@@ -240,29 +407,45 @@ class DatabaseService:
         connection_url = self._add_driver_to_url(request.url, db_type)
 
         # Test connection
-        try:
-            await asyncio.to_thread(self._test_connection, connection_url)
-            self.logger.info("connection_test_success", name=request.name)
-        except SQLAlchemyError as e:
-            self.logger.error("connection_test_failed", name=request.name, error=str(e))
-            raise ValueError(f"Failed to connect to database: {e}") from e
+        options = self._engine_options(connection_url, request)
+        engine = await self._validate_connection(request.name, connection_url, options)
 
         # Insert into database (store original URL, not the one with driver)
         now = datetime.now()
-        cursor = await self.db.execute(
-            """
-            INSERT INTO databases (name, url, db_type, last_connected_at)
-            VALUES (:name, :url, :db_type, :last_connected_at)
-            """,
-            {
-                "name": request.name,
-                "url": request.url,
-                "db_type": db_type,
-                "last_connected_at": now,
-            },
-        )
+        try:
+            cursor = await self.db.execute(
+                """
+                INSERT INTO databases (
+                    name, url, db_type, last_connected_at,
+                    pool_size, max_overflow, pool_timeout, pool_recycle, pool_pre_ping, pool_class,
+                    executor_workers, executor_queue_size,
+                    max_concurrent_queries, admission_queue_size, admission_max_wait,
+                    result_cache_ttl
+                )
+                VALUES (
+                    :name, :url, :db_type, :last_connected_at,
+                    :pool_size, :max_overflow, :pool_timeout, :pool_recycle, :pool_pre_ping,
+                    :pool_class, :executor_workers, :executor_queue_size,
+                    :max_concurrent_queries, :admission_queue_size, :admission_max_wait,
+                    :result_cache_ttl
+                )
+                """,
+                {
+                    "name": request.name,
+                    "url": request.url,
+                    "db_type": db_type,
+                    "last_connected_at": now,
+                    **self._pool_columns(request),
+                },
+            )
+        except BaseException:
+            engine.dispose()
+            raise
 
         db_id = cursor.lastrowid or 0
+        self.descriptors.invalidate(name=request.name, db_id=db_id)
+        # Keep the validated engine so the first query reuses its connection
+        self.engines.adopt(db_id, connection_url, engine, options)
         self.logger.info("database_created", name=request.name, id=db_id)
         return await self.get_database_by_id(db_id)
 
@@ -272,23 +455,15 @@ class DatabaseService:
         Returns:
             List of all database connections.
         """
-        rows = await self.db.fetch_all(
-            "SELECT * FROM databases WHERE is_active = 1 ORDER BY created_at"
+        databases = await self.db.fetch_models(
+            f"SELECT {_CONNECTION_COLUMNS} FROM databases WHERE is_active = 1 ORDER BY created_at",
+            None,
+            DatabaseConnection,
         )
-        result = []
-        for row in rows:
+        for database in databases:
             # Parse connection string for redaction
-            parsed = self._parse_connection_string(row["url"])
-            row["url"] = parsed.redact()
-
-            # Convert SQLite strings to proper types
-            row["created_at"] = datetime.fromisoformat(row["created_at"])
-            if row["last_connected_at"]:
-                row["last_connected_at"] = datetime.fromisoformat(row["last_connected_at"])
-            row["is_active"] = bool(row["is_active"])
-
-            result.append(DatabaseConnection(**row))
-        return result
+            database.url = self._parse_connection_string(database.url).redact()
+        return databases
 
     async def get_database_by_id(self, db_id: int) -> DatabaseDetail:
         """Get a database by ID.
@@ -302,21 +477,10 @@ class DatabaseService:
         Raises:
             ValueError: If the database is not found.
         """
-        row = await self.db.fetch_one("SELECT * FROM databases WHERE id = :id", {"id": db_id})
-        if not row:
+        descriptor = await self._get_descriptor(db_id=db_id)
+        if descriptor is None:
             raise ValueError(f"Database with id {db_id} not found")
-
-        # Parse connection string for redaction
-        parsed = self._parse_connection_string(row["url"])
-        row["url"] = parsed.redact()
-
-        # Convert SQLite strings to proper types
-        row["created_at"] = datetime.fromisoformat(row["created_at"])
-        if row["last_connected_at"]:
-            row["last_connected_at"] = datetime.fromisoformat(row["last_connected_at"])
-        row["is_active"] = bool(row["is_active"])
-
-        return DatabaseDetail(**row)
+        return descriptor.detail.model_copy()
 
     async def get_database_by_name(self, name: str) -> DatabaseDetail:
         """Get a database by name.
@@ -330,12 +494,41 @@ class DatabaseService:
         Raises:
             ValueError: If the database is not found.
         """
-        row = await self.db.fetch_one("SELECT * FROM databases WHERE name = :name", {"name": name})
-        if not row:
+        descriptor = await self._get_descriptor(name=name)
+        if descriptor is None:
             raise ValueError(f"Database '{name}' not found")
+        return descriptor.detail.model_copy()
+
+    async def _get_descriptor(
+        self, *, name: str | None = None, db_id: int | None = None
+    ) -> _Descriptor | None:
+        """Resolve a database by name or ID, from the cache when possible.
+
+        Args:
+            name: The database name.
+            db_id: The database ID.
+
+        Returns:
+            The descriptor, or None if the database does not exist.
+        """
+        descriptor = self.descriptors.get(name=name, db_id=db_id)
+        if descriptor is not None:
+            return descriptor
+
+        generation = self.descriptors.generation
+        if name is not None:
+            row = await self.db.fetch_one(
+                "SELECT * FROM databases WHERE name = :name", {"name": name}
+            )
+        else:
+            row = await self.db.fetch_one("SELECT * FROM databases WHERE id = :id", {"id": db_id})
+        if not row:
+            return None
+
+        url = row["url"] if isinstance(row["url"], str) else str(row["url"])
 
         # Parse connection string for redaction
-        parsed = self._parse_connection_string(row["url"])
+        parsed = self._parse_connection_string(url)
         row["url"] = parsed.redact()
 
         # Convert SQLite strings to proper types
@@ -344,7 +537,13 @@ class DatabaseService:
             row["last_connected_at"] = datetime.fromisoformat(row["last_connected_at"])
         row["is_active"] = bool(row["is_active"])
 
-        return DatabaseDetail(**row)
+        descriptor = _Descriptor(
+            detail=DatabaseDetail(**row),
+            url=url,
+            driver_url=self._add_driver_to_url(url, row["db_type"]),
+        )
+        self.descriptors.put(descriptor, generation)
+        return descriptor
 
     async def delete_database(self, name: str) -> None:
         """Delete a database connection.
@@ -356,17 +555,25 @@ class DatabaseService:
             ValueError: If the database is not found.
         """
         # Check existence
-        await self.get_database_by_name(name)
+        database = await self.get_database_by_name(name)
 
         # Hard delete (remove the record entirely)
         await self.db.execute("DELETE FROM databases WHERE name = :name", {"name": name})
+        self.descriptors.invalidate(name=name, db_id=database.id)
+
+        # Release the pooled connections and worker threads held for this database
+        self.engines.dispose(database.id)
+        self.executors.shutdown(database.id)
+        self.admission.remove(database.id)
+        self.results.invalidate(database.id)
 
     async def update_database(self, name: str, request: DatabaseUpdateRequest) -> DatabaseDetail:
         """Update a database connection.
 
         Args:
             name: The current database name.
-            request: The update request.
+            request: The update request. Pool settings it leaves out are kept;
+                those it sets to null are cleared.
 
         Returns:
             The updated database connection.
@@ -375,7 +582,7 @@ class DatabaseService:
             ValueError: If the database is not found or new name already exists.
         """
         # Check existence
-        await self.get_database_by_name(name)
+        database = await self.get_database_by_name(name)
 
         # Build update query dynamically
         updates: list[str] = []
@@ -392,15 +599,27 @@ class DatabaseService:
             updates.append("name = :new_name")
             params["new_name"] = request.name
 
+        # Settings left out of the request are kept; an explicit null clears one
+        settings = {
+            column: value
+            for column, value in self._pool_columns(request).items()
+            if column in request.model_fields_set
+        }
+        settings_changed = False
+        for column, value in settings.items():
+            updates.append(f"{column} = :{column}")
+            params[column] = value
+            # Caching applies per query, the pool need not be rebuilt for it
+            settings_changed = settings_changed or column != "result_cache_ttl"
+
+        engine: Engine | None = None
         if request.url is not None:
-            # Detect database type and test connection
+            # Detect database type and test connection with the resulting pool settings
             db_type = self._detect_db_type(request.url)
             connection_url = self._add_driver_to_url(request.url, db_type)
-
-            try:
-                await asyncio.to_thread(self._test_connection, connection_url)
-            except SQLAlchemyError as e:
-                raise ValueError(f"Failed to connect to database: {e}") from e
+            pool = database.model_copy(update=settings)
+            options = self._engine_options(connection_url, pool)
+            engine = await self._validate_connection(name, connection_url, options)
 
             updates.append("url = :url")
             updates.append("db_type = :db_type")
@@ -414,31 +633,138 @@ class DatabaseService:
             return await self.get_database_by_name(name)
 
         # Execute update
-        await self.db.execute(
-            f"UPDATE databases SET {', '.join(updates)} WHERE name = :name", params
-        )
+        try:
+            await self.db.execute(
+                f"UPDATE databases SET {', '.join(updates)} WHERE name = :name", params
+            )
+        except BaseException:
+            if engine is not None:
+                engine.dispose()
+            raise
+        self.descriptors.invalidate(name=name, db_id=database.id)
+        # Results of the old URL are stale, and those cached under an old TTL outlive it
+        self.results.invalidate(database.id)
+
+        # Never let a query reuse connections built for the old URL or settings
+        if engine is not None:
+            # The validated engine replaces (and disposes) the old one
+            self.engines.adopt(database.id, connection_url, engine, options)
+            self.executors.shutdown(database.id)
+        elif settings_changed:
+            self.engines.dispose(database.id)
+            self.executors.shutdown(database.id)
 
         # Return updated database (use new name if changed)
         new_name = request.name if request.name is not None else name
         return await self.get_database_by_name(new_name)
 
-    def get_engine(self, db_id: int, url: str) -> Engine:
-        """Get or create a SQLAlchemy engine for the database.
+    def get_engine(self, db_id: int, url: str, pool: PoolSettings | None = None) -> Engine:
+        """Get the shared, pooled SQLAlchemy engine for the database.
 
         Args:
             db_id: The database ID.
             url: The connection string (should include driver).
+            pool: Optional pool settings, usually the database record itself.
 
         Returns:
             A SQLAlchemy engine.
         """
-        if db_id not in self._engines:
-            self._engines[db_id] = create_engine(url)
-            # Start cleanup task on first engine creation
-            asyncio.create_task(self._start_cleanup_task())
-        # Update last used time
-        self._engine_last_used[db_id] = time.time()
-        return self._engines[db_id]
+        return self.engines.get_engine(db_id, url, self._engine_options(url, pool))
+
+    def get_query_engine(
+        self, db_id: int, url: str, pool: PoolSettings | None = None
+    ) -> Engine | AsyncEngine:
+        """Get the engine queries and metadata crawls should run on.
+
+        Returns the shared async engine when async engines are enabled in the
+        configuration and an async driver for the backend is installed, and
+        the shared synchronous engine otherwise.
+
+        Args:
+            db_id: The database ID.
+            url: The connection string (should include driver).
+            pool: Optional pool settings, usually the database record itself.
+
+        Returns:
+            A SQLAlchemy engine or async engine.
+        """
+        if get_config().async_engines:
+            async_url = self._to_async_url(url)
+            if async_url is not None:
+                return self.engines.get_async_engine(
+                    db_id, url, async_url, self._engine_options(url, pool)
+                )
+        return self.get_engine(db_id, url, pool)
+
+    @staticmethod
+    def _to_async_url(url: str) -> str | None:
+        """Swap the driver in a connection URL for its async counterpart.
+
+        Args:
+            url: The connection string (should include driver).
+
+        Returns:
+            The async connection string, or None if no async driver is installed.
+        """
+        parsed = make_url(url)
+        driver = _ASYNC_DRIVERS.get(parsed.get_backend_name())
+        if driver is None or not _module_available("greenlet"):
+            return None
+        drivername, module = driver
+        if not _module_available(module):
+            return None
+        return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+    @staticmethod
+    def _pool_columns(settings: PoolSettings) -> dict[str, Any]:
+        """Get the pool settings as values for the databases table columns.
+
+        Args:
+            settings: The pool and executor settings.
+
+        Returns:
+            A mapping of column name to value.
+        """
+        return {name: getattr(settings, name) for name in PoolSettings.model_fields}
+
+    @staticmethod
+    def _engine_options(url: str, pool: PoolSettings | None) -> dict[str, Any]:
+        """Translate pool settings into create_engine keyword arguments.
+
+        Sizing options only apply to queue pools. SQLite targets keep SQLAlchemy's
+        default pool class (which depends on file vs memory databases) unless one
+        is configured, so sizing is only applied to them with an explicit queue pool.
+
+        Args:
+            url: The connection string (should include driver).
+            pool: The pool settings, or None for defaults.
+
+        Returns:
+            Keyword arguments for create_engine.
+        """
+        options: dict[str, Any] = {}
+        if pool is None:
+            return options
+
+        if pool.pool_class is not None:
+            options["poolclass"] = _POOL_CLASSES[pool.pool_class]
+
+        is_sqlite = make_url(url).get_backend_name() == "sqlite"
+        if pool.pool_class == "queue" or (pool.pool_class is None and not is_sqlite):
+            if pool.pool_size is not None:
+                options["pool_size"] = pool.pool_size
+            if pool.max_overflow is not None:
+                options["max_overflow"] = pool.max_overflow
+            if pool.pool_timeout is not None:
+                options["pool_timeout"] = pool.pool_timeout
+        elif pool.pool_class == "singleton_thread" and pool.pool_size is not None:
+            options["pool_size"] = pool.pool_size
+
+        if pool.pool_recycle is not None:
+            options["pool_recycle"] = pool.pool_recycle
+        if pool.pool_pre_ping is not None:
+            options["pool_pre_ping"] = pool.pool_pre_ping
+        return options
 
     async def get_connection_url_with_driver(self, name: str) -> str:
         """Get the connection string with the appropriate driver.
@@ -452,15 +778,10 @@ class DatabaseService:
         Raises:
             ValueError: If the database is not found.
         """
-        row = await self.db.fetch_one(
-            "SELECT url, db_type FROM databases WHERE name = :name AND is_active = 1",
-            {"name": name},
-        )
-        if not row:
+        descriptor = await self._get_descriptor(name=name)
+        if descriptor is None or not descriptor.detail.is_active:
             raise ValueError(f"Database '{name}' not found")
-        url = row["url"] if isinstance(row["url"], str) else str(row["url"])
-        db_type = row["db_type"]
-        return self._add_driver_to_url(url, db_type)
+        return descriptor.driver_url
 
     async def get_original_url(self, name: str) -> str:
         """Get the original (non-redacted) connection string.
@@ -474,10 +795,7 @@ class DatabaseService:
         Raises:
             ValueError: If the database is not found.
         """
-        row = await self.db.fetch_one(
-            "SELECT url FROM databases WHERE name = :name AND is_active = 1", {"name": name}
-        )
-        if not row:
+        descriptor = await self._get_descriptor(name=name)
+        if descriptor is None or not descriptor.detail.is_active:
             raise ValueError(f"Database '{name}' not found")
-        url = row["url"]
-        return url if isinstance(url, str) else str(url)
+        return descriptor.url
@@ -0,0 +1,201 @@
+"""Write-behind batching of query history records."""
+
+import asyncio
+from collections import deque
+from typing import Any, Literal
+
+from ..core.constants import Query
+from ..core.history_rollups import apply_history_rollups
+from ..core.logging import get_logger
+from ..core.sqlite_db import get_db
+
+OverflowPolicy = Literal["drop_oldest", "drop_newest"]
+
+_INSERT_HISTORY = """
+    INSERT INTO query_history (
+        database_id, database_name, query_type, input_text, executed_sql,
+        row_count, execution_time_ms, status, error_message, created_at
+    ) VALUES (
+        :database_id, :database_name, :query_type, :input_text, :executed_sql,
+        :row_count, :execution_time_ms, :status, :error_message, :created_at
+    )
+"""
+
+
+class HistoryWriter:
+    """Buffers query history records and writes them in batched transactions.
+
+    ``submit`` returns immediately, so history writes stay off the query path.
+    A background task flushes the buffer when it reaches ``batch_size`` records
+    or every ``flush_interval`` seconds, whichever comes first. The buffer is
+    bounded; when it is full the overflow policy drops either the oldest
+    buffered record or the new one.
+    """
+
+    def __init__(
+        self,
+        max_queue: int = Query.HISTORY_QUEUE_SIZE,
+        batch_size: int = Query.HISTORY_BATCH_SIZE,
+        flush_interval: float = Query.HISTORY_FLUSH_INTERVAL,
+        overflow_policy: OverflowPolicy = "drop_oldest",
+    ) -> None:
+        """Initialize the history writer.
+
+        Args:
+            max_queue: Maximum number of buffered records.
+            batch_size: Records written per transaction, and the buffer size
+                that triggers an early flush.
+            flush_interval: Seconds between periodic flushes.
+            overflow_policy: What to drop when the buffer is full.
+        """
+        self.logger = get_logger(__name__)
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self._buffer: deque[dict[str, Any]] = deque()
+        self._flush_task: asyncio.Task[None] | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._stopping = False
+        self._written = 0
+        self._dropped = 0
+        self._failed = 0
+
+    @property
+    def running(self) -> bool:
+        """Whether the background flush task is running."""
+        return self._flush_task is not None and not self._flush_task.done()
+
+    def submit(self, record: dict[str, Any]) -> None:
+        """Buffer a history record without waiting for it to be written.
+
+        Args:
+            record: Column values for a ``query_history`` row.
+        """
+        if len(self._buffer) >= self.max_queue:
+            self._dropped += 1
+            if self.overflow_policy == "drop_newest":
+                return
+            self._buffer.popleft()
+        self._buffer.append(record)
+        if len(self._buffer) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """Write all buffered records.
+
+        Returns:
+            The number of records written.
+        """
+        written = 0
+        while self._buffer:
+            batch = [
+                self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))
+            ]
+            try:
+                await self._write(batch)
+            except Exception as e:
+                self.logger.warning("history_batch_failed", records=len(batch), error=str(e))
+                written += await self._write_individually(batch)
+                continue
+            written += len(batch)
+        self._written += written
+        return written
+
+    async def _write_individually(self, batch: list[dict[str, Any]]) -> int:
+        """Write a failed batch record by record, dropping only bad records.
+
+        A record can fail on its own, e.g. when its database was deleted
+        while the record was buffered.
+
+        Args:
+            batch: The records of the failed batch.
+
+        Returns:
+            The number of records written.
+        """
+        written = 0
+        for record in batch:
+            try:
+                await self._write([record])
+            except Exception as e:
+                self._failed += 1
+                self.logger.error("history_record_failed", error=str(e))
+                continue
+            written += 1
+        return written
+
+    @staticmethod
+    async def _write(records: list[dict[str, Any]]) -> None:
+        """Insert records and fold them into the rollups in one transaction.
+
+        Args:
+            records: The records to write.
+        """
+        async with get_db().transaction() as conn:
+            await conn.executemany(_INSERT_HISTORY, records)
+            await apply_history_rollups(conn, records)
+
+    async def start(self) -> None:
+        """Start the background flush task."""
+        if not self.running:
+            self._stopping = False
+            self._wakeup = asyncio.Event()
+            self._flush_task = asyncio.create_task(self._flush_periodically())
+            self.logger.info("history_writer_started")
+
+    async def stop(self) -> None:
+        """Stop the background flush task and write what is still buffered."""
+        if self._flush_task and not self._flush_task.done():
+            # Let the task finish its current batch instead of cancelling mid-write
+            self._stopping = True
+            assert self._wakeup is not None
+            self._wakeup.set()
+            await self._flush_task
+        self._flush_task = None
+        self._wakeup = None
+        written = await self.flush()
+        self.logger.info("history_writer_stopped", flushed=written)
+
+    async def _flush_periodically(self) -> None:
+        """Background task that flushes by size or interval."""
+        assert self._wakeup is not None
+        while not self._stopping:
+            try:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+                except TimeoutError:
+                    pass
+                self._wakeup.clear()
+                await self.flush()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                # Log but don't stop the flush task
+                self.logger.error("history_writer_error", error=str(e))
+
+    def stats(self) -> dict[str, Any]:
+        """Get the writer's counters.
+
+        Returns:
+            Dictionary with buffered, written, dropped and failed record counts.
+        """
+        return {
+            "queued": len(self._buffer),
+            "max_queue": self.max_queue,
+            "written": self._written,
+            "dropped": self._dropped,
+            "failed": self._failed,
+        }
+
+
+# Global history writer instance
+_history_writer: HistoryWriter | None = None
+
+
+def get_history_writer() -> HistoryWriter:
+    """Get the global history writer instance."""
+    global _history_writer
+    if _history_writer is None:
+        _history_writer = HistoryWriter()
+    return _history_writer
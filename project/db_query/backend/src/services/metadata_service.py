@@ -1,15 +1,19 @@
 """Metadata extraction and caching service."""
 
+import asyncio
 import re
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Any
-from urllib.parse import urlparse
 
-from sqlalchemy import Engine, text
+from sqlalchemy import Connection, CursorResult, Engine, text
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
 
 from ..core.constants import Metadata
 from ..core.logging import get_logger
+from ..core.result_cache import get_result_cache
 from ..core.sqlite_db import get_db
 from ..models.database import DatabaseDetail
 from ..models.metadata import (
@@ -18,6 +22,7 @@ from ..models.metadata import (
     TableMetadata,
     ViewMetadata,
 )
+from .db_service import get_descriptor_cache
 
 
 class MetadataService:
@@ -53,14 +58,54 @@ class MetadataService:
             )
         return identifier
 
+    @staticmethod
+    @asynccontextmanager
+    async def _connect(
+        engine: Engine | AsyncEngine,
+    ) -> AsyncIterator[Connection | AsyncConnection]:
+        """Open a connection on either a sync or an async engine.
+
+        Args:
+            engine: The SQLAlchemy engine or async engine.
+
+        Yields:
+            The open connection.
+        """
+        if isinstance(engine, AsyncEngine):
+            async with engine.connect() as async_conn:
+                yield async_conn
+        else:
+            with engine.connect() as conn:
+                yield conn
+
+    @staticmethod
+    async def _execute(
+        conn: Connection | AsyncConnection, sql: str
+    ) -> CursorResult[*tuple[Any, ...]]:
+        """Execute SQL on a sync or async connection.
+
+        Results from async connections are fully buffered, so both kinds can be
+        iterated synchronously by the caller.
+
+        Args:
+            conn: The connection.
+            sql: The SQL to execute.
+
+        Returns:
+            The result.
+        """
+        if isinstance(conn, AsyncConnection):
+            return await conn.execute(text(sql))
+        return conn.execute(text(sql))
+
     async def fetch_metadata(
-        self, database: DatabaseDetail, engine: Engine, force_refresh: bool = False
+        self, database: DatabaseDetail, engine: Engine | AsyncEngine, force_refresh: bool = False
     ) -> MetadataResponse:
         """Fetch metadata for a database.
 
         Args:
             database: The database connection details.
-            engine: The SQLAlchemy engine for the database.
+            engine: The SQLAlchemy engine (sync or async) for the database.
             force_refresh: If True, refresh metadata even if cached.
 
         Returns:
@@ -102,23 +147,18 @@ class MetadataService:
         # For SQLite, the database name is the file path
         database_schema = None
         if database.db_type in ("mysql", "postgresql"):
-            try:
-                # Parse the URL to get the database name
-                # The URL stored in database is the original one without driver
-                # We need to get it from the service
-                from .db_service import DatabaseService
-
-                db_svc = DatabaseService()
-                original_url = await db_svc.get_original_url(database.name)
-                parsed = urlparse(original_url)
-                database_schema = parsed.path.lstrip("/") if parsed.path else None
-            except Exception:
-                # If we can't parse the URL, fall back to querying all schemas
-                database_schema = None
+            # The engine was built from the stored URL, so read the database
+            # name from it instead of looking the record up again
+            database_schema = engine.url.database or None
 
         # Fetch fresh metadata
-        tables = await self._fetch_tables(engine, database.db_type, database_schema)
-        views = await self._fetch_views(engine, database.db_type, database_schema)
+        crawl = self._crawl(engine, database.db_type, database_schema)
+        if isinstance(engine, AsyncEngine):
+            tables, views = await crawl
+        else:
+            # A sync engine blocks on every catalog query, so crawl in a worker
+            # thread (on its own event loop) instead of on the caller's loop
+            tables, views = await asyncio.to_thread(asyncio.run, crawl)
 
         # Cache in database
         import json
@@ -143,6 +183,9 @@ class MetadataService:
                 "now": datetime.now(),
             },
         )
+        get_descriptor_cache().invalidate(db_id=database.id)
+        # A refresh is how schema changes are picked up; results may be stale too
+        get_result_cache().invalidate(database.id)
 
         self.logger.info(
             "metadata_fetched",
@@ -159,13 +202,30 @@ class MetadataService:
             updated_at=datetime.now(),
         )
 
+    async def _crawl(
+        self, engine: Engine | AsyncEngine, db_type: str, database_schema: str | None = None
+    ) -> tuple[list[TableMetadata], list[ViewMetadata]]:
+        """Fetch table and view metadata from the database.
+
+        Args:
+            engine: The SQLAlchemy engine or async engine.
+            db_type: The database type.
+            database_schema: The specific database/schema to query (for MySQL/PostgreSQL).
+
+        Returns:
+            The tables and the views.
+        """
+        tables = await self._fetch_tables(engine, db_type, database_schema)
+        views = await self._fetch_views(engine, db_type, database_schema)
+        return tables, views
+
     async def _fetch_tables(
-        self, engine: Engine, db_type: str, database_schema: str | None = None
+        self, engine: Engine | AsyncEngine, db_type: str, database_schema: str | None = None
     ) -> list[TableMetadata]:
         """Fetch table metadata from the database.
 
         Args:
-            engine: The SQLAlchemy engine.
+            engine: The SQLAlchemy engine or async engine.
             db_type: The database type.
             database_schema: The specific database/schema to query (for MySQL/PostgreSQL).
 
@@ -178,18 +238,17 @@ class MetadataService:
         database_schema = self._validate_identifier(database_schema)
 
         try:
-            with engine.connect() as conn:
+            async with self._connect(engine) as conn:
                 # Query for all tables at once
                 if db_type == "sqlite":
-                    result = conn.execute(
-                        text(
-                            """
-                            SELECT name as table_name, '' as table_schema
-                            FROM sqlite_master
-                            WHERE type = 'table' AND name NOT LIKE 'sqlite_%'
-                            ORDER BY name
-                            """
-                        )
+                    result = await self._execute(
+                        conn,
+                        """
+                        SELECT name as table_name, '' as table_schema
+                        FROM sqlite_master
+                        WHERE type = 'table' AND name NOT LIKE 'sqlite_%'
+                        ORDER BY name
+                        """,
                     )
                 else:  # MySQL and PostgreSQL use Information Schema
                     # Build the query with optional database filter
@@ -209,7 +268,7 @@ class MetadataService:
                             AND table_schema NOT IN ('pg_catalog', 'information_schema', 'mysql', 'performance_schema', 'sys')
                             ORDER BY table_name
                         """
-                    result = conn.execute(text(query))
+                    result = await self._execute(conn, query)
 
                 # Collect all table names and schemas
                 table_list = []
@@ -238,12 +297,15 @@ class MetadataService:
         return tables
 
     async def _fetch_all_columns(
-        self, conn: Any, table_list: list[tuple[str, str | None]], db_type: str
+        self,
+        conn: Connection | AsyncConnection,
+        table_list: list[tuple[str, str | None]],
+        db_type: str,
     ) -> dict[tuple[str, str], list[ColumnMetadata]]:
         """Fetch columns for all tables at once.
 
         Args:
-            conn: The SQLAlchemy connection.
+            conn: The SQLAlchemy connection (sync or async).
             table_list: List of (table_name, schema_name) tuples.
             db_type: The database type.
 
@@ -259,7 +321,7 @@ class MetadataService:
                 validated_name = self._validate_identifier(table_name)
                 if not validated_name:
                     continue
-                result = conn.execute(text(f"PRAGMA table_info('{validated_name}')"))
+                result = await self._execute(conn, f"PRAGMA table_info('{validated_name}')")
                 columns = []
                 for row in result:
                     columns.append(
@@ -317,7 +379,7 @@ class MetadataService:
                     ORDER BY c.table_name, c.ordinal_position
                 """
 
-                result = conn.execute(text(columns_query))
+                result = await self._execute(conn, columns_query)
 
                 # Temporary storage for columns (without primary key info yet)
                 temp_columns: dict[str, list[dict]] = {}
@@ -361,7 +423,7 @@ class MetadataService:
                         AND kcu.constraint_type = 'PRIMARY KEY'
                     """
 
-                pk_result = conn.execute(text(pk_query))
+                pk_result = await self._execute(conn, pk_query)
                 pk_columns: set[tuple[str, str]] = set()
                 for row in pk_result:
                     pk_columns.add((row[0], row[1]))  # (table_name, column_name)
@@ -386,12 +448,12 @@ class MetadataService:
         return columns_map
 
     async def _fetch_views(
-        self, engine: Engine, db_type: str, database_schema: str | None = None
+        self, engine: Engine | AsyncEngine, db_type: str, database_schema: str | None = None
     ) -> list[ViewMetadata]:
         """Fetch view metadata from the database.
 
         Args:
-            engine: The SQLAlchemy engine.
+            engine: The SQLAlchemy engine or async engine.
             db_type: The database type.
             database_schema: The specific database/schema to query (for MySQL/PostgreSQL).
 
@@ -404,18 +466,17 @@ class MetadataService:
         database_schema = self._validate_identifier(database_schema)
 
         try:
-            with engine.connect() as conn:
+            async with self._connect(engine) as conn:
                 # Query for all views at once
                 if db_type == "sqlite":
-                    result = conn.execute(
-                        text(
-                            """
-                            SELECT name as view_name, sql as view_definition, '' as view_schema
-                            FROM sqlite_master
-                            WHERE type = 'view'
-                            ORDER BY name
-                            """
-                        )
+                    result = await self._execute(
+                        conn,
+                        """
+                        SELECT name as view_name, sql as view_definition, '' as view_schema
+                        FROM sqlite_master
+                        WHERE type = 'view'
+                        ORDER BY name
+                        """,
                     )
                 else:
                     # Build the query with optional database filter
@@ -433,7 +494,7 @@ class MetadataService:
                             WHERE table_schema NOT IN ('pg_catalog', 'information_schema', 'mysql', 'performance_schema', 'sys')
                             ORDER BY table_name
                         """
-                    result = conn.execute(text(query))
+                    result = await self._execute(conn, query)
 
                 # Collect all view names and schemas
                 view_list = []
@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 from typing import Any
 
 from ..core.constants import Performance
+from ..core.history_rollups import HistoryRollup, rollup_bucket
 from ..core.logging import get_logger
 from ..core.sqlite_db import get_db
 
@@ -233,7 +234,10 @@ class MetricsService:
         database_name: str | None = None,
         hours: int = 24,
     ) -> dict[str, Any]:
-        """Get query performance statistics from history.
+        """Get query performance statistics from the hourly history rollups.
+
+        Reads one row per database and hour instead of scanning the history,
+        so the window starts at the beginning of its oldest hour.
 
         Args:
             database_name: Optional database name to filter by.
@@ -242,82 +246,98 @@ class MetricsService:
         Returns:
             Dictionary containing query performance statistics.
         """
-        since = datetime.now() - timedelta(hours=hours)
+        rollups = await self._load_rollups(database_name, hours)
+        total = HistoryRollup()
+        for rollup in rollups.values():
+            total.merge(rollup)
+        return self._format_rollup(total)
+
+    async def get_query_performance_by_database(self, hours: int = 24) -> list[dict[str, Any]]:
+        """Get query performance statistics for each database.
+
+        Args:
+            hours: Number of hours to look back.
+
+        Returns:
+            Per-database statistics, busiest database first.
+        """
+        rollups = await self._load_rollups(None, hours)
+        stats = [
+            {"database_name": name, **self._format_rollup(rollup)}
+            for name, rollup in rollups.items()
+        ]
+        stats.sort(key=lambda s: s["total_queries"], reverse=True)
+        return stats
+
+    async def _load_rollups(
+        self, database_name: str | None, hours: int
+    ) -> dict[str, HistoryRollup]:
+        """Merge the hourly rollups of a window per database.
 
+        Args:
+            database_name: Optional database name to filter by.
+            hours: Number of hours to look back.
+
+        Returns:
+            The merged rollup of each database with queries in the window.
+        """
+        params: dict[str, Any] = {
+            "since": rollup_bucket(datetime.now() - timedelta(hours=hours)),
+        }
+        condition = "bucket_start >= :since"
         if database_name:
-            rows = await self.db.fetch_all(
-                """
-                SELECT
-                    COUNT(*) as total_queries,
-                    COUNT(CASE WHEN status = 'success' THEN 1 END) as successful_queries,
-                    COUNT(CASE WHEN status = 'error' THEN 1 END) as failed_queries,
-                    AVG(execution_time_ms) as avg_execution_time_ms,
-                    MIN(execution_time_ms) as min_execution_time_ms,
-                    MAX(execution_time_ms) as max_execution_time_ms,
-                    SUM(row_count) as total_rows,
-                    COUNT(CASE WHEN execution_time_ms >= :slow_threshold THEN 1 END) as slow_queries
-                FROM query_history
-                WHERE database_name = :database_name
-                    AND created_at >= :since
-                """,
-                {
-                    "database_name": database_name,
-                    "since": since,
-                    "slow_threshold": Performance.SLOW_QUERY_THRESHOLD,
-                },
-            )
-        else:
-            rows = await self.db.fetch_all(
-                """
-                SELECT
-                    COUNT(*) as total_queries,
-                    COUNT(CASE WHEN status = 'success' THEN 1 END) as successful_queries,
-                    COUNT(CASE WHEN status = 'error' THEN 1 END) as failed_queries,
-                    AVG(execution_time_ms) as avg_execution_time_ms,
-                    MIN(execution_time_ms) as min_execution_time_ms,
-                    MAX(execution_time_ms) as max_execution_time_ms,
-                    SUM(row_count) as total_rows,
-                    COUNT(CASE WHEN execution_time_ms >= :slow_threshold THEN 1 END) as slow_queries
-                FROM query_history
-                WHERE created_at >= :since
-                """,
-                {
-                    "since": since,
-                    "slow_threshold": Performance.SLOW_QUERY_THRESHOLD,
-                },
-            )
+            condition += " AND database_name = :database_name"
+            params["database_name"] = database_name
+
+        rows = await self.db.fetch_all(
+            f"SELECT * FROM query_history_rollups WHERE {condition}", params
+        )
 
-        if not rows or not rows[0]:
-            return {
-                "total_queries": 0,
-                "successful_queries": 0,
-                "failed_queries": 0,
-                "success_rate": 0.0,
-                "avg_execution_time_ms": 0,
-                "min_execution_time_ms": 0,
-                "max_execution_time_ms": 0,
-                "total_rows": 0,
-                "slow_queries": 0,
-                "slow_query_rate": 0.0,
-            }
-
-        row = rows[0]
-        total_queries = row["total_queries"] or 0
+        merged: dict[str, HistoryRollup] = {}
+        for row in rows:
+            rollup = HistoryRollup.from_row(row)
+            if row["database_name"] in merged:
+                merged[row["database_name"]].merge(rollup)
+            else:
+                merged[row["database_name"]] = rollup
+        return merged
+
+    @staticmethod
+    def _format_rollup(rollup: HistoryRollup) -> dict[str, Any]:
+        """Turn a merged rollup into the statistics returned by the API.
+
+        Args:
+            rollup: The merged rollup.
+
+        Returns:
+            Dictionary containing query performance statistics.
+        """
+        total_queries = rollup.total_queries
+        latency_count = rollup.latency_count
+
+        def percentile(q: float) -> float:
+            value = rollup.sketch.quantile(q)
+            return round(value, 2) if value is not None else 0.0
 
         return {
             "total_queries": total_queries,
-            "successful_queries": row["successful_queries"] or 0,
-            "failed_queries": row["failed_queries"] or 0,
+            "successful_queries": rollup.successful_queries,
+            "failed_queries": rollup.failed_queries,
             "success_rate": round(
-                (row["successful_queries"] or 0) / total_queries * 100, 2
+                rollup.successful_queries / total_queries * 100, 2
             ) if total_queries > 0 else 0.0,
-            "avg_execution_time_ms": round(row["avg_execution_time_ms"] or 0, 2),
-            "min_execution_time_ms": row["min_execution_time_ms"] or 0,
-            "max_execution_time_ms": row["max_execution_time_ms"] or 0,
-            "total_rows": row["total_rows"] or 0,
-            "slow_queries": row["slow_queries"] or 0,
+            "avg_execution_time_ms": round(
+                rollup.latency_sum_ms / latency_count, 2
+            ) if latency_count > 0 else 0,
+            "min_execution_time_ms": rollup.latency_min_ms or 0,
+            "max_execution_time_ms": rollup.latency_max_ms or 0,
+            "p50_execution_time_ms": percentile(0.5),
+            "p95_execution_time_ms": percentile(0.95),
+            "p99_execution_time_ms": percentile(0.99),
+            "total_rows": rollup.total_rows,
+            "slow_queries": rollup.slow_queries,
             "slow_query_rate": round(
-                (row["slow_queries"] or 0) / total_queries * 100, 2
+                rollup.slow_queries / total_queries * 100, 2
             ) if total_queries > 0 else 0.0,
         }
 
@@ -330,26 +350,10 @@ class MetricsService:
         Returns:
             Number of records deleted.
         """
-        cutoff = datetime.now() - timedelta(days=days)
-
-        # Clean up old query history
-        cursor = await self.db.execute(
-            """
-            DELETE FROM query_history
-            WHERE created_at < :cutoff
-            """,
-            {"cutoff": cutoff},
-        )
-
-        # Get rowcount from cursor
-        deleted_count = cursor.rowcount if hasattr(cursor, 'rowcount') else 0
+        from .retention_service import get_retention_service
 
-        self.logger.info(
-            "old_metrics_cleaned",
-            days=days,
-            deleted_count=deleted_count,
-        )
-        return deleted_count
+        result = await get_retention_service().run(retention_days=days)
+        return int(result["deleted_rows"])
 
     def get_health_status(self) -> dict[str, Any]:
         """Get the current health status of the application.
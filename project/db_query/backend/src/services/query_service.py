@@ -1,24 +1,112 @@
 """Query execution service."""
 
 import asyncio
+import base64
+import binascii
+import json
+import re
+import secrets
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
+from importlib.util import find_spec
 from io import StringIO
-from typing import Any
+from typing import Any, TypeVar
 
 from sqlalchemy import Engine, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
 
+from ..core.admission import get_admission_controllers
+from ..core.config import get_config
 from ..core.constants import Pagination, Performance, Query
 from ..core.logging import get_logger
-from ..core.sql_parser import get_parser
+from ..core.query_cancel import QueryCancelHandle
+from ..core.query_executor import BoundedExecutor, get_query_executors
+from ..core.result_cache import estimate_size, get_result_cache
+from ..core.result_spool import SpooledResult, get_result_spool
+from ..core.result_stream import ResultStream, create_result_stream
+from ..core.single_flight import get_single_flight
+from ..core.sql_parser import SQLParseError, get_parser
 from ..core.sqlite_db import get_db
 from ..models.database import DatabaseDetail
 from ..models.metadata import ColumnMetadata
 from ..models.query import (
+    CacheMode,
+    ColumnarQueryResponse,
     ExportRequest,
     ExportResponse,
     QueryHistoryItem,
+    QueryHistorySearchHit,
     QueryResponse,
+    ResultFormat,
+    ResultPageResponse,
 )
+from .history_writer import get_history_writer
+
+# Words of a search string; anything else (quotes, operators) is dropped
+_SEARCH_TERM = re.compile(r"\w+")
+
+# The QueryHistoryItem fields, for reading history rows straight into models
+_HISTORY_COLUMNS = """
+    query_history.id AS id,
+    query_history.database_id AS database_id,
+    query_history.database_name AS database_name,
+    query_history.query_type AS query_type,
+    query_history.input_text AS input_text,
+    query_history.executed_sql AS executed_sql,
+    query_history.row_count AS row_count,
+    query_history.execution_time_ms AS execution_time_ms,
+    query_history.status AS status,
+    query_history.error_message AS error_message,
+    query_history.created_at AS created_at
+"""
+
+
+R = TypeVar("R", QueryResponse, ColumnarQueryResponse)
+
+# Value types that need no conversion to be JSON serialized
+_JSON_NATIVE = frozenset({int, float, str, bool, type(None)})
+
+
+@dataclass
+class _QueryRun:
+    """An executed query: its raw rows and how it ran."""
+
+    executed_sql: str
+    result: list[Any]
+    execution_time_ms: int
+    has_limit: bool
+    limit_value: int | None
+
+
+@dataclass
+class _OpenResult:
+    """A started query whose rows are fetched in batches."""
+
+    stream: ResultStream
+    executed_sql: str
+    has_limit: bool
+    limit_value: int | None
+    row_count: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    async def fetch(self) -> Sequence[Sequence[Any]]:
+        """Fetch the next batch of rows, counting them.
+
+        Returns:
+            Up to one batch of rows; an empty batch at the end of the result.
+        """
+        batch = await self.stream.fetch()
+        self.row_count += len(batch)
+        return batch
+
+    @property
+    def elapsed_ms(self) -> int:
+        """Milliseconds since the query was started."""
+        return int((time.monotonic() - self.started) * 1000)
 
 
 class QueryService:
@@ -31,6 +119,12 @@ class QueryService:
         """Initialize the query service."""
         self.logger = get_logger(__name__)
         self.db = get_db()
+        self.executors = get_query_executors()
+        self.admission = get_admission_controllers()
+        self.history = get_history_writer()
+        self.results = get_result_cache()
+        self.in_flight = get_single_flight()
+        self.spool = get_result_spool()
         self._metrics_service: Any | None = None
 
     def _get_metrics_service(self) -> Any:
@@ -54,21 +148,26 @@ class QueryService:
     async def execute_query(
         self,
         database: DatabaseDetail,
-        engine: Engine,
+        engine: Engine | AsyncEngine,
         sql: str,
         timeout: int = Query.QUERY_TIMEOUT,
         query_type: str = "sql",
         input_text: str | None = None,
+        cache: CacheMode = "bypass",
+        coalesce: bool = False,
     ) -> QueryResponse:
         """Execute a SQL query on the database.
 
         Args:
             database: The database connection details.
-            engine: The SQLAlchemy engine for the database.
+            engine: The SQLAlchemy engine (sync or async) for the database.
             sql: The SQL query to execute.
             timeout: Query timeout in seconds.
             query_type: The query type (sql or natural).
             input_text: The input text (SQL or natural language prompt).
+            cache: How to use the result cache (see ``_with_cache``).
+            coalesce: Share the execution of an identical query that is
+                already running instead of starting another one.
 
         Returns:
             The query response.
@@ -76,8 +175,198 @@ class QueryService:
         Raises:
             SQLValidationError: If the SQL is invalid.
             asyncio.TimeoutError: If the query times out.
+            AdmissionRejectedError: If the database's admission queue is full or
+                the wait budget is exceeded.
+            ExecutorSaturatedError: If too many queries are waiting on the database.
+            SQLAlchemyError: If the query execution fails.
+        """
+
+        async def execute() -> QueryResponse:
+            run = await self._run_query(database, engine, sql, timeout, query_type, input_text)
+
+            # Serialize results
+            columns, rows = self._serialize_results(run.result)
+
+            return QueryResponse(
+                success=True,
+                executed_sql=run.executed_sql,
+                row_count=len(rows),
+                execution_time_ms=run.execution_time_ms,
+                columns=columns,
+                rows=rows,
+                has_limit=run.has_limit,
+                limit_value=run.limit_value,
+            )
+
+        return await self._with_cache(database, sql, "rows", cache, coalesce, execute)
+
+    async def execute_query_columnar(
+        self,
+        database: DatabaseDetail,
+        engine: Engine | AsyncEngine,
+        sql: str,
+        timeout: int = Query.QUERY_TIMEOUT,
+        cache: CacheMode = "bypass",
+        coalesce: bool = False,
+    ) -> ColumnarQueryResponse:
+        """Execute a SQL query on the database and return its rows by column.
+
+        The result is transposed into one value list per column instead of
+        one dictionary per row, so column names are not repeated per row.
+
+        Args:
+            database: The database connection details.
+            engine: The SQLAlchemy engine (sync or async) for the database.
+            sql: The SQL query to execute.
+            timeout: Query timeout in seconds.
+            cache: How to use the result cache (see ``_with_cache``).
+            coalesce: Share the execution of an identical query that is
+                already running instead of starting another one.
+
+        Returns:
+            The columnar query response.
+
+        Raises:
+            SQLValidationError: If the SQL is invalid.
+            asyncio.TimeoutError: If the query times out.
+            AdmissionRejectedError: If the database's admission queue is full or
+                the wait budget is exceeded.
+            ExecutorSaturatedError: If too many queries are waiting on the database.
             SQLAlchemyError: If the query execution fails.
         """
+
+        async def execute() -> ColumnarQueryResponse:
+            run = await self._run_query(database, engine, sql, timeout)
+
+            columns, values = self._serialize_columns(run.result)
+
+            return ColumnarQueryResponse(
+                success=True,
+                executed_sql=run.executed_sql,
+                row_count=len(run.result),
+                execution_time_ms=run.execution_time_ms,
+                columns=columns,
+                values=values,
+                has_limit=run.has_limit,
+                limit_value=run.limit_value,
+            )
+
+        return await self._with_cache(database, sql, "columnar", cache, coalesce, execute)
+
+    async def _with_cache(
+        self,
+        database: DatabaseDetail,
+        sql: str,
+        result_format: ResultFormat,
+        cache: CacheMode,
+        coalesce: bool,
+        execute: Callable[[], Awaitable[R]],
+    ) -> R:
+        """Serve a query from the result cache, or execute it and cache the response.
+
+        With ``use`` a cached response is returned if there is one, and a new
+        one is cached; ``refresh`` always executes and caches the new
+        response; ``bypass`` neither reads nor fills the cache. Caching is
+        off for databases whose TTL is 0. Responses served from the cache
+        are not added to the query history.
+
+        With ``coalesce``, callers that run the same query while it is
+        already executing share that execution (single flight): the query
+        runs, is recorded in the history and is cached once, and every
+        caller receives its response.
+
+        Args:
+            database: The database connection details.
+            sql: The SQL query.
+            result_format: The response encoding, part of the cache key.
+            cache: How to use the result cache.
+            coalesce: Whether to share the execution of an identical running query.
+            execute: Executes the query and builds the response.
+
+        Returns:
+            The response, with its cache status.
+        """
+        ttl = database.result_cache_ttl
+        if ttl is None:
+            ttl = get_config().result_cache_ttl
+        caching = cache != "bypass" and bool(ttl)
+        key = self._cache_key(database, sql, result_format) if caching or coalesce else None
+        if key is None:
+            return await execute()
+
+        if caching and cache == "use":
+            entry = self.results.get(key)
+            if entry is not None:
+                self.logger.debug("query_cache_hit", database=database.name, age_ms=entry.age_ms)
+                response: R = entry.value.model_copy(
+                    update={"cache_status": "hit", "cache_age_ms": entry.age_ms}
+                )
+                return response
+
+        async def execute_and_cache() -> R:
+            generation = self.results.generation
+            response = await execute()
+            if caching:
+                response.cache_status = "miss" if cache == "use" else "refresh"
+                rows = response.rows if isinstance(response, QueryResponse) else response.values
+                self.results.put(key, database.id, response, estimate_size(rows), ttl, generation)
+            return response
+
+        if not coalesce:
+            return await execute_and_cache()
+        response, shared = await self.in_flight.run(key, execute_and_cache)
+        if shared:
+            self.logger.debug("query_coalesced", database=database.name)
+            # Callers may adjust their response; the rows themselves are shared
+            return response.model_copy()
+        return response
+
+    @staticmethod
+    def _cache_key(
+        database: DatabaseDetail, sql: str, result_format: ResultFormat
+    ) -> Hashable | None:
+        """Build the result cache key of a query.
+
+        Args:
+            database: The database connection details.
+            sql: The SQL query.
+            result_format: The response encoding.
+
+        Returns:
+            The database ID, normalized SQL, effective LIMIT and format, or
+            None if the SQL cannot be parsed (executing it will fail).
+        """
+        parser = get_parser(database.db_type)
+        final_sql = parser.ensure_limit(sql, default_limit=Query.DEFAULT_LIMIT)
+        try:
+            normalized = parser.normalize(final_sql)
+        except SQLParseError:
+            return None
+        limit_value = QueryService._limit_value(final_sql) if "LIMIT" in final_sql.upper() else None
+        return (database.id, normalized, limit_value, result_format)
+
+    async def _run_query(
+        self,
+        database: DatabaseDetail,
+        engine: Engine | AsyncEngine,
+        sql: str,
+        timeout: int = Query.QUERY_TIMEOUT,
+        query_type: str = "sql",
+        input_text: str | None = None,
+    ) -> _QueryRun:
+        """Validate, limit and execute a query, and record it in the history.
+
+        Args:
+            database: The database connection details.
+            engine: The SQLAlchemy engine (sync or async) for the database.
+            sql: The SQL query to execute.
+            timeout: Query timeout in seconds.
+            query_type: The query type (sql or natural).
+            input_text: The input text (SQL or natural language prompt).
+
+        Returns:
+            The raw result rows with the executed SQL and timing.
+        """
         # Use input_text for logging, default to sql if not provided
         log_input_text = input_text if input_text is not None else sql
         self.logger.info(
@@ -93,59 +382,67 @@ class QueryService:
         # Add LIMIT if not present
         final_sql = parser.ensure_limit(sql, default_limit=Query.DEFAULT_LIMIT)
         has_limit_after = "LIMIT" in final_sql.upper()
+        limit_value = self._limit_value(final_sql) if has_limit_after else None
+
+        # Blocking engines run on the database's own bounded executor
+        executor = None
+        if not isinstance(engine, AsyncEngine):
+            executor = self.executors.get(
+                database.id,
+                database.name,
+                database.executor_workers,
+                database.executor_queue_size,
+            )
 
-        # Extract limit value if present
-        limit_value = None
-        if has_limit_after:
-            try:
-                # Simple extraction of LIMIT value
-                limit_match = final_sql.upper().split("LIMIT")[-1].strip().split()[0]
-                limit_value = int(limit_match)
-            except (ValueError, IndexError):
-                pass
+        admission = self.admission.get(
+            database.id,
+            database.name,
+            database.max_concurrent_queries,
+            database.admission_queue_size,
+            database.admission_max_wait,
+        )
 
-        start_time = datetime.now()
+        # Wait for admission; the wait does not count against the query timeout
+        async with admission.slot():
+            start_time = datetime.now()
 
-        # Execute with timeout
-        try:
-            result = await asyncio.wait_for(
-                self._execute_with_engine(engine, final_sql),
-                timeout=timeout,
-            )
-        except TimeoutError:
-            execution_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
-            self.logger.error(
-                "query_timeout",
-                database=database.name,
-                query_type=query_type,
-                execution_time_ms=execution_time_ms,
-            )
-            # Log failed query
-            await self._log_query(
-                database_id=database.id,
-                database_name=database.name,
-                query_type=query_type,
-                input_text=log_input_text,
-                executed_sql=final_sql,
-                row_count=None,
-                execution_time_ms=execution_time_ms,
-                status="error",
-                error_message="Query timeout",
-            )
-            raise
+            # Execute with timeout
+            try:
+                result = await asyncio.wait_for(
+                    self._execute_with_engine(engine, final_sql, executor, timeout),
+                    timeout=timeout,
+                )
+            except TimeoutError:
+                execution_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+                self.logger.error(
+                    "query_timeout",
+                    database=database.name,
+                    query_type=query_type,
+                    execution_time_ms=execution_time_ms,
+                )
+                # Log failed query
+                await self._log_query(
+                    database_id=database.id,
+                    database_name=database.name,
+                    query_type=query_type,
+                    input_text=log_input_text,
+                    executed_sql=final_sql,
+                    row_count=None,
+                    execution_time_ms=execution_time_ms,
+                    status="error",
+                    error_message="Query timeout",
+                )
+                raise
 
         end_time = datetime.now()
         execution_time_ms = int((end_time - start_time).total_seconds() * 1000)
 
-        # Serialize results
-        columns, rows = self._serialize_results(result)
-
         # Log successful query
         self.logger.info(
             "query_completed",
             database=database.name,
             query_type=query_type,
-            row_count=len(rows),
+            row_count=len(result),
             execution_time_ms=execution_time_ms,
         )
         await self._log_query(
@@ -154,7 +451,7 @@ class QueryService:
             query_type=query_type,
             input_text=log_input_text,
             executed_sql=final_sql,
-            row_count=len(rows),
+            row_count=len(result),
             execution_time_ms=execution_time_ms,
             status="success",
             error_message=None,
@@ -169,47 +466,710 @@ class QueryService:
                     query_type=query_type,
                     sql=final_sql,
                     execution_time_ms=execution_time_ms,
-                    row_count=len(rows),
+                    row_count=len(result),
+                )
+
+        return _QueryRun(final_sql, result, execution_time_ms, has_limit_after, limit_value)
+
+    @staticmethod
+    def _limit_value(sql: str) -> int | None:
+        """Extract the LIMIT value of a query.
+
+        Args:
+            sql: The SQL, ending with a LIMIT clause.
+
+        Returns:
+            The LIMIT value, or None if it is not a plain number.
+        """
+        try:
+            # Simple extraction of LIMIT value
+            return int(sql.upper().split("LIMIT")[-1].strip().split()[0])
+        except (ValueError, IndexError):
+            return None
+
+    async def stream_query(
+        self,
+        database: DatabaseDetail,
+        engine: Engine | AsyncEngine,
+        sql: str,
+        timeout: int = Query.QUERY_TIMEOUT,
+        batch_size: int = Query.STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Execute a SQL query and yield its result in batches.
+
+        Rows are read through a server-side cursor, so memory use and the
+        time to the first batch do not grow with the result. The first frame
+        describes the columns, then come ``rows`` frames of up to
+        ``batch_size`` rows each, and an ``end`` frame closes the result.
+
+        Args:
+            database: The database connection details.
+            engine: The SQLAlchemy engine (sync or async) for the database.
+            sql: The SQL query to execute.
+            timeout: Seconds allowed for executing the query and for each fetch.
+            batch_size: Rows per ``rows`` frame.
+
+        Yields:
+            The header, rows and end frames.
+
+        Raises:
+            SQLValidationError: If the SQL is invalid.
+            asyncio.TimeoutError: If executing the query or a fetch times out.
+            AdmissionRejectedError: If the database's admission queue is full or
+                the wait budget is exceeded.
+            ExecutorSaturatedError: If too many queries are waiting on the database.
+            SQLAlchemyError: If the query execution fails.
+        """
+        async with self._open_result(database, engine, sql, timeout, batch_size) as result:
+            batch = await result.fetch()
+            columns = self._describe_columns(result.stream.columns, batch)
+            yield {
+                "type": "header",
+                "columns": [c.model_dump(by_alias=True) for c in columns],
+                "executedSql": result.executed_sql,
+                "hasLimit": result.has_limit,
+                "limitValue": result.limit_value,
+            }
+            while batch:
+                yield {
+                    "type": "rows",
+                    "rows": [[self._serialize_value(v) for v in row] for row in batch],
+                }
+                batch = await result.fetch()
+            yield {
+                "type": "end",
+                "rowCount": result.row_count,
+                "executionTimeMs": result.elapsed_ms,
+            }
+
+    async def stream_query_arrow(
+        self,
+        database: DatabaseDetail,
+        engine: Engine | AsyncEngine,
+        sql: str,
+        timeout: int = Query.QUERY_TIMEOUT,
+        batch_size: int = Query.ARROW_BATCH_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Execute a SQL query and yield its result as an Arrow IPC stream.
+
+        Each fetched batch of rows becomes one Arrow record batch, converted
+        column by column from the driver values. Column types come from the
+        cursor description, or for SQLite from the columns' declared types,
+        so they are the same in every batch. Requires pyarrow (see
+        ``arrow_available``).
+
+        Args:
+            database: The database connection details.
+            engine: The SQLAlchemy engine (sync or async) for the database.
+            sql: The SQL query to execute.
+            timeout: Seconds allowed for executing the query and for each fetch.
+            batch_size: Rows per record batch.
+
+        Yields:
+            The stream bytes: the schema and first batch, each further batch,
+            and the end-of-stream marker.
+
+        Raises:
+            SQLValidationError: If the SQL is invalid.
+            asyncio.TimeoutError: If executing the query or a fetch times out.
+            AdmissionRejectedError: If the database's admission queue is full or
+                the wait budget is exceeded.
+            ExecutorSaturatedError: If too many queries are waiting on the database.
+            SQLAlchemyError: If the query execution fails.
+        """
+        from ..core.arrow_stream import ArrowStreamEncoder, declared_types, description_types
+
+        loop = asyncio.get_running_loop()
+        declared = None
+        if database.db_type == "sqlite":
+            # SQLite cursors describe names only; read the declared types before
+            # the query holds a connection
+            get_parser(database.db_type).validate_select_only(sql)
+            declared = await self._sqlite_declared_types(engine, sql)
+        async with self._open_result(database, engine, sql, timeout, batch_size) as result:
+            if declared is not None:
+                column_types = declared_types(declared)
+            else:
+                column_types = description_types(database.db_type, result.stream.description)
+            encoder = ArrowStreamEncoder(result.stream.columns, column_types)
+            batch = await result.fetch()
+            # Converting a large batch takes a while, so keep it off the loop
+            yield await loop.run_in_executor(None, encoder.encode, batch)
+            while batch := await result.fetch():
+                yield await loop.run_in_executor(None, encoder.encode, batch)
+            yield encoder.finish()
+
+    async def _sqlite_declared_types(self, engine: Engine | AsyncEngine, sql: str) -> list[str]:
+        """Get the declared types of the columns of a SQLite query.
+
+        The query is compiled, not run, as a temporary view, whose column
+        types SQLite reports: the declared type of a column a result column
+        is taken from, and an empty string for expressions.
+
+        Args:
+            engine: The SQLAlchemy engine (sync or async) for the database.
+            sql: The SELECT query.
+
+        Returns:
+            The declared type of each column, or an empty list if the view
+            cannot be created.
+        """
+        view = f"column_types_{secrets.token_hex(8)}"
+        info: Sequence[Sequence[Any]]
+        statements = (
+            f'CREATE TEMP VIEW "{view}" AS {sql}',
+            f'PRAGMA table_info("{view}")',
+            f'DROP VIEW "{view}"',
+        )
+        try:
+            if isinstance(engine, AsyncEngine):
+                async with engine.connect() as async_conn:
+                    await async_conn.exec_driver_sql(statements[0])
+                    try:
+                        info = (await async_conn.exec_driver_sql(statements[1])).all()
+                    finally:
+                        await async_conn.exec_driver_sql(statements[2])
+            else:
+
+                def read_types() -> list[Any]:
+                    with engine.connect() as conn:
+                        conn.exec_driver_sql(statements[0])
+                        try:
+                            return list(conn.exec_driver_sql(statements[1]).all())
+                        finally:
+                            conn.exec_driver_sql(statements[2])
+
+                info = await asyncio.get_running_loop().run_in_executor(None, read_types)
+        except SQLAlchemyError as e:
+            self.logger.debug("sqlite_declared_types_unavailable", error=str(e))
+            return []
+        return [row[2] or "" for row in info]
+
+    @staticmethod
+    def arrow_available() -> bool:
+        """Check whether results can be encoded as Arrow (pyarrow is installed).
+
+        Returns:
+            True if pyarrow can be imported.
+        """
+        return find_spec("pyarrow") is not None
+
+    async def spool_query(
+        self,
+        database: DatabaseDetail,
+        engine: Engine | AsyncEngine,
+        sql: str,
+        timeout: int = Query.QUERY_TIMEOUT,
+        page_size: int = Query.RESULT_PAGE_SIZE,
+    ) -> ResultPageResponse:
+        """Execute a SQL query once and keep its whole result for paging.
+
+        The result is read through a server-side cursor into the result
+        spool without the default LIMIT. Rows stay in memory up to a budget;
+        a larger result is written batch by batch to a local SQLite file as
+        it is fetched, so it never has to fit in memory. Further pages,
+        sorted pages and exports are read from the spool by
+        ``get_result_page`` and ``export_result`` without running the query
+        again.
+
+        Args:
+            database: The database connection details.
+            engine: The SQLAlchemy engine (sync or async) for the database.
+            sql: The SQL query to execute.
+            timeout: Seconds allowed for executing the query and for each fetch.
+            page_size: Rows in the first page.
+
+        Returns:
+            The first page and the handle of the result.
+
+        Raises:
+            SQLValidationError: If the SQL is invalid.
+            asyncio.TimeoutError: If executing the query or a fetch times out.
+            AdmissionRejectedError: If the database's admission queue is full or
+                the wait budget is exceeded.
+            ExecutorSaturatedError: If too many queries are waiting on the database.
+            SQLAlchemyError: If the query execution fails.
+            ResultSpoolFullError: If the result outgrows the spool's disk quota.
+        """
+        loop = asyncio.get_running_loop()
+        async with self._open_result(
+            database, engine, sql, timeout, Query.STREAM_BATCH_SIZE
+        ) as result:
+            spooled = self.spool.create(database.id, database.name, result.executed_sql)
+            try:
+                batch = await result.fetch()
+                spooled.columns = self._describe_columns(result.stream.columns, batch)
+                spooled.boolean_columns = [
+                    i for i, column in enumerate(spooled.columns) if column.data_type == "BOOLEAN"
+                ]
+                # Decimals are serialized as text but sorted by value
+                spooled.numeric_columns = [
+                    i for i, column in enumerate(spooled.columns) if column.data_type == "DECIMAL"
+                ]
+                while batch:
+                    # Serializing and possibly writing to disk, off the loop
+                    await loop.run_in_executor(None, self._spool_batch, spooled, batch)
+                    batch = await result.fetch()
+            except BaseException:
+                spooled.close()
+                raise
+        spooled.has_limit = result.has_limit
+        spooled.limit_value = result.limit_value
+        spooled.execution_time_ms = result.elapsed_ms
+        self.spool.add(spooled)
+        return await self._result_page(spooled, 0, page_size)
+
+    async def get_result_page(
+        self,
+        handle: str,
+        cursor: str | None = None,
+        page_size: int = Query.RESULT_PAGE_SIZE,
+        sort: str | None = None,
+        descending: bool = False,
+    ) -> ResultPageResponse:
+        """Get a page of a spooled result, optionally re-sorted by a column.
+
+        Reading a page extends the time the result is kept. Cursors are
+        positions in one ordering, so pass the same ``sort`` and
+        ``descending`` with a cursor as for the page it came from.
+
+        Args:
+            handle: The result handle returned by ``spool_query``.
+            cursor: The ``next_cursor`` of the previous page; None for the first page.
+            page_size: Rows in the page.
+            sort: Name of the column to sort by; None keeps the query's order.
+            descending: Whether to sort in descending order.
+
+        Returns:
+            The page.
+
+        Raises:
+            ValueError: If the result is unknown or has expired, or the cursor
+                or sort column is invalid.
+        """
+        spooled = self._spooled_result(handle)
+        sort_index = self._sort_index(spooled, sort)
+        offset = self._decode_result_cursor(cursor) if cursor else 0
+        if offset > spooled.row_count:
+            raise ValueError("Invalid result cursor")
+        return await self._result_page(spooled, offset, page_size, sort_index, descending)
+
+    def export_result(
+        self,
+        handle: str,
+        export_format: str,
+        include_headers: bool = True,
+        sort: str | None = None,
+        descending: bool = False,
+    ) -> AsyncIterator[str]:
+        """Export a spooled result as CSV or JSON, read from the spool in chunks.
+
+        The output matches ``export_results``, except that JSON rows are
+        not indented. The result is validated before the first chunk, so
+        errors surface before a response starts.
+
+        Args:
+            handle: The result handle returned by ``spool_query``.
+            export_format: ``csv`` or ``json``.
+            include_headers: Whether CSV output starts with the column names.
+            sort: Name of the column to sort by; None keeps the query's order.
+            descending: Whether to sort in descending order.
+
+        Returns:
+            The export text in chunks.
+
+        Raises:
+            ValueError: If the result is unknown or has expired, or the format
+                or sort column is invalid.
+        """
+        spooled = self._spooled_result(handle)
+        sort_index = self._sort_index(spooled, sort)
+        export_format = export_format.lower()
+        if export_format not in ("csv", "json"):
+            raise ValueError(f"Unsupported export format: {export_format}")
+        return self._export_spooled(
+            spooled, export_format, include_headers, sort_index, descending
+        )
+
+    def release_result(self, handle: str) -> bool:
+        """Drop a spooled result before it expires.
+
+        Args:
+            handle: The result handle.
+
+        Returns:
+            True if the result was held.
+        """
+        return self.spool.remove(handle)
+
+    def _spooled_result(self, handle: str) -> SpooledResult:
+        """Get a spooled result, extending the time it is kept.
+
+        Args:
+            handle: The result handle.
+
+        Returns:
+            The spooled result.
+
+        Raises:
+            ValueError: If the result is unknown or has expired.
+        """
+        spooled = self.spool.get(handle)
+        if spooled is None:
+            raise ValueError(f"Result '{handle}' not found or expired")
+        return spooled
+
+    @staticmethod
+    def _sort_index(spooled: SpooledResult, sort: str | None) -> int | None:
+        """Get the index of a spooled result's sort column.
+
+        Args:
+            spooled: The spooled result.
+            sort: The column name, or None.
+
+        Returns:
+            The column index, or None if no sort column is given.
+
+        Raises:
+            ValueError: If the result has no such column.
+        """
+        if sort is None:
+            return None
+        for i, column in enumerate(spooled.columns):
+            if column.name == sort:
+                return i
+        raise ValueError(f"Invalid sort column: {sort}")
+
+    async def _export_spooled(
+        self,
+        spooled: SpooledResult,
+        export_format: str,
+        include_headers: bool,
+        sort: int | None,
+        descending: bool,
+    ) -> AsyncIterator[str]:
+        """Yield the export of a spooled result chunk by chunk.
+
+        Args:
+            spooled: The spooled result.
+            export_format: ``csv`` or ``json``.
+            include_headers: Whether CSV output starts with the column names.
+            sort: Index of the column to sort by, or None.
+            descending: Whether to sort in descending order.
+
+        Yields:
+            The export text, one chunk per batch of rows.
+
+        Raises:
+            ValueError: If the result is released or expires during the export.
+        """
+        import csv
+
+        loop = asyncio.get_running_loop()
+        names = [column.name for column in spooled.columns]
+        if export_format == "json":
+            head = {
+                "metadata": {
+                    "database": spooled.database_name,
+                    "executed_sql": spooled.executed_sql,
+                    "row_count": spooled.row_count,
+                    "execution_time_ms": spooled.execution_time_ms,
+                    "exported_at": datetime.now().isoformat(),
+                },
+                "columns": [
+                    {
+                        "name": column.name,
+                        "data_type": column.data_type,
+                        "is_nullable": column.is_nullable,
+                    }
+                    for column in spooled.columns
+                ],
+            }
+            yield json.dumps(head, ensure_ascii=False)[:-1] + ', "rows": ['
+        elif include_headers:
+            output = StringIO()
+            csv.writer(output).writerow(names)
+            yield output.getvalue()
+
+        for offset in range(0, spooled.row_count, Query.RESULT_PAGE_SIZE_MAX):
+            # Keep the result alive for the length of a long export, and stop
+            # rather than end early if it was released or expired meanwhile
+            self._spooled_result(spooled.handle)
+            rows = await loop.run_in_executor(
+                None, spooled.read, offset, Query.RESULT_PAGE_SIZE_MAX, sort, descending
+            )
+            if export_format == "json":
+                lines = ",\n".join(
+                    json.dumps(dict(zip(names, row, strict=True)), ensure_ascii=False)
+                    for row in rows
+                )
+                yield ("\n" if offset == 0 else ",\n") + lines
+            else:
+                output = StringIO()
+                csv.writer(output).writerows(
+                    [str(value) if value is not None else "" for value in row] for row in rows
+                )
+                yield output.getvalue()
+
+        if export_format == "json":
+            yield "\n]}\n"
+
+    def _spool_batch(self, spooled: SpooledResult, batch: Sequence[Sequence[Any]]) -> None:
+        """Serialize a batch of driver rows and append it to a spooled result."""
+        serialize = self._serialize_value
+        spooled.append([[serialize(value) for value in row] for row in batch])
+
+    async def _result_page(
+        self,
+        spooled: SpooledResult,
+        offset: int,
+        page_size: int,
+        sort: int | None = None,
+        descending: bool = False,
+    ) -> ResultPageResponse:
+        """Read a page of a spooled result.
+
+        Args:
+            spooled: The spooled result.
+            offset: Index of the page's first row.
+            page_size: Rows in the page.
+            sort: Index of the column to sort by, or None.
+            descending: Whether to sort in descending order.
+
+        Returns:
+            The page.
+        """
+        loop = asyncio.get_running_loop()
+        rows = await loop.run_in_executor(
+            None, spooled.read, offset, page_size, sort, descending
+        )
+        names = [column.name for column in spooled.columns]
+        end = offset + len(rows)
+        return ResultPageResponse(
+            handle=spooled.handle,
+            executed_sql=spooled.executed_sql,
+            row_count=spooled.row_count,
+            execution_time_ms=spooled.execution_time_ms,
+            columns=spooled.columns,
+            rows=[dict(zip(names, row, strict=True)) for row in rows],
+            offset=offset,
+            next_cursor=self._encode_result_cursor(end) if end < spooled.row_count else None,
+            has_limit=spooled.has_limit,
+            limit_value=spooled.limit_value,
+            expires_in_seconds=int(self.spool.ttl),
+        )
+
+    @staticmethod
+    def _encode_result_cursor(offset: int) -> str:
+        """Encode the position of a row in a spooled result as an opaque cursor.
+
+        Args:
+            offset: The index of the row.
+
+        Returns:
+            A URL-safe cursor string.
+        """
+        return base64.urlsafe_b64encode(str(offset).encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_result_cursor(cursor: str) -> int:
+        """Decode a spooled result cursor.
+
+        Args:
+            cursor: The cursor string.
+
+        Returns:
+            The index of the first row of the page.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        try:
+            payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            offset = int(payload.decode())
+        except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+            raise ValueError("Invalid result cursor") from e
+        if offset < 0:
+            raise ValueError("Invalid result cursor")
+        return offset
+
+    @asynccontextmanager
+    async def _open_result(
+        self,
+        database: DatabaseDetail,
+        engine: Engine | AsyncEngine,
+        sql: str,
+        timeout: int,
+        batch_size: int,
+    ) -> AsyncIterator[_OpenResult]:
+        """Validate and start a query whose result is read in batches.
+
+        The admission slot is held and the cursor stays open until the block
+        exits; the timeout applies to executing the query and to each fetch
+        rather than to the whole result. On exit the query is recorded in
+        the history with the rows fetched.
+
+        Args:
+            database: The database connection details.
+            engine: The SQLAlchemy engine (sync or async) for the database.
+            sql: The SQL query to execute.
+            timeout: Seconds allowed for executing the query and for each fetch.
+            batch_size: Rows per fetch.
+
+        Yields:
+            The open result.
+        """
+        self.logger.info(
+            "streaming_query",
+            database=database.name,
+            sql=sql[:100] if len(sql) > 100 else sql,
+        )
+        parser = get_parser(database.db_type)
+        parser.validate_select_only(sql)
+
+        # Streaming removes the need for a small LIMIT, but keep a backstop
+        final_sql = parser.ensure_limit(sql, default_limit=Query.STREAM_DEFAULT_LIMIT)
+        has_limit_after = "LIMIT" in final_sql.upper()
+        limit_value = self._limit_value(final_sql) if has_limit_after else None
+
+        executor = None
+        if not isinstance(engine, AsyncEngine):
+            executor = self.executors.get(
+                database.id,
+                database.name,
+                database.executor_workers,
+                database.executor_queue_size,
+            )
+
+        admission = self.admission.get(
+            database.id,
+            database.name,
+            database.max_concurrent_queries,
+            database.admission_queue_size,
+            database.admission_max_wait,
+        )
+
+        async with admission.slot():
+            stream = create_result_stream(engine, final_sql, batch_size, executor, timeout)
+            result = _OpenResult(stream, final_sql, has_limit_after, limit_value)
+            try:
+                await stream.open()
+                yield result
+            except Exception as e:
+                self.logger.error(
+                    "stream_failed",
+                    database=database.name,
+                    row_count=result.row_count,
+                    error=str(e) or type(e).__name__,
+                )
+                await self._log_query(
+                    database_id=database.id,
+                    database_name=database.name,
+                    query_type="sql",
+                    input_text=sql,
+                    executed_sql=final_sql,
+                    row_count=None,
+                    execution_time_ms=result.elapsed_ms,
+                    status="error",
+                    error_message=str(e) or "Query timeout",
                 )
+                raise
+            finally:
+                await stream.close()
 
-        return QueryResponse(
-            success=True,
+        execution_time_ms = result.elapsed_ms
+        self.logger.info(
+            "stream_completed",
+            database=database.name,
+            row_count=result.row_count,
+            execution_time_ms=execution_time_ms,
+        )
+        await self._log_query(
+            database_id=database.id,
+            database_name=database.name,
+            query_type="sql",
+            input_text=sql,
             executed_sql=final_sql,
-            row_count=len(rows),
+            row_count=result.row_count,
             execution_time_ms=execution_time_ms,
-            columns=columns,
-            rows=rows,
-            has_limit=has_limit_after,
-            limit_value=limit_value,
+            status="success",
+            error_message=None,
         )
+        if execution_time_ms >= Performance.SLOW_QUERY_THRESHOLD:
+            metrics_service = self._get_metrics_service()
+            if metrics_service:
+                await metrics_service.record_slow_query(
+                    database_name=database.name,
+                    query_type="sql",
+                    sql=final_sql,
+                    execution_time_ms=execution_time_ms,
+                    row_count=result.row_count,
+                )
 
-    async def _execute_with_engine(self, engine: Engine, sql: str) -> Any:
+    async def _execute_with_engine(
+        self,
+        engine: Engine | AsyncEngine,
+        sql: str,
+        executor: BoundedExecutor | None = None,
+        timeout: float | None = None,
+    ) -> Any:
         """Execute SQL with the given engine.
 
+        Async engines are awaited directly on the event loop; synchronous
+        engines run on the given bounded executor, or the loop's default
+        executor if none is given. If the awaiting task is cancelled (e.g. by
+        a timeout) the statement is cancelled through the driver so the
+        worker thread and its pooled connection are released.
+
         Args:
-            engine: The SQLAlchemy engine.
+            engine: The SQLAlchemy engine or async engine.
             sql: The SQL to execute.
+            executor: The database's bounded executor.
+            timeout: Query timeout in seconds, enforced server-side where supported.
 
         Returns:
             The query result.
         """
+        if isinstance(engine, AsyncEngine):
+            async with engine.connect() as conn:
+                result = await conn.execute(text(sql))
+                return list(result.fetchall())
+
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._sync_execute, engine, sql)
+        handle = QueryCancelHandle(engine, timeout)
+        try:
+            if executor is not None:
+                return await executor.run(self._sync_execute, engine, sql, handle)
+            return await loop.run_in_executor(None, self._sync_execute, engine, sql, handle)
+        except asyncio.CancelledError:
+            # The worker keeps running unless the driver stops the statement;
+            # cancelling may need a network round trip, so keep it off the loop
+            loop.run_in_executor(None, handle.cancel)
+            raise
 
-    def _sync_execute(self, engine: Engine, sql: str) -> Any:
+    def _sync_execute(
+        self, engine: Engine, sql: str, handle: QueryCancelHandle | None = None
+    ) -> Any:
         """Synchronously execute SQL query.
 
         Args:
             engine: The SQLAlchemy engine.
             sql: The SQL to execute.
+            handle: Handle through which the query can be cancelled.
 
         Returns:
             The query result.
         """
         with engine.connect() as conn:
-            result = conn.execute(text(sql))
-            # Fetch all results and convert to list
-            return list(result.fetchall())
+            if handle is not None:
+                handle.attach(conn)
+            try:
+                result = conn.execute(text(sql))
+                # Fetch all results and convert to list
+                return list(result.fetchall())
+            finally:
+                if handle is not None:
+                    handle.detach()
 
     def _serialize_results(
         self, result: list[Any], column_types: list[str] | None = None
@@ -226,18 +1186,76 @@ class QueryService:
         if not result:
             return [], []
 
-        # Extract column names from the first row
-        first_row = result[0]
+        column_names = self._column_names(result[0])
+        columns = self._describe_columns(column_names, result, column_types)
+
+        # Convert rows to dictionaries
+        rows = []
+        for row in result:
+            row_dict = {}
+            for i, name in enumerate(column_names):
+                # Access by index to handle both Row and tuple types
+                row_dict[name] = self._serialize_value(row[i] if i < len(row) else None)
+            rows.append(row_dict)
+
+        return columns, rows
+
+    def _serialize_columns(
+        self, result: list[Any]
+    ) -> tuple[list[ColumnMetadata], list[list[Any]]]:
+        """Serialize query results into columns and one value list per column.
+
+        Args:
+            result: The raw query result.
+
+        Returns:
+            A tuple of (columns, values), with values in the order of columns.
+        """
+        if not result:
+            return [], []
+
+        columns = self._describe_columns(self._column_names(result[0]), result)
+        values = []
+        for column in zip(*result, strict=True):
+            # Most columns hold only JSON-native values and are taken as they are
+            if all(type(value) in _JSON_NATIVE for value in column):
+                values.append(list(column))
+            else:
+                values.append([self._serialize_value(value) for value in column])
+        return columns, values
+
+    @staticmethod
+    def _column_names(first_row: Any) -> list[str]:
+        """Get the column names of a result from its first row.
+
+        Args:
+            first_row: The first row of the result.
+
+        Returns:
+            The column names.
+        """
         # Handle both Row objects and dict-like objects
         if hasattr(first_row, "_fields"):
-            column_names = list(first_row._fields)
-        elif hasattr(first_row, "keys"):
-            column_names = list(first_row.keys())
-        else:
-            # Fallback: use numeric indices
-            column_names = [f"column_{i}" for i in range(len(first_row))]
+            return list(first_row._fields)
+        if hasattr(first_row, "keys"):
+            return list(first_row.keys())
+        # Fallback: use numeric indices
+        return [f"column_{i}" for i in range(len(first_row))]
+
+    @staticmethod
+    def _describe_columns(
+        column_names: list[str], sample: Sequence[Any], column_types: list[str] | None = None
+    ) -> list[ColumnMetadata]:
+        """Build column metadata, inferring types from sample rows.
+
+        Args:
+            column_names: The result's column names.
+            sample: Rows to infer types from.
+            column_types: Optional list of column type names.
 
-        # Create column metadata with type inference from values
+        Returns:
+            The column metadata.
+        """
         columns = []
         for i, name in enumerate(column_names):
             # Try to get type from column_types if provided
@@ -246,7 +1264,7 @@ class QueryService:
                 data_type = column_types[i].upper()
             else:
                 # Infer type from actual row values
-                for row in result[:Query.TYPE_INFERENCE_SAMPLE_ROWS]:
+                for row in sample[:Query.TYPE_INFERENCE_SAMPLE_ROWS]:
                     value = row[i] if i < len(row) else None
                     if value is not None:
                         if isinstance(value, bool):
@@ -269,25 +1287,23 @@ class QueryService:
                     is_primary_key=False,
                 )
             )
+        return columns
 
-        # Convert rows to dictionaries
-        rows = []
-        for row in result:
-            row_dict = {}
-            for i, name in enumerate(column_names):
-                # Access by index to handle both Row and tuple types
-                value = row[i] if i < len(row) else None
-                # Convert datetime and other special types to strings
-                if hasattr(value, "isoformat"):
-                    value = value.isoformat()
-                elif value is None:
-                    value = None
-                else:
-                    value = str(value) if not isinstance(value, (int, float, str, bool)) else value
-                row_dict[name] = value
-            rows.append(row_dict)
+    @staticmethod
+    def _serialize_value(value: Any) -> Any:
+        """Convert a result value to a JSON-compatible value.
 
-        return columns, rows
+        Args:
+            value: The raw value.
+
+        Returns:
+            The value, with datetimes as ISO strings and other special types as strings.
+        """
+        if hasattr(value, "isoformat"):
+            return value.isoformat()
+        if value is None or isinstance(value, (int, float, str, bool)):
+            return value
+        return str(value)
 
     async def _log_query(
         self,
@@ -303,6 +1319,10 @@ class QueryService:
     ) -> None:
         """Log a query to the history.
 
+        The record is handed to the write-behind history writer, so the query
+        does not wait for the INSERT unless the writer's background task is
+        not running (e.g. outside the application).
+
         Args:
             database_id: The database ID.
             database_name: The database name.
@@ -314,16 +1334,7 @@ class QueryService:
             status: The query status (success or error).
             error_message: The error message if any.
         """
-        await self.db.execute(
-            """
-            INSERT INTO query_history (
-                database_id, database_name, query_type, input_text, executed_sql,
-                row_count, execution_time_ms, status, error_message, created_at
-            ) VALUES (
-                :database_id, :database_name, :query_type, :input_text, :executed_sql,
-                :row_count, :execution_time_ms, :status, :error_message, :created_at
-            )
-            """,
+        self.history.submit(
             {
                 "database_id": database_id,
                 "database_name": database_name,
@@ -335,8 +1346,10 @@ class QueryService:
                 "status": status,
                 "error_message": error_message,
                 "created_at": datetime.now(),
-            },
+            }
         )
+        if not self.history.running:
+            await self.history.flush()
 
     async def get_query_history(
         self, database_name: str, page: int = 1, page_size: int = Pagination.DEFAULT_PAGE_SIZE
@@ -351,37 +1364,223 @@ class QueryService:
         Returns:
             List of query history items.
         """
-        offset = (page - 1) * page_size
+        items, _ = await self.get_query_history_page(database_name, page_size, page=page)
+        return items
+
+    async def get_query_history_page(
+        self,
+        database_name: str,
+        page_size: int = Pagination.DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+        page: int = 1,
+    ) -> tuple[list[QueryHistoryItem], str | None]:
+        """Get a page of query history, newest first.
+
+        With a cursor the page is found by seeking the (database_name,
+        created_at, id) index, so the cost does not grow with the page depth.
+        Without one, ``page`` selects an offset page.
+
+        Args:
+            database_name: The database name.
+            page_size: The number of items per page.
+            cursor: Cursor returned with the previous page.
+            page: The page number (1-indexed), used when no cursor is given.
+
+        Returns:
+            The page's items and the cursor for the next page (None on the last page).
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        # Include records still waiting in the write-behind buffer
+        await self.history.flush()
+
+        params: dict[str, Any] = {"database_name": database_name, "limit": page_size}
+        if cursor is not None:
+            params["after_created_at"], params["after_id"] = self._decode_history_cursor(cursor)
+            items = await self.db.fetch_models(
+                f"""
+                SELECT {_HISTORY_COLUMNS} FROM query_history
+                WHERE database_name = :database_name
+                  AND (created_at, id) < (:after_created_at, :after_id)
+                ORDER BY created_at DESC, id DESC
+                LIMIT :limit
+                """,
+                params,
+                QueryHistoryItem,
+            )
+        else:
+            params["offset"] = (page - 1) * page_size
+            items = await self.db.fetch_models(
+                f"""
+                SELECT {_HISTORY_COLUMNS} FROM query_history
+                WHERE database_name = :database_name
+                ORDER BY created_at DESC, id DESC
+                LIMIT :limit OFFSET :offset
+                """,
+                params,
+                QueryHistoryItem,
+            )
+
+        next_cursor = None
+        if len(items) == page_size:
+            last = items[-1]
+            next_cursor = self._encode_history_cursor(
+                self._history_timestamp(last.created_at), last.id
+            )
+
+        return items, next_cursor
+
+    async def search_query_history(
+        self,
+        database_name: str,
+        query: str,
+        limit: int = Pagination.DEFAULT_SEARCH_LIMIT,
+        prefix: bool = True,
+        status: str | None = None,
+        query_type: str | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        min_execution_time_ms: int | None = None,
+    ) -> list[QueryHistorySearchHit]:
+        """Search query history text, most relevant first.
+
+        Matches history items whose input text or executed SQL contain every
+        word of ``query``. Ranking uses BM25 with the input text weighted
+        above the executed SQL; ties go to the newest item.
+
+        Args:
+            database_name: The database name.
+            query: The search words.
+            limit: Maximum number of results.
+            prefix: Whether each word also matches words it is a prefix of.
+            status: Only items with this status.
+            query_type: Only items of this query type.
+            created_after: Only items created at or after this time.
+            created_before: Only items created before this time.
+            min_execution_time_ms: Only items that ran at least this long.
+
+        Returns:
+            The matching history items with their relevance scores.
+
+        Raises:
+            ValueError: If the query contains no searchable words.
+        """
+        match = self._build_match_expression(query, prefix)
+
+        await self.history.flush()
 
-        rows = await self.db.fetch_all(
-            """
-            SELECT * FROM query_history
-            WHERE database_name = :database_name
-            ORDER BY created_at DESC
-            LIMIT :limit OFFSET :offset
+        conditions = ["query_history_fts MATCH :match", "database_name = :database_name"]
+        params: dict[str, Any] = {
+            "match": match,
+            "database_name": database_name,
+            "limit": limit,
+        }
+        if status is not None:
+            conditions.append("status = :status")
+            params["status"] = status
+        if query_type is not None:
+            conditions.append("query_type = :query_type")
+            params["query_type"] = query_type
+        if created_after is not None:
+            conditions.append("created_at >= :created_after")
+            params["created_after"] = self._history_timestamp(created_after)
+        if created_before is not None:
+            conditions.append("created_at < :created_before")
+            params["created_before"] = self._history_timestamp(created_before)
+        if min_execution_time_ms is not None:
+            conditions.append("execution_time_ms >= :min_execution_time_ms")
+            params["min_execution_time_ms"] = min_execution_time_ms
+
+        # bm25() is lower-is-better; expose it as a positive relevance score
+        return await self.db.fetch_models(
+            f"""
+            SELECT {_HISTORY_COLUMNS}, -bm25(query_history_fts, 2.0, 1.0) AS score
+            FROM query_history_fts
+            JOIN query_history ON query_history.id = query_history_fts.rowid
+            WHERE {" AND ".join(conditions)}
+            ORDER BY score DESC, created_at DESC, query_history.id DESC
+            LIMIT :limit
             """,
-            {"database_name": database_name, "limit": page_size, "offset": offset},
+            params,
+            QueryHistorySearchHit,
         )
 
-        items = []
-        for row in rows:
-            items.append(
-                QueryHistoryItem(
-                    id=row["id"],
-                    database_id=row["database_id"],
-                    database_name=row["database_name"],
-                    query_type=row["query_type"],
-                    input_text=row["input_text"],
-                    executed_sql=row["executed_sql"],
-                    row_count=row["row_count"],
-                    execution_time_ms=row["execution_time_ms"],
-                    status=row["status"],
-                    error_message=row["error_message"],
-                    created_at=datetime.fromisoformat(row["created_at"]),
-                )
-            )
+    @staticmethod
+    def _build_match_expression(query: str, prefix: bool) -> str:
+        """Build an FTS5 MATCH expression from free-form search text.
 
-        return items
+        Each word becomes a quoted string so that FTS5 syntax in user input
+        is never interpreted; the words are implicitly ANDed.
+
+        Args:
+            query: The search text.
+            prefix: Whether to add a prefix wildcard to each word.
+
+        Returns:
+            The MATCH expression.
+
+        Raises:
+            ValueError: If the text contains no words.
+        """
+        terms = _SEARCH_TERM.findall(query)
+        if not terms:
+            raise ValueError("Search query must contain at least one word")
+        suffix = "*" if prefix else ""
+        return " ".join(f'"{term}"{suffix}' for term in terms)
+
+    @staticmethod
+    def _history_timestamp(value: datetime) -> str:
+        """Format a datetime the way history timestamps are stored.
+
+        History timestamps are naive local times written by the sqlite3
+        datetime adapter, so aware datetimes are converted to local time.
+
+        Args:
+            value: The datetime.
+
+        Returns:
+            The string compared against ``created_at``.
+        """
+        if value.tzinfo is not None:
+            value = value.astimezone().replace(tzinfo=None)
+        return value.isoformat(" ")
+
+    @staticmethod
+    def _encode_history_cursor(created_at: str, item_id: int) -> str:
+        """Encode the position after a history row as an opaque cursor.
+
+        Args:
+            created_at: The row's stored created_at value.
+            item_id: The row's ID.
+
+        Returns:
+            A URL-safe cursor string.
+        """
+        payload = json.dumps([created_at, item_id], separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_history_cursor(cursor: str) -> tuple[str, int]:
+        """Decode a history cursor.
+
+        Args:
+            cursor: The cursor string.
+
+        Returns:
+            The created_at value and ID of the last row of the previous page.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        try:
+            payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            created_at, item_id = json.loads(payload)
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+            raise ValueError("Invalid history cursor") from e
+        if not isinstance(created_at, str) or not isinstance(item_id, int):
+            raise ValueError("Invalid history cursor")
+        return created_at, item_id
 
     async def get_query_history_count(self, database_name: str) -> int:
         """Get the total count of query history for a database.
@@ -392,8 +1591,10 @@ class QueryService:
         Returns:
             The total count.
         """
+        await self.history.flush()
+        # Maintained by triggers on query_history, so no table scan
         row = await self.db.fetch_one(
-            "SELECT COUNT(*) as count FROM query_history WHERE database_name = :database_name",
+            "SELECT count FROM query_history_counts WHERE database_name = :database_name",
             {"database_name": database_name},
         )
         return row["count"] if row else 0
@@ -0,0 +1,241 @@
+"""Scheduled retention of query history."""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any
+
+from ..core.constants import Performance
+from ..core.history_rollups import rollup_bucket
+from ..core.logging import get_logger
+from ..core.sqlite_db import SQLiteDB, get_db
+
+_DELETE_CHUNK = """
+    DELETE FROM query_history
+    WHERE id IN (
+        SELECT id FROM query_history
+        WHERE created_at < :cutoff
+        ORDER BY created_at
+        LIMIT :limit
+    )
+"""
+
+
+class RetentionService:
+    """Deletes expired query history without stalling other writers.
+
+    History older than the retention period is deleted in small chunks,
+    each in its own transaction, and the chunk size adapts so that a chunk
+    holds the write lock for about ``chunk_target_ms``. Freed pages are
+    then returned to the file system with ``PRAGMA incremental_vacuum``,
+    also in steps, and ``PRAGMA optimize`` refreshes planner statistics.
+    """
+
+    def __init__(
+        self,
+        retention_days: int = Performance.METRICS_RETENTION_DAYS,
+        interval: float = Performance.RETENTION_INTERVAL,
+        chunk_size: int = Performance.RETENTION_CHUNK_SIZE,
+        chunk_target_ms: float = Performance.RETENTION_CHUNK_TARGET_MS,
+        chunk_pause: float = Performance.RETENTION_CHUNK_PAUSE,
+        vacuum_pages: int = Performance.RETENTION_VACUUM_PAGES,
+    ) -> None:
+        """Initialize the retention service.
+
+        Args:
+            retention_days: Days of history to keep.
+            interval: Seconds between scheduled runs.
+            chunk_size: Rows deleted by the first chunk of a run.
+            chunk_target_ms: Write lock time each chunk aims for.
+            chunk_pause: Seconds to yield between chunks.
+            vacuum_pages: Free pages released per vacuum step.
+        """
+        self.logger = get_logger(__name__)
+        self.retention_days = retention_days
+        self.interval = interval
+        self.chunk_size = chunk_size
+        self.chunk_target_ms = chunk_target_ms
+        self.chunk_pause = chunk_pause
+        self.vacuum_pages = vacuum_pages
+        self._task: asyncio.Task[None] | None = None
+        self._lock = asyncio.Lock()
+        self._progress: dict[str, Any] | None = None
+        self._last_run: dict[str, Any] | None = None
+
+    @property
+    def db(self) -> SQLiteDB:
+        """The store, looked up per use as the service outlives it in tests."""
+        return get_db()
+
+    async def start(self) -> None:
+        """Start the scheduled retention task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run_periodically())
+            self.logger.info("retention_started", retention_days=self.retention_days)
+
+    async def stop(self) -> None:
+        """Stop the scheduled retention task, abandoning a run in progress."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self.logger.info("retention_stopped")
+
+    async def _run_periodically(self) -> None:
+        """Background task that runs retention every ``interval`` seconds."""
+        while True:
+            try:
+                await self.run()
+                await asyncio.sleep(self.interval)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                # Log but don't stop the retention task
+                self.logger.error("retention_error", error=str(e))
+                await asyncio.sleep(self.interval)
+
+    async def run(self, retention_days: int | None = None) -> dict[str, Any]:
+        """Delete expired history and reclaim the space it used.
+
+        Runs are serialized; a run requested while another is in progress
+        starts after it.
+
+        Args:
+            retention_days: Days of history to keep, or None for the default.
+
+        Returns:
+            Dictionary with rows deleted, chunks, reclaimed bytes and duration.
+        """
+        days = retention_days or self.retention_days
+        async with self._lock:
+            started = time.monotonic()
+            cutoff = datetime.now() - timedelta(days=days)
+            self._progress = {
+                "phase": "deleting",
+                "cutoff": cutoff.isoformat(),
+                "started_at": datetime.now().isoformat(),
+                "deleted_rows": 0,
+                "chunks": 0,
+                "chunk_size": self.chunk_size,
+            }
+            try:
+                deleted = await self._delete_expired(cutoff)
+                rollups = await self.db.execute(
+                    "DELETE FROM query_history_rollups WHERE bucket_start < :cutoff",
+                    {"cutoff": rollup_bucket(cutoff)},
+                )
+                self._progress["phase"] = "vacuuming"
+                reclaimed = await self._incremental_vacuum()
+                self._progress["phase"] = "optimizing"
+                await self.db.execute("PRAGMA optimize")
+            finally:
+                progress, self._progress = self._progress, None
+
+            result = {
+                "retention_days": days,
+                "cutoff": progress["cutoff"],
+                "deleted_rows": deleted,
+                "deleted_rollups": rollups.rowcount,
+                "chunks": progress["chunks"],
+                "reclaimed_bytes": reclaimed,
+                "duration_ms": int((time.monotonic() - started) * 1000),
+                "finished_at": datetime.now().isoformat(),
+            }
+            self._last_run = result
+            self.logger.info("retention_completed", **result)
+            return result
+
+    async def _delete_expired(self, cutoff: datetime) -> int:
+        """Delete history older than the cutoff in adaptively sized chunks.
+
+        Args:
+            cutoff: Items created before this time are deleted.
+
+        Returns:
+            The number of rows deleted.
+        """
+        assert self._progress is not None
+        chunk_size = self.chunk_size
+        deleted = 0
+        while True:
+            started = time.monotonic()
+            cursor = await self.db.execute(
+                _DELETE_CHUNK, {"cutoff": cutoff.isoformat(" "), "limit": chunk_size}
+            )
+            elapsed_ms = (time.monotonic() - started) * 1000
+            deleted += cursor.rowcount
+            self._progress["deleted_rows"] = deleted
+            self._progress["chunks"] += 1
+            if cursor.rowcount < chunk_size:
+                return deleted
+
+            # Keep each transaction short as trigger and index costs vary
+            if elapsed_ms > self.chunk_target_ms:
+                chunk_size = max(Performance.RETENTION_MIN_CHUNK_SIZE, chunk_size // 2)
+            elif elapsed_ms < self.chunk_target_ms / 2:
+                chunk_size = min(Performance.RETENTION_MAX_CHUNK_SIZE, chunk_size * 2)
+            self._progress["chunk_size"] = chunk_size
+            await asyncio.sleep(self.chunk_pause)
+
+    async def _incremental_vacuum(self) -> int:
+        """Release free pages to the file system in steps.
+
+        Returns:
+            The number of bytes the database file shrank by.
+        """
+        page_size = await self._pragma("page_size")
+        pages_before = await self._pragma("page_count")
+        free_pages = await self._pragma("freelist_count")
+        while free_pages:
+            async with self.db.transaction() as conn:
+                cursor = await conn.execute(f"PRAGMA incremental_vacuum({self.vacuum_pages})")
+                # The pragma frees one page per step, so run it to completion
+                await cursor.fetchall()
+                await cursor.close()
+            remaining = await self._pragma("freelist_count")
+            if remaining >= free_pages:
+                # Not in incremental auto-vacuum mode; nothing can be released
+                break
+            free_pages = remaining
+            await asyncio.sleep(self.chunk_pause)
+        return (pages_before - await self._pragma("page_count")) * page_size
+
+    async def _pragma(self, name: str) -> int:
+        """Read an integer pragma of the store.
+
+        Args:
+            name: The pragma name.
+
+        Returns:
+            The pragma value.
+        """
+        row = await self.db.fetch_one(f"PRAGMA {name}")
+        return next(iter(row.values())) if row else 0
+
+    def get_status(self) -> dict[str, Any]:
+        """Get the progress of the current run and the result of the last one.
+
+        Returns:
+            Dictionary with the retention settings, progress and last result.
+        """
+        return {
+            "retention_days": self.retention_days,
+            "interval_seconds": self.interval,
+            "running": self._progress is not None,
+            "progress": dict(self._progress) if self._progress else None,
+            "last_run": self._last_run,
+        }
+
+
+# Global retention service instance
+_retention_service: RetentionService | None = None
+
+
+def get_retention_service() -> RetentionService:
+    """Get the global retention service instance."""
+    global _retention_service
+    if _retention_service is None:
+        _retention_service = RetentionService()
+    return _retention_service
@@ -0,0 +1,150 @@
+"""Startup warm-up of engines and metadata for registered databases."""
+
+import asyncio
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..core.constants import Database
+from ..core.logging import get_logger
+from .db_service import DatabaseService
+from .metadata_service import MetadataService
+
+
+class WarmupService:
+    """Service that pre-builds connection pools and metadata caches.
+
+    Without warm-up the first request to each database after a deploy pays
+    for engine construction, the initial connect and a full metadata crawl.
+    The service tracks its own progress so readiness can be reported
+    separately from liveness.
+    """
+
+    def __init__(self, concurrency: int = Database.WARMUP_CONCURRENCY) -> None:
+        """Initialize the warm-up service.
+
+        Args:
+            concurrency: Maximum number of databases warmed up at once.
+        """
+        self.logger = get_logger(__name__)
+        self.concurrency = concurrency
+        self._task: asyncio.Task[None] | None = None
+        self._ready = False
+        self._started_at: datetime | None = None
+        self._finished_at: datetime | None = None
+        self._total = 0
+        self._warmed = 0
+        self._failed: list[str] = []
+
+    @property
+    def ready(self) -> bool:
+        """Whether warm-up has finished (or was skipped)."""
+        return self._ready
+
+    def mark_ready(self) -> None:
+        """Report the application as ready without warming up."""
+        self._ready = True
+
+    async def start(self) -> None:
+        """Start warming up in the background."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.warm_up())
+
+    async def stop(self) -> None:
+        """Cancel a warm-up that is still running."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def warm_up(self) -> None:
+        """Warm up all active databases with a bounded fan-out."""
+        self._started_at = datetime.now()
+        db_service = DatabaseService()
+        metadata_service = MetadataService()
+        try:
+            databases = await db_service.list_databases()
+            self._total = len(databases)
+            self.logger.info("warmup_started", databases=self._total)
+
+            semaphore = asyncio.Semaphore(self.concurrency)
+
+            async def warm(name: str) -> None:
+                async with semaphore:
+                    try:
+                        await asyncio.wait_for(
+                            self._warm_database(db_service, metadata_service, name),
+                            timeout=Database.WARMUP_TIMEOUT,
+                        )
+                        self._warmed += 1
+                    except Exception as e:
+                        # A broken database must not keep the application unready
+                        self._failed.append(name)
+                        self.logger.warning("warmup_database_failed", database=name, error=str(e))
+
+            await asyncio.gather(*(warm(database.name) for database in databases))
+        except Exception as e:
+            self.logger.error("warmup_error", error=str(e))
+        finally:
+            self._finished_at = datetime.now()
+            self._ready = True
+            self.logger.info(
+                "warmup_completed",
+                warmed=self._warmed,
+                failed=len(self._failed),
+                duration_ms=int((self._finished_at - self._started_at).total_seconds() * 1000),
+            )
+
+    async def _warm_database(
+        self, db_service: DatabaseService, metadata_service: MetadataService, name: str
+    ) -> None:
+        """Open a pooled connection and load the metadata cache for a database.
+
+        Args:
+            db_service: The database service.
+            metadata_service: The metadata service.
+            name: The database name.
+        """
+        database = await db_service.get_database_by_name(name)
+        connection_url = await db_service.get_connection_url_with_driver(name)
+        engine = db_service.get_query_engine(database.id, connection_url, database)
+
+        await self._connect(engine)
+        await metadata_service.fetch_metadata(database, engine)
+        self.logger.debug("warmup_database_done", database=name)
+
+    @staticmethod
+    async def _connect(engine: Engine | AsyncEngine) -> None:
+        """Check out and return one connection so the pool holds a live one.
+
+        Args:
+            engine: The engine to warm.
+        """
+        if isinstance(engine, AsyncEngine):
+            async with engine.connect():
+                return
+
+        def connect() -> None:
+            with engine.connect():
+                pass
+
+        await asyncio.get_running_loop().run_in_executor(None, connect)
+
+    def get_status(self) -> dict[str, Any]:
+        """Get the readiness status.
+
+        Returns:
+            Dictionary with readiness and warm-up progress.
+        """
+        return {
+            "status": "ready" if self._ready else "warming_up",
+            "databases": self._total,
+            "warmed": self._warmed,
+            "failed": list(self._failed),
+            "started_at": self._started_at.isoformat() if self._started_at else None,
+            "finished_at": self._finished_at.isoformat() if self._finished_at else None,
+        }
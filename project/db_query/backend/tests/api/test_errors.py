@@ -44,3 +44,14 @@ def test_handle_generic_exception() -> None:
     error = ValueError("Some error")
     response = handle_api_error(error)
     assert response is not None
+
+
+@pytest.mark.unit
+def test_handle_admission_rejected() -> None:
+    """Test that admission rejections become 429 with Retry-After."""
+    from src.core.admission import AdmissionRejectedError
+
+    response = handle_api_error(AdmissionRejectedError("prod", "queue full", retry_after=3))
+    assert response.status_code == 429
+    assert response.headers == {"Retry-After": "3"}
+    assert response.detail["code"] == ErrorCode.DATABASE_OVERLOADED
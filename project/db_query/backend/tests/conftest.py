@@ -10,6 +10,7 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 import sqlalchemy
 from sqlalchemy import Engine, create_engine, text
+from sqlalchemy.pool import StaticPool
 
 # Set test environment variables before importing any application code
 os.environ["ZAI_API_KEY"] = "test_api_key"
@@ -46,12 +47,18 @@ async def temp_db_path() -> AsyncIterator[Path]:
 def mock_engine() -> Engine:
     """Create a mock SQLAlchemy engine for testing.
 
-    Each test gets its own in-memory database to avoid table conflicts.
+    Each test gets its own in-memory database to avoid table conflicts. It
+    is one connection shared by all threads, as sync engines are used from
+    worker threads.
 
     Returns:
         A mock engine with test tables.
     """
-    engine = create_engine("sqlite:///:memory:")
+    engine = create_engine(
+        "sqlite:///:memory:",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
 
     return engine
 
@@ -70,6 +77,13 @@ def mock_database() -> MagicMock:
     db.db_type = "sqlite"
     db.metadata_updated_at = None
     db.metadata_json = None
+    # Per-database tuning left at defaults
+    db.executor_workers = None
+    db.executor_queue_size = None
+    db.max_concurrent_queries = None
+    db.admission_queue_size = None
+    db.admission_max_wait = None
+    db.result_cache_ttl = None
     return db
 
 
@@ -83,13 +97,18 @@ async def initialize_test_db(temp_db_path: Path) -> AsyncIterator[None]:
         None
     """
     from src.core import sqlite_db
+    from src.core.result_cache import get_result_cache
     from src.core.sqlite_db import SQLiteDB
+    from src.services.db_service import get_descriptor_cache
 
     # Set DB_PATH for this test
     os.environ["DB_PATH"] = str(temp_db_path)
 
     # Reset global database instance to use temp path
     sqlite_db._db = SQLiteDB(db_path=temp_db_path)
+    # Cached descriptors and results belong to the previous test's database
+    get_descriptor_cache().clear()
+    get_result_cache().clear()
 
     # Initialize database schema
     db = sqlite_db.get_db()
@@ -97,6 +116,8 @@ async def initialize_test_db(temp_db_path: Path) -> AsyncIterator[None]:
 
     yield
 
+    await db.close()
+
     # Cleanup is handled by temp_db_path fixture
 
 
@@ -0,0 +1,78 @@
+"""Unit tests for per-database admission control."""
+
+import asyncio
+
+import pytest
+
+from src.core.admission import AdmissionController, AdmissionControllers, AdmissionRejectedError
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+class TestAdmissionController:
+    """Test suite for AdmissionController."""
+
+    async def test_waiters_admitted_in_fifo_order(self) -> None:
+        """Test that queued queries are admitted in arrival order."""
+        controller = AdmissionController("db", max_concurrent=1, max_queue=10, max_wait=5)
+        order: list[int] = []
+        release = asyncio.Event()
+
+        async def query(n: int) -> None:
+            async with controller.slot():
+                order.append(n)
+                await release.wait()
+
+        first = asyncio.create_task(query(0))
+        await asyncio.sleep(0)
+        waiting = [asyncio.create_task(query(n)) for n in range(1, 4)]
+        await asyncio.sleep(0)
+        assert controller.stats()["queue_depth"] == 3
+
+        release.set()
+        await asyncio.gather(first, *waiting)
+
+        assert order == [0, 1, 2, 3]
+        stats = controller.stats()
+        assert stats["active"] == 0
+        assert stats["admitted"] == 4
+
+    async def test_rejects_when_queue_full(self) -> None:
+        """Test that a full queue rejects immediately with a retry hint."""
+        controller = AdmissionController("db", max_concurrent=1, max_queue=0, max_wait=5)
+
+        async with controller.slot():
+            with pytest.raises(AdmissionRejectedError) as exc_info:
+                async with controller.slot():
+                    pass
+
+        assert exc_info.value.retry_after >= 1
+        assert controller.stats()["rejected"] == 1
+        assert controller.stats()["active"] == 0
+
+    async def test_rejects_after_wait_budget(self) -> None:
+        """Test that a query waiting longer than the budget is rejected."""
+        controller = AdmissionController("db", max_concurrent=1, max_queue=5, max_wait=0.05)
+
+        async with controller.slot():
+            with pytest.raises(AdmissionRejectedError, match="no slot"):
+                async with controller.slot():
+                    pass
+            assert controller.stats()["queue_depth"] == 0
+
+        # The slot is free again once the holder leaves
+        async with controller.slot():
+            assert controller.stats()["active"] == 1
+
+
+@pytest.mark.unit
+def test_controller_replaced_when_limits_change() -> None:
+    """Test that per-database limit changes take effect."""
+    controllers = AdmissionControllers()
+
+    first = controllers.get(1, "db", max_concurrent=2)
+    assert controllers.get(1, "db", max_concurrent=2) is first
+    assert controllers.get(1, "db", max_concurrent=3).max_concurrent == 3
+
+    controllers.remove(1)
+    assert controllers.stats() == []
@@ -0,0 +1,70 @@
+"""Unit tests for the shared engine registry."""
+
+import pytest
+
+from src.core.engine_registry import EngineRegistry
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+class TestEngineRegistry:
+    """Test suite for EngineRegistry."""
+
+    async def test_engine_reused_across_lookups(self) -> None:
+        """Test that the same engine is returned for repeated lookups."""
+        registry = EngineRegistry()
+
+        first = registry.get_engine(1, "sqlite:///:memory:")
+        second = registry.get_engine(1, "sqlite:///:memory:")
+
+        assert first is second
+        assert len(registry) == 1
+        await registry.close()
+
+    async def test_engine_rebuilt_when_url_changes(self) -> None:
+        """Test that a URL change replaces the registered engine."""
+        registry = EngineRegistry()
+
+        first = registry.get_engine(1, "sqlite:///:memory:")
+        second = registry.get_engine(1, "sqlite:///other.db")
+
+        assert first is not second
+        assert str(second.url) == "sqlite:///other.db"
+        await registry.close()
+
+    async def test_lru_eviction(self) -> None:
+        """Test that the least recently used engine is evicted."""
+        registry = EngineRegistry(max_engines=2)
+
+        registry.get_engine(1, "sqlite:///:memory:")
+        registry.get_engine(2, "sqlite:///:memory:")
+        # Touch engine 1 so engine 2 becomes the eviction candidate
+        registry.get_engine(1, "sqlite:///:memory:")
+        registry.get_engine(3, "sqlite:///:memory:")
+
+        assert 1 in registry
+        assert 2 not in registry
+        assert 3 in registry
+        await registry.close()
+
+    async def test_dispose_idle(self) -> None:
+        """Test that idle engines are disposed."""
+        registry = EngineRegistry(idle_timeout=0)
+
+        registry.get_engine(1, "sqlite:///:memory:")
+
+        assert registry.dispose_idle() == 1
+        assert 1 not in registry
+
+    async def test_dispose_and_close(self) -> None:
+        """Test explicit disposal and shutdown."""
+        registry = EngineRegistry()
+        registry.get_engine(1, "sqlite:///:memory:")
+        registry.get_engine(2, "sqlite:///:memory:")
+        await registry.start()
+
+        registry.dispose(1)
+        assert 1 not in registry
+
+        await registry.close()
+        assert len(registry) == 0
@@ -0,0 +1,128 @@
+"""Unit tests for query history rollups and latency percentiles."""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.core.latency_sketch import LatencySketch
+from src.core.sqlite_db import get_db
+from src.services.history_writer import HistoryWriter
+from src.services.metrics_service import MetricsService
+
+
+def _record(database_id: int, name: str, elapsed: int | None, status: str = "success") -> dict:
+    """Build a query history record."""
+    return {
+        "database_id": database_id,
+        "database_name": name,
+        "query_type": "sql",
+        "input_text": "SELECT 1",
+        "executed_sql": "SELECT 1",
+        "row_count": 2,
+        "execution_time_ms": elapsed,
+        "status": status,
+        "error_message": None,
+        "created_at": datetime.now(),
+    }
+
+
+@pytest.mark.unit
+class TestLatencySketch:
+    """Test suite for LatencySketch."""
+
+    def test_quantiles_within_relative_accuracy(self) -> None:
+        """Test that estimates stay within the configured relative error."""
+        values = sorted(random.Random(7).lognormvariate(4, 1.5) for _ in range(10_000))
+        sketch = LatencySketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        for q in (0.5, 0.95, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            assert sketch.quantile(q) == pytest.approx(exact, rel=0.011)
+
+    def test_merge_equals_single_sketch(self) -> None:
+        """Test that merged sketches match one sketch over all values."""
+        whole, first, second = LatencySketch(), LatencySketch(), LatencySketch()
+        for value in range(0, 2000, 3):
+            whole.add(value)
+            (first if value % 2 else second).add(value)
+
+        first.merge(LatencySketch.from_json(second.to_json()))
+
+        assert first.count == whole.count
+        for q in (0.0, 0.5, 0.99, 1.0):
+            assert first.quantile(q) == whole.quantile(q)
+        assert LatencySketch().quantile(0.5) is None
+        with pytest.raises(ValueError, match="different accuracies"):
+            first.merge(LatencySketch(relative_accuracy=0.05))
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+class TestHistoryRollups:
+    """Test suite for rollup maintenance and the statistics read from it."""
+
+    @pytest.fixture(autouse=True)
+    async def database_rows(self) -> None:
+        """Insert the databases the history records refer to."""
+        for database_id, name in ((1, "alpha"), (2, "beta")):
+            await get_db().execute(
+                "INSERT INTO databases (id, name, url, db_type) "
+                "VALUES (:id, :name, 'sqlite://', 'sqlite')",
+                {"id": database_id, "name": name},
+            )
+
+    async def test_stats_and_percentiles_from_rollups(self) -> None:
+        """Test that written history is summarized per database and hour."""
+        writer = HistoryWriter(batch_size=25)
+        for elapsed in range(1, 101):
+            writer.submit(_record(1, "alpha", elapsed * 20))
+        writer.submit(_record(1, "alpha", None, status="error"))
+        writer.submit(_record(2, "beta", 5))
+        await writer.flush()
+
+        service = MetricsService()
+        stats = await service.get_query_performance_stats(database_name="alpha")
+
+        assert stats["total_queries"] == 101
+        assert stats["failed_queries"] == 1
+        assert stats["min_execution_time_ms"] == 20
+        assert stats["max_execution_time_ms"] == 2000
+        assert stats["avg_execution_time_ms"] == 1010
+        assert stats["slow_queries"] == 51
+        assert stats["total_rows"] == 202
+        assert stats["p50_execution_time_ms"] == pytest.approx(1000, rel=0.03)
+        assert stats["p99_execution_time_ms"] == pytest.approx(1980, rel=0.02)
+
+        # One rollup row per database and hour, however many queries ran
+        rows = await get_db().fetch_all("SELECT database_name FROM query_history_rollups")
+        assert sorted(row["database_name"] for row in rows) == ["alpha", "beta"]
+
+        by_database = await service.get_query_performance_by_database()
+        assert [s["database_name"] for s in by_database] == ["alpha", "beta"]
+        assert by_database[1]["p95_execution_time_ms"] == pytest.approx(5, rel=0.02)
+
+        overall = await service.get_query_performance_stats()
+        assert overall["total_queries"] == 102
+
+    async def test_rollups_outlive_history_but_not_database(self) -> None:
+        """Test that rollups survive history deletion and expire with retention."""
+        writer = HistoryWriter()
+        writer.submit(_record(1, "alpha", 10))
+        old = _record(1, "alpha", 10)
+        old["created_at"] = datetime.now() - timedelta(days=40)
+        writer.submit(old)
+        await writer.flush()
+
+        service = MetricsService()
+        await get_db().execute("DELETE FROM query_history")
+        assert (await service.get_query_performance_stats("alpha", hours=720))["total_queries"] == 1
+
+        await service.cleanup_old_metrics(days=30)
+        rows = await get_db().fetch_all("SELECT bucket_start FROM query_history_rollups")
+        assert len(rows) == 1
+
+        await get_db().execute("DELETE FROM databases WHERE name = 'alpha'")
+        assert (await service.get_query_performance_stats("alpha"))["total_queries"] == 0
@@ -0,0 +1,96 @@
+"""Unit tests for the write-behind history writer."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from src.core.sqlite_db import get_db
+from src.services.history_writer import HistoryWriter
+
+
+def _record(database_id: int = 1, text: str = "SELECT 1") -> dict:
+    """Build a query history record."""
+    return {
+        "database_id": database_id,
+        "database_name": "test_db",
+        "query_type": "sql",
+        "input_text": text,
+        "executed_sql": text,
+        "row_count": 1,
+        "execution_time_ms": 1,
+        "status": "success",
+        "error_message": None,
+        "created_at": datetime.now(),
+    }
+
+
+async def _history_count() -> int:
+    """Count the rows in query_history."""
+    row = await get_db().fetch_one("SELECT COUNT(*) AS count FROM query_history")
+    return row["count"] if row else 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+class TestHistoryWriter:
+    """Test suite for HistoryWriter."""
+
+    @pytest.fixture(autouse=True)
+    async def database_row(self) -> None:
+        """Insert the database the history records refer to."""
+        await get_db().execute(
+            "INSERT INTO databases (id, name, url, db_type) "
+            "VALUES (1, 'test_db', 'sqlite://', 'sqlite')"
+        )
+
+    async def test_submit_is_buffered_until_flush(self) -> None:
+        """Test that records are written in a batch on flush."""
+        writer = HistoryWriter(batch_size=2)
+        for n in range(5):
+            writer.submit(_record(text=f"SELECT {n}"))
+
+        assert await _history_count() == 0
+        assert await writer.flush() == 5
+        assert await _history_count() == 5
+        assert writer.stats()["written"] == 5
+
+    async def test_overflow_policies(self) -> None:
+        """Test that a full buffer drops the oldest or the newest record."""
+        oldest = HistoryWriter(max_queue=2)
+        newest = HistoryWriter(max_queue=2, overflow_policy="drop_newest")
+        for n in range(3):
+            oldest.submit(_record(text=f"SELECT {n}"))
+            newest.submit(_record(text=f"SELECT {n}"))
+
+        assert [r["input_text"] for r in oldest._buffer] == ["SELECT 1", "SELECT 2"]
+        assert [r["input_text"] for r in newest._buffer] == ["SELECT 0", "SELECT 1"]
+        assert oldest.stats()["dropped"] == newest.stats()["dropped"] == 1
+
+    async def test_background_flush_and_stop(self) -> None:
+        """Test that the background task flushes by size and stop drains the rest."""
+        writer = HistoryWriter(batch_size=2, flush_interval=60)
+        await writer.start()
+        writer.submit(_record())
+        writer.submit(_record())
+        for _ in range(50):
+            if await _history_count() == 2:
+                break
+            await asyncio.sleep(0.01)
+        assert await _history_count() == 2
+
+        writer.submit(_record())
+        await writer.stop()
+        assert await _history_count() == 3
+        assert not writer.running
+
+    async def test_bad_record_does_not_drop_batch(self) -> None:
+        """Test that one failing record only loses itself."""
+        writer = HistoryWriter()
+        writer.submit(_record())
+        writer.submit(_record(database_id=999))  # violates the foreign key
+        writer.submit(_record())
+
+        assert await writer.flush() == 2
+        assert writer.stats()["failed"] == 1
+        assert await _history_count() == 2
@@ -1,7 +1,10 @@
 """Unit tests for MetadataService."""
 
+from pathlib import Path
+from unittest.mock import MagicMock
+
 import pytest
-from sqlalchemy import create_engine, text
+from sqlalchemy import Engine, create_engine, text
 
 from src.services.metadata_service import MetadataService
 from tests.test_utils import DatabaseTestHelper
@@ -263,3 +266,64 @@ class TestMetadataService:
         assert metadata.database_name == "test_db"
         assert len(metadata.tables) == 0
         assert len(metadata.views) == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+class TestMetadataConnectionReuse:
+    """Regression tests for pooled engine reuse on metadata requests."""
+
+    async def test_repeated_metadata_requests_reuse_pool(
+        self, mock_database: MagicMock, temp_db_path: Path, initialize_test_db: None
+    ) -> None:
+        """Test that N metadata requests open at most pool-size connections."""
+        from sqlalchemy import event
+
+        from src.services.db_service import DatabaseService
+
+        target_path = temp_db_path.with_name(temp_db_path.stem + "_target.db")
+        url = f"sqlite:///{target_path}"
+        db_service = DatabaseService()
+        service = MetadataService()
+
+        engine = db_service.get_engine(mock_database.id, url)
+        connects: list[object] = []
+        event.listen(engine, "connect", lambda dbapi_conn, record: connects.append(dbapi_conn))
+
+        with engine.connect() as conn:
+            conn.execute(text("CREATE TABLE reuse_test (id INTEGER PRIMARY KEY)"))
+            conn.commit()
+
+        try:
+            for _ in range(20):
+                pooled = db_service.get_engine(mock_database.id, url)
+                assert pooled is engine
+                await service.fetch_metadata(mock_database, pooled, force_refresh=True)
+
+            assert len(connects) <= engine.pool.size()
+        finally:
+            db_service.engines.dispose(mock_database.id)
+            target_path.unlink(missing_ok=True)
+
+    async def test_fetch_metadata_with_async_engine(
+        self, mock_database: MagicMock, temp_db_path: Path, initialize_test_db: None
+    ) -> None:
+        """Test that metadata is crawled natively on an async engine."""
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        target_path = temp_db_path.with_name(temp_db_path.stem + "_async.db")
+        engine = create_async_engine(f"sqlite+aiosqlite:///{target_path}")
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE async_users (id INTEGER PRIMARY KEY, name TEXT)"))
+            await conn.execute(text("CREATE VIEW async_names AS SELECT name FROM async_users"))
+
+        try:
+            service = MetadataService()
+            metadata = await service.fetch_metadata(mock_database, engine, force_refresh=True)
+
+            assert [t.name for t in metadata.tables] == ["async_users"]
+            assert metadata.tables[0].columns[0].is_primary_key is True
+            assert [v.name for v in metadata.views] == ["async_names"]
+        finally:
+            await engine.dispose()
+            target_path.unlink(missing_ok=True)
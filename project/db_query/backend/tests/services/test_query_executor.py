@@ -0,0 +1,70 @@
+"""Unit tests for the per-database query executors."""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.core.query_executor import BoundedExecutor, ExecutorSaturatedError, QueryExecutors
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+class TestBoundedExecutor:
+    """Test suite for BoundedExecutor."""
+
+    async def test_run_returns_result(self) -> None:
+        """Test that a function runs on the executor and its result is returned."""
+        executor = BoundedExecutor("test", max_workers=2, max_queue=4)
+
+        assert await executor.run(lambda x, y: x + y, 2, 3) == 5
+
+        stats = executor.stats()
+        assert stats["completed"] == 1
+        assert stats["active_workers"] == 0
+        assert stats["queue_depth"] == 0
+        executor.shutdown()
+
+    async def test_rejects_when_queue_full(self) -> None:
+        """Test that work is rejected once the wait queue is full."""
+        executor = BoundedExecutor("busy", max_workers=1, max_queue=1)
+        release = threading.Event()
+
+        running = asyncio.create_task(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        queued = asyncio.create_task(executor.run(lambda: "queued"))
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run(lambda: "rejected")
+
+        stats = executor.stats()
+        assert stats["active_workers"] == 1
+        assert stats["queue_depth"] == 1
+        assert stats["rejected"] == 1
+
+        release.set()
+        assert await running is True
+        assert await queued == "queued"
+        assert executor.stats()["max_wait_ms"] > 0
+        executor.shutdown()
+
+
+@pytest.mark.unit
+class TestQueryExecutors:
+    """Test suite for the QueryExecutors registry."""
+
+    def test_executor_reused_and_resized(self) -> None:
+        """Test that executors are reused until their settings change."""
+        executors = QueryExecutors()
+
+        first = executors.get(1, "db", max_workers=2, max_queue=4)
+        assert executors.get(1, "db", max_workers=2, max_queue=4) is first
+
+        resized = executors.get(1, "db", max_workers=3, max_queue=4)
+        assert resized is not first
+        assert resized.max_workers == 3
+
+        assert [s["database_name"] for s in executors.stats()] == ["db"]
+        executors.shutdown_all()
+        assert executors.stats() == []
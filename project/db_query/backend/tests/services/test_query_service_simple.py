@@ -86,3 +86,359 @@ class TestQueryServiceSimple:
         count = await service.clear_query_history("nonexistent_db")
 
         assert count == 0
+
+    async def test_execute_query_with_async_engine(self, mock_database, temp_db_path) -> None:
+        """Test that queries run natively on an async engine."""
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        from src.core.sqlite_db import get_db
+
+        await get_db().execute(
+            "INSERT INTO databases (id, name, url, db_type) VALUES (1, 'test_db', 'sqlite://', 'sqlite')"
+        )
+        target_path = temp_db_path.with_name(temp_db_path.stem + "_target.db")
+        engine = create_async_engine(f"sqlite+aiosqlite:///{target_path}")
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+            await conn.execute(text("INSERT INTO items VALUES (1, 'a'), (2, 'b')"))
+
+        try:
+            service = QueryService()
+            response = await service.execute_query(
+                mock_database, engine, "SELECT id, name FROM items ORDER BY id"
+            )
+
+            assert response.row_count == 2
+            assert response.rows == [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+        finally:
+            await engine.dispose()
+            target_path.unlink(missing_ok=True)
+
+    async def test_timeout_interrupts_sqlite_query(self, temp_db_path) -> None:
+        """Test that a timed-out query is interrupted and its connection released."""
+        import asyncio
+        import time
+
+        target_path = temp_db_path.with_name(temp_db_path.stem + "_slow.db")
+        engine = create_engine(f"sqlite:///{target_path}")
+        slow_sql = (
+            "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 1000000000) "
+            "SELECT count(*) FROM n"
+        )
+
+        try:
+            service = QueryService()
+            started = time.monotonic()
+            with pytest.raises(TimeoutError):
+                await asyncio.wait_for(
+                    service._execute_with_engine(engine, slow_sql, timeout=0.2), timeout=0.2
+                )
+
+            # The interrupted worker returns its connection to the pool promptly
+            for _ in range(100):
+                if engine.pool.checkedout() == 0:
+                    break
+                await asyncio.sleep(0.02)
+            assert engine.pool.checkedout() == 0
+            assert time.monotonic() - started < 3
+
+            # The pooled connection is still usable afterwards
+            assert await service._execute_with_engine(engine, "SELECT 1") == [(1,)]
+        finally:
+            engine.dispose()
+            target_path.unlink(missing_ok=True)
+
+    async def test_cancel_before_start(self) -> None:
+        """Test that a query cancelled before it starts never executes."""
+        from src.core.query_cancel import QueryCancelHandle, QueryCancelledError
+
+        engine = create_engine("sqlite://")
+        handle = QueryCancelHandle(engine)
+
+        assert handle.cancel() is False
+        assert handle.cancelled
+        with pytest.raises(QueryCancelledError):
+            QueryService()._sync_execute(engine, "SELECT 1", handle)
+        engine.dispose()
+
+    async def test_history_keyset_pagination_and_count(self) -> None:
+        """Test cursor pages walk the history and the count is maintained."""
+        from src.core.sqlite_db import get_db
+
+        db = get_db()
+        await db.execute(
+            "INSERT INTO databases (id, name, url, db_type) VALUES (1, 'test_db', 'sqlite://', 'sqlite')"
+        )
+        # Equal timestamps make the ID the tie-breaker
+        for n in range(5):
+            await db.execute(
+                "INSERT INTO query_history (database_id, database_name, query_type, input_text, "
+                "executed_sql, status, created_at) VALUES (1, 'test_db', 'sql', :text, :text, "
+                "'success', '2026-01-01 00:00:00')",
+                {"text": f"SELECT {n}"},
+            )
+
+        service = QueryService()
+        seen: list[str] = []
+        cursor = None
+        while True:
+            items, cursor = await service.get_query_history_page("test_db", 2, cursor=cursor)
+            seen.extend(item.input_text for item in items)
+            if cursor is None:
+                break
+
+        assert seen == [f"SELECT {n}" for n in reversed(range(5))]
+        assert await service.get_query_history_count("test_db") == 5
+
+        await service.delete_query_history_item(1)
+        assert await service.get_query_history_count("test_db") == 4
+
+        # Deleting the database cascades to its history and the counter follows
+        await db.execute("DELETE FROM databases WHERE id = 1")
+        assert await service.get_query_history_count("test_db") == 0
+
+        with pytest.raises(ValueError, match="Invalid history cursor"):
+            await service.get_query_history_page("test_db", 2, cursor="not-a-cursor")
+
+    async def test_search_query_history(self) -> None:
+        """Test ranked full-text history search with prefixes and filters."""
+        from src.core.sqlite_db import get_db
+
+        db = get_db()
+        await db.execute(
+            "INSERT INTO databases (id, name, url, db_type) VALUES (1, 'test_db', 'sqlite://', 'sqlite')"
+        )
+        rows = [
+            ("top customers by revenue", "SELECT * FROM order_items", "success", 900),
+            ("list users", "SELECT * FROM users", "success", 5),
+            ("revenue per month", "SELECT month FROM orders", "error", 40),
+            ("daily totals", "SELECT revenue FROM totals", "success", 3),
+        ]
+        # Unrelated items so that the search words are rare enough to rank on
+        rows += [(f"count rows {n}", f"SELECT COUNT(*) FROM t{n}", "success", 1) for n in range(5)]
+        for input_text, sql, status, elapsed in rows:
+            await db.execute(
+                "INSERT INTO query_history (database_id, database_name, query_type, input_text, "
+                "executed_sql, execution_time_ms, status) VALUES (1, 'test_db', 'natural', "
+                ":input_text, :sql, :elapsed, :status)",
+                {"input_text": input_text, "sql": sql, "elapsed": elapsed, "status": status},
+            )
+
+        service = QueryService()
+
+        hits = await service.search_query_history("test_db", "revenue")
+        # Matches in the input text rank above matches in the SQL only
+        assert len(hits) == 3
+        assert hits[-1].input_text == "daily totals"
+        assert hits[0].score > hits[-1].score > 0
+
+        # Prefix matching keeps identifiers with underscores whole
+        hits = await service.search_query_history("test_db", "order_it")
+        assert [hit.input_text for hit in hits] == ["top customers by revenue"]
+        assert await service.search_query_history("test_db", "order_it", prefix=False) == []
+
+        hits = await service.search_query_history(
+            "test_db", "revenue", status="success", min_execution_time_ms=100
+        )
+        assert [hit.input_text for hit in hits] == ["top customers by revenue"]
+
+        # Deleted items leave the index
+        await db.execute("DELETE FROM query_history WHERE input_text = 'list users'")
+        assert await service.search_query_history("test_db", "users") == []
+
+        # FTS syntax in the query is treated as plain words
+        hits = await service.search_query_history("test_db", 'totals" OR "users')
+        assert hits == []
+
+        with pytest.raises(ValueError, match="at least one word"):
+            await service.search_query_history("test_db", '"*"')
+
+    async def test_stream_query_in_batches(self, mock_database, temp_db_path) -> None:
+        """Test that a streamed query yields a header, row batches and an end frame."""
+        from src.core.sql_parser import SQLValidationError
+        from src.core.sqlite_db import get_db
+
+        await get_db().execute(
+            "INSERT INTO databases (id, name, url, db_type) VALUES (1, 'test_db', 'sqlite://', 'sqlite')"
+        )
+        target_path = temp_db_path.with_name(temp_db_path.stem + "_stream.db")
+        engine = create_engine(f"sqlite:///{target_path}")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+            conn.execute(
+                text("INSERT INTO items VALUES (:id, :name)"),
+                [{"id": i, "name": f"item {i}"} for i in range(2500)],
+            )
+
+        try:
+            service = QueryService()
+            frames = [
+                frame
+                async for frame in service.stream_query(
+                    mock_database, engine, "SELECT id, name FROM items ORDER BY id", batch_size=1000
+                )
+            ]
+
+            header, *batches, end = frames
+            assert header["type"] == "header"
+            assert [c["name"] for c in header["columns"]] == ["id", "name"]
+            assert header["columns"][0]["dataType"] == "INTEGER"
+            assert [len(batch["rows"]) for batch in batches] == [1000, 1000, 500]
+            assert batches[-1]["rows"][-1] == [2499, "item 2499"]
+            assert end["type"] == "end"
+            assert end["rowCount"] == 2500
+            assert engine.pool.checkedout() == 0
+
+            history = await service.get_query_history("test_db")
+            assert history[0].row_count == 2500
+
+            # Validation fails before anything is streamed
+            with pytest.raises(SQLValidationError, match="Only SELECT"):
+                await anext(service.stream_query(mock_database, engine, "DELETE FROM items"))
+        finally:
+            engine.dispose()
+            target_path.unlink(missing_ok=True)
+
+    async def test_execute_query_columnar(self, mock_database, temp_db_path) -> None:
+        """Test that a columnar response holds one value list per column."""
+        from datetime import date
+
+        from src.core.sqlite_db import get_db
+
+        await get_db().execute(
+            "INSERT INTO databases (id, name, url, db_type) VALUES (1, 'test_db', 'sqlite://', 'sqlite')"
+        )
+        service = QueryService()
+        columns, values = service._serialize_columns([(1, date(2024, 1, 2)), (2, None)])
+        assert [c.data_type for c in columns] == ["INTEGER", "DATE"]
+        assert values == [[1, 2], ["2024-01-02", None]]
+
+        target_path = temp_db_path.with_name(temp_db_path.stem + "_columnar.db")
+        engine = create_engine(f"sqlite:///{target_path}")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+            conn.execute(text("INSERT INTO items VALUES (1, 'a'), (2, 'b')"))
+
+        try:
+            response = await service.execute_query_columnar(
+                mock_database, engine, "SELECT id, name FROM items ORDER BY id"
+            )
+
+            assert response.row_count == 2
+            assert [c.name for c in response.columns] == ["id", "name"]
+            assert response.values == [[1, 2], ["a", "b"]]
+            assert response.limit_value == 1000
+            assert "values" in response.model_dump(by_alias=True)
+        finally:
+            engine.dispose()
+            target_path.unlink(missing_ok=True)
+
+    async def test_stream_query_arrow(self, mock_database, temp_db_path) -> None:
+        """Test that a result streamed as Arrow has its columns' declared types."""
+        pa = pytest.importorskip("pyarrow")
+        from decimal import Decimal
+
+        from src.core.sqlite_db import get_db
+
+        await get_db().execute(
+            "INSERT INTO databases (id, name, url, db_type) VALUES (1, 'test_db', 'sqlite://', 'sqlite')"
+        )
+        target_path = temp_db_path.with_name(temp_db_path.stem + "_arrow.db")
+        engine = create_engine(f"sqlite:///{target_path}")
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "CREATE TABLE items (id INTEGER, price DECIMAL(10, 2), ratio REAL, "
+                    "note TEXT, later INTEGER)"
+                )
+            )
+            conn.execute(
+                text("INSERT INTO items VALUES (:id, :price, :ratio, :note, :later)"),
+                [
+                    {
+                        "id": 2**53 + i,
+                        "price": [9.25, 10.5, 100][i % 3],
+                        "ratio": i / 4,
+                        "note": f"n{i}",
+                        # NULL throughout the first batch
+                        "later": None if i < 10 else i,
+                    }
+                    for i in range(25)
+                ],
+            )
+
+        try:
+            service = QueryService()
+            chunks = [
+                chunk
+                async for chunk in service.stream_query_arrow(
+                    mock_database,
+                    engine,
+                    "SELECT *, id + 1 AS next_id FROM items ORDER BY id",
+                    batch_size=10,
+                )
+            ]
+            table = pa.ipc.open_stream(b"".join(chunks)).read_all()
+
+            assert table.num_rows == 25
+            assert table.schema.field("id").type == pa.int64()
+            # Integers beyond 2**53 are kept exactly
+            assert table.column("id").to_pylist()[:2] == [2**53, 2**53 + 1]
+            assert table.schema.field("price").type == pa.decimal128(10, 2)
+            assert table.column("price").to_pylist()[:3] == [
+                Decimal("9.25"),
+                Decimal("10.50"),
+                Decimal("100.00"),
+            ]
+            assert table.schema.field("ratio").type == pa.float64()
+            assert table.schema.field("note").type == pa.string()
+            assert table.schema.field("later").type == pa.int64()
+            assert table.column("later").to_pylist()[-1] == 24
+            # An expression has no declared type
+            assert table.schema.field("next_id").type == pa.string()
+            history = await service.get_query_history("test_db")
+            assert history[0].row_count == 25
+        finally:
+            engine.dispose()
+            target_path.unlink(missing_ok=True)
+
+    async def test_arrow_types_hold_across_batches(self) -> None:
+        """Test that column types hold for every batch and values are never truncated."""
+        pa = pytest.importorskip("pyarrow")
+        from decimal import Decimal
+
+        from src.core.arrow_stream import ArrowStreamEncoder, description_types
+
+        def encode(encoder: ArrowStreamEncoder, *batches: list[tuple]) -> pa.Table:
+            data = b"".join(encoder.encode(batch) for batch in batches) + encoder.finish()
+            return pa.ipc.open_stream(data).read_all()
+
+        # Types as a PostgreSQL cursor describes them: int8, numeric(12, 3), int4
+        description = [
+            ("id", 20, None, 8, None, None, None),
+            ("amount", 1700, None, None, 12, 3, None),
+            ("later", 23, None, 4, None, None, None),
+        ]
+        column_types = description_types("postgresql", description)
+        table = encode(
+            ArrowStreamEncoder(["id", "amount", "later"], column_types),
+            [(2**53 + 1, Decimal("1.5"), None), (2, None, None)],
+            [(2**62, Decimal("2.25"), 5), (3, Decimal("123456789.125"), None)],
+        )
+        assert table.schema.types == [pa.int64(), pa.decimal128(12, 3), pa.int32()]
+        assert table.column("id").to_pylist() == [2**53 + 1, 2, 2**62, 3]
+        assert table.column("amount").to_pylist() == [
+            Decimal("1.500"),
+            None,
+            Decimal("2.250"),
+            Decimal("123456789.125"),
+        ]
+        assert table.column("later").to_pylist() == [None, None, 5, None]
+
+        # A value that does not fit its column raises instead of being truncated
+        encoder = ArrowStreamEncoder(["n", "amount"], [pa.int64(), pa.decimal128(12, 3)])
+        encoder.encode([(1, Decimal("1.5"))])
+        with pytest.raises(pa.ArrowInvalid):
+            encoder.encode([(1.5, None)])
+        with pytest.raises(pa.ArrowInvalid):
+            encoder.encode([(1, Decimal("1.2345"))])
@@ -0,0 +1,132 @@
+"""Unit tests for the query result cache."""
+
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.core.result_cache import ResultCache, estimate_size
+from src.core.sqlite_db import get_db
+from src.services.query_service import QueryService
+
+
+@pytest.mark.unit
+class TestResultCache:
+    """Test suite for ResultCache."""
+
+    def test_evicts_least_recently_used_within_budget(self) -> None:
+        """Test that the byte budget evicts the least recently used results."""
+        cache = ResultCache(max_bytes=400)
+        for key in ("a", "b", "c", "d"):
+            assert cache.put(key, 1, key.upper(), 100, ttl=60, generation=cache.generation)
+        assert cache.get("a") is not None
+
+        cache.put("e", 1, "E", 100, ttl=60, generation=cache.generation)
+
+        assert cache.get("b") is None
+        assert [cache.get(key) is not None for key in ("a", "c", "d", "e")] == [True] * 4
+        stats = cache.stats()
+        assert stats["bytes"] == 400
+        assert stats["evictions"] == 1
+
+        # One result may not take more than a quarter of the budget
+        assert not cache.put("f", 1, "F", 101, ttl=60, generation=cache.generation)
+
+    def test_expiry_invalidation_and_races(self) -> None:
+        """Test that results expire, are invalidated per database and stale puts are dropped."""
+        cache = ResultCache(max_bytes=1000)
+        cache.put("old", 1, "x", 10, ttl=0.01, generation=cache.generation)
+        cache.put("one", 1, "x", 10, ttl=60, generation=cache.generation)
+        cache.put("two", 2, "x", 10, ttl=60, generation=cache.generation)
+        time.sleep(0.02)
+        assert cache.get("old") is None
+
+        generation = cache.generation
+        assert cache.invalidate(1) == 1
+        assert cache.get("one") is None
+        assert cache.get("two") is not None
+        # A result read before the invalidation finished is not cached
+        assert not cache.put("one", 1, "x", 10, ttl=60, generation=generation)
+
+    def test_estimate_size_scales_samples(self) -> None:
+        """Test that long lists are estimated from a sample."""
+        rows = [{"id": i, "name": "x" * 20} for i in range(1000)]
+        exact = sum(estimate_size(row) for row in rows)
+        assert estimate_size(rows) == pytest.approx(exact, rel=0.05)
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+class TestQueryResultCaching:
+    """Test suite for result caching in QueryService."""
+
+    async def test_identical_queries_served_from_cache(self, mock_database, temp_db_path) -> None:
+        """Test hits, refresh, bypass and the cache key."""
+        await get_db().execute(
+            "INSERT INTO databases (id, name, url, db_type) VALUES (1, 'test_db', 'sqlite://', 'sqlite')"
+        )
+        target_path = temp_db_path.with_name(temp_db_path.stem + "_cached.db")
+        engine = create_engine(f"sqlite:///{target_path}")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+            conn.execute(text("INSERT INTO items VALUES (1, 'a'), (2, 'b')"))
+        mock_database.result_cache_ttl = 60
+        service = QueryService()
+
+        try:
+            first = await service.execute_query(
+                mock_database, engine, "SELECT id, name FROM items", cache="use"
+            )
+            with engine.begin() as conn:
+                conn.execute(text("INSERT INTO items VALUES (3, 'c')"))
+            # Formatting differences do not matter
+            second = await service.execute_query(
+                mock_database, engine, "select id,  name\nFROM items -- again", cache="use"
+            )
+
+            assert first.cache_status == "miss"
+            assert second.cache_status == "hit"
+            assert second.cache_age_ms is not None
+            assert second.rows == first.rows
+            # Only executed queries are recorded
+            assert len(await service.get_query_history("test_db")) == 1
+
+            # A different effective LIMIT or format is a different result
+            limited = await service.execute_query(
+                mock_database, engine, "SELECT id, name FROM items LIMIT 2", cache="use"
+            )
+            assert limited.cache_status == "miss"
+            columnar = await service.execute_query_columnar(
+                mock_database, engine, "SELECT id, name FROM items", cache="use"
+            )
+            assert columnar.cache_status == "miss"
+            assert columnar.row_count == 3
+
+            bypassed = await service.execute_query(
+                mock_database, engine, "SELECT id, name FROM items", cache="bypass"
+            )
+            assert (bypassed.cache_status, bypassed.row_count) == ("bypass", 3)
+            # Bypassing neither reads nor replaces the cached result
+            cached = await service.execute_query(
+                mock_database, engine, "SELECT id, name FROM items", cache="use"
+            )
+            assert (cached.cache_status, cached.row_count) == ("hit", 2)
+
+            refreshed = await service.execute_query(
+                mock_database, engine, "SELECT id, name FROM items", cache="refresh"
+            )
+            assert (refreshed.cache_status, refreshed.row_count) == ("refresh", 3)
+            again = await service.execute_query(
+                mock_database, engine, "SELECT id, name FROM items", cache="use"
+            )
+            assert (again.cache_status, again.row_count) == ("hit", 3)
+
+            # A TTL of 0 turns caching off for the database
+            mock_database.result_cache_ttl = 0
+            off = await service.execute_query(
+                mock_database, engine, "SELECT id, name FROM items", cache="use"
+            )
+            assert off.cache_status == "bypass"
+        finally:
+            engine.dispose()
+            target_path.unlink(missing_ok=True)
@@ -0,0 +1,218 @@
+"""Unit tests for server-side result sets."""
+
+import fcntl
+import json
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.core.result_spool import ResultClosedError, ResultSpool, ResultSpoolFullError
+from src.core.sqlite_db import get_db
+from src.services.query_service import QueryService
+
+
+@pytest.mark.unit
+class TestResultSpool:
+    """Test suite for ResultSpool."""
+
+    def test_rows_spill_to_disk_past_the_memory_budget(self, tmp_path) -> None:
+        """Test that pages read the same before and after spilling."""
+        spool = ResultSpool(ttl=60, memory_budget=4096, directory=tmp_path)
+        result = spool.create(1, "test_db", "SELECT 1")
+        rows = [[i, f"name {i}", None, 1.5] for i in range(300)]
+
+        result.append(rows[:10])
+        assert not result.spilled
+        assert result.read(5, 3) == rows[5:8]
+
+        for start in range(10, 300, 50):
+            result.append(rows[start : start + 50])
+        assert result.spilled
+        assert result.memory_bytes == 0
+        assert result.row_count == 300
+        assert result.read(0, 1000) == rows
+        assert result.read(295, 10) == rows[295:]
+        assert result.read(300, 10) == []
+        assert result.path.exists()
+
+        spool.add(result)
+        assert spool.stats()["disk_bytes"] == result.disk_bytes > 0
+        assert spool.remove(result.handle)
+        assert not result.path.exists()
+        assert spool.stats()["disk_bytes"] == 0
+        # The rows are gone, so reading does not pretend the result is empty
+        with pytest.raises(ResultClosedError):
+            result.read(0, 10)
+
+    def test_results_spill_past_the_total_memory_budget(self, tmp_path) -> None:
+        """Test that a result spills when all results together exceed the budget."""
+        spool = ResultSpool(memory_budget=1 << 20, total_memory_budget=20_000, directory=tmp_path)
+        rows = [[i, f"name {i}"] for i in range(100)]
+        first = spool.create(1, "test_db", "SELECT 1")
+        first.append(rows)
+        spool.add(first)
+        assert not first.spilled
+        assert 0 < spool.stats()["memory_bytes"] <= 20_000
+
+        # Within its own budget, but not within what is left of the total
+        second = spool.create(1, "test_db", "SELECT 2")
+        second.append(rows)
+        second.append(rows)
+        assert second.spilled
+        assert second.read(150, 2) == rows[50:52]
+        assert spool.stats()["memory_bytes"] == first.memory_bytes
+
+        assert spool.remove(first.handle)
+        second.close()
+        assert spool.stats()["memory_bytes"] == 0
+
+    def test_sorting_matches_in_memory_and_on_disk(self, tmp_path) -> None:
+        """Test that re-sorting gives the same order whether or not rows spilled."""
+        rows = [[i, [None, "b", 2.5, "a", 1][i % 5], i % 2 == 0] for i in range(60)]
+        in_memory = ResultSpool(memory_budget=1 << 20, directory=tmp_path).create(1, "db", "")
+        on_disk = ResultSpool(memory_budget=0, directory=tmp_path).create(1, "db", "")
+        for result in (in_memory, on_disk):
+            result.boolean_columns = [2]
+            result.append(rows)
+        assert not in_memory.spilled and on_disk.spilled
+
+        for descending in (False, True):
+            expected = in_memory.read(0, 60, sort=1, descending=descending)
+            assert on_disk.read(0, 60, sort=1, descending=descending) == expected
+            assert on_disk.read(10, 5, sort=1, descending=descending) == expected[10:15]
+        ascending = in_memory.read(0, 60, sort=1)
+        assert [row[1] for row in ascending[:13]] == [None] * 12 + [1]
+        assert ascending[-1][1] == "b"
+        # Booleans come back from disk as booleans, not 0 and 1
+        assert on_disk.read(5, 1) == [[5, None, False]]
+        on_disk.close()
+
+    def test_decimals_sort_by_value(self, tmp_path) -> None:
+        """Test that decimals, kept as text, sort as numbers in memory and on disk."""
+        rows = [["9.25"], ["10.50"], [None], ["100"], ["-1.5"]]
+        in_memory = ResultSpool(memory_budget=1 << 20, directory=tmp_path).create(1, "db", "")
+        on_disk = ResultSpool(memory_budget=0, directory=tmp_path).create(1, "db", "")
+        for result in (in_memory, on_disk):
+            result.numeric_columns = [0]
+            result.append(rows)
+            assert result.read(0, 5, sort=0) == [[None], ["-1.5"], ["9.25"], ["10.50"], ["100"]]
+            assert result.read(0, 2, sort=0, descending=True) == [["100"], ["10.50"]]
+        on_disk.close()
+
+    def test_disk_quota_and_orphaned_files(self, tmp_path) -> None:
+        """Test that spill files are bounded by the quota and orphans are removed."""
+        spool = ResultSpool(memory_budget=0, disk_quota=64 * 1024, directory=tmp_path)
+        result = spool.create(1, "test_db", "SELECT 1")
+        with pytest.raises(ResultSpoolFullError):
+            for start in range(0, 10_000, 500):
+                result.append([[i, "x" * 40] for i in range(start, start + 500)])
+        result.close()
+        assert spool.stats()["disk_bytes"] == 0
+
+        # The directory of an exited process is unlocked; a running one holds its lock
+        orphan, live = tmp_path / "orphan", tmp_path / "live"
+        for directory in (orphan, live):
+            directory.mkdir()
+            (directory / "lock").touch()
+            (directory / "result.sqlite").touch()
+        with open(live / "lock") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            own = spool.create(1, "test_db", "SELECT 1").path.parent
+            assert spool.remove_orphans() == 1
+        assert not orphan.exists()
+        assert live.exists()
+        assert own.exists()
+
+        # Another spool sharing the directory sees this one as running
+        assert ResultSpool(directory=tmp_path).remove_orphans() == 1
+        assert own.exists() and not live.exists()
+
+    def test_results_expire_and_are_bounded(self, tmp_path) -> None:
+        """Test that results expire after the TTL and the oldest is dropped when full."""
+        spool = ResultSpool(ttl=0.05, memory_budget=4096, max_results=2, directory=tmp_path)
+        first, second, third = (spool.create(1, "test_db", "SELECT 1") for _ in range(3))
+        for result in (first, second, third):
+            spool.add(result)
+
+        assert spool.get(first.handle) is None
+        assert spool.get(second.handle) is second
+        time.sleep(0.06)
+        assert spool.get(third.handle) is None
+        assert len(spool) == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+class TestSpooledQueries:
+    """Test suite for paging spooled query results in QueryService."""
+
+    async def test_pages_served_without_rerunning(self, mock_database, temp_db_path) -> None:
+        """Test that all pages of a result come from one execution."""
+        await get_db().execute(
+            "INSERT INTO databases (id, name, url, db_type) VALUES (1, 'test_db', 'sqlite://', 'sqlite')"
+        )
+        target_path = temp_db_path.with_name(temp_db_path.stem + "_spooled.db")
+        engine = create_engine(f"sqlite:///{target_path}")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+            conn.execute(
+                text("INSERT INTO items VALUES (:id, :name)"),
+                [{"id": i, "name": f"item {i}"} for i in range(2500)],
+            )
+        service = QueryService()
+        service.spool = ResultSpool(
+            ttl=60, memory_budget=16 * 1024, directory=temp_db_path.parent / "spool"
+        )
+
+        try:
+            page = await service.spool_query(
+                mock_database, engine, "SELECT id, name FROM items ORDER BY id", page_size=1000
+            )
+            assert page.row_count == 2500
+            assert [c.name for c in page.columns] == ["id", "name"]
+            assert page.rows[0] == {"id": 0, "name": "item 0"}
+            assert service.spool.stats()["spilled_results"] == 1
+
+            ids = [row["id"] for row in page.rows]
+            while page.next_cursor:
+                page = await service.get_result_page(page.handle, page.next_cursor, 1000)
+                ids.extend(row["id"] for row in page.rows)
+            assert ids == list(range(2500))
+            assert page.offset == 2000
+            assert len(await service.get_query_history("test_db")) == 1
+
+            # Re-sorting and exporting read the spool, not the database
+            page = await service.get_result_page(page.handle, None, 3, sort="id", descending=True)
+            assert [row["id"] for row in page.rows] == [2499, 2498, 2497]
+            with pytest.raises(ValueError, match="Invalid sort column"):
+                await service.get_result_page(page.handle, sort="missing")
+
+            chunks = service.export_result(page.handle, "csv", sort="id", descending=True)
+            lines = "".join([chunk async for chunk in chunks]).splitlines()
+            assert lines[:2] == ["id,name", "2499,item 2499"]
+            assert len(lines) == 2501
+            chunks = service.export_result(page.handle, "json")
+            exported = json.loads("".join([chunk async for chunk in chunks]))
+            assert exported["metadata"]["row_count"] == 2500
+            assert exported["rows"][-1] == {"id": 2499, "name": "item 2499"}
+            assert len(await service.get_query_history("test_db")) == 1
+
+            # An export of a result released meanwhile fails rather than ending early
+            chunks = service.export_result(page.handle, "csv")
+            assert (await anext(chunks)).startswith("id,name")
+            service.release_result(page.handle)
+            with pytest.raises(ValueError, match="not found or expired"):
+                await anext(chunks)
+            page = await service.spool_query(
+                mock_database, engine, "SELECT id, name FROM items ORDER BY id"
+            )
+
+            with pytest.raises(ValueError, match="Invalid result cursor"):
+                await service.get_result_page(page.handle, "not-a-cursor")
+            assert service.release_result(page.handle)
+            with pytest.raises(ValueError, match="not found"):
+                await service.get_result_page(page.handle)
+        finally:
+            engine.dispose()
+            target_path.unlink(missing_ok=True)
@@ -0,0 +1,68 @@
+"""Unit tests for the background history retention service."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.core.sqlite_db import get_db
+from src.services.retention_service import RetentionService
+
+
+async def _insert_history(count: int, created_at: datetime) -> None:
+    """Insert history items with a fixed creation time."""
+    await get_db().execute_many(
+        "INSERT INTO query_history (database_id, database_name, query_type, input_text, "
+        "executed_sql, status, created_at) VALUES (1, 'test_db', 'sql', :text, :text, "
+        "'success', :created_at)",
+        [
+            {"text": f"SELECT {n}, '{'x' * 200}'", "created_at": created_at.isoformat(" ")}
+            for n in range(count)
+        ],
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+class TestRetentionService:
+    """Test suite for RetentionService."""
+
+    @pytest.fixture(autouse=True)
+    async def database_row(self) -> None:
+        """Insert the database the history items refer to."""
+        await get_db().execute(
+            "INSERT INTO databases (id, name, url, db_type) "
+            "VALUES (1, 'test_db', 'sqlite://', 'sqlite')"
+        )
+
+    async def test_run_deletes_in_chunks_and_reclaims_space(self) -> None:
+        """Test that expired history is deleted in chunks and the file shrinks."""
+        await _insert_history(2000, datetime.now() - timedelta(days=60))
+        await _insert_history(10, datetime.now())
+
+        service = RetentionService(retention_days=30, chunk_size=100, chunk_pause=0)
+        result = await service.run()
+
+        assert result["deleted_rows"] == 2000
+        assert result["chunks"] > 1
+        assert result["reclaimed_bytes"] > 0
+
+        db = get_db()
+        remaining = await db.fetch_one("SELECT COUNT(*) AS count FROM query_history")
+        assert remaining is not None and remaining["count"] == 10
+        counter = await db.fetch_one("SELECT count FROM query_history_counts")
+        assert counter is not None and counter["count"] == 10
+        free = await db.fetch_one("PRAGMA freelist_count")
+        assert free is not None and free["freelist_count"] == 0
+
+        status = service.get_status()
+        assert status["running"] is False
+        assert status["last_run"] == result
+
+    async def test_run_without_expired_history(self) -> None:
+        """Test that a run with nothing to delete is a single cheap chunk."""
+        await _insert_history(5, datetime.now())
+
+        result = await RetentionService(chunk_pause=0).run(retention_days=1)
+
+        assert result["deleted_rows"] == 0
+        assert result["chunks"] == 1
@@ -0,0 +1,92 @@
+"""Unit tests for coalescing identical concurrent queries."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.core.single_flight import SingleFlight
+from src.core.sqlite_db import get_db
+from src.services.query_service import QueryService
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+class TestSingleFlight:
+    """Test suite for query coalescing."""
+
+    async def test_concurrent_callers_share_one_execution(self) -> None:
+        """Test that callers of a running key share its result or exception."""
+        flight = SingleFlight()
+        release = asyncio.Event()
+        calls = 0
+
+        async def execute() -> int:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return calls
+
+        callers = [asyncio.create_task(flight.run("key", execute)) for _ in range(5)]
+        await asyncio.sleep(0)
+        assert flight.stats()["in_flight"] == 1
+
+        # A caller that goes away does not cancel the execution for the others
+        callers[0].cancel()
+        release.set()
+        results = await asyncio.gather(*callers[1:])
+
+        assert calls == 1
+        assert [shared for _, shared in results] == [True] * 4
+        assert {value for value, _ in results} == {1}
+
+        async def fail() -> int:
+            raise RuntimeError("boom")
+
+        failures = await asyncio.gather(
+            flight.run("key", fail), flight.run("key", fail), return_exceptions=True
+        )
+        assert [str(error) for error in failures] == ["boom", "boom"]
+
+        assert flight.stats() == {
+            "in_flight": 0,
+            "executions": 2,
+            "coalesced": 5,
+            "coalesced_ratio": round(5 / 7, 4),
+        }
+
+    async def test_identical_queries_coalesced(self, mock_database, temp_db_path) -> None:
+        """Test that concurrent identical queries run once unless coalescing is off."""
+        await get_db().execute(
+            "INSERT INTO databases (id, name, url, db_type) VALUES (1, 'test_db', 'sqlite://', 'sqlite')"
+        )
+        target_path = temp_db_path.with_name(temp_db_path.stem + "_coalesced.db")
+        engine = create_engine(f"sqlite:///{target_path}")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+            conn.execute(text("INSERT INTO items VALUES (1, 'a'), (2, 'b')"))
+        service = QueryService()
+        service.in_flight = SingleFlight()
+
+        try:
+            responses = await asyncio.gather(
+                *(
+                    service.execute_query(mock_database, engine, sql, coalesce=True)
+                    for sql in ("SELECT * FROM items", "select *\nfrom items", "SELECT * FROM items")
+                )
+            )
+            assert all(response.rows == responses[0].rows for response in responses)
+            assert service.in_flight.stats()["coalesced"] == 2
+            assert len(await service.get_query_history("test_db")) == 1
+
+            await asyncio.gather(
+                *(
+                    service.execute_query(mock_database, engine, "SELECT * FROM items")
+                    for _ in range(2)
+                )
+            )
+            assert len(await service.get_query_history("test_db")) == 3
+            assert service.in_flight.stats()["executions"] == 1
+        finally:
+            engine.dispose()
+            target_path.unlink(missing_ok=True)
@@ -0,0 +1,119 @@
+"""Unit tests for the pooled internal SQLite store."""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+from src.core.sqlite_db import SQLiteDB
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+class TestSQLiteDB:
+    """Test suite for SQLiteDB connection pooling."""
+
+    async def test_pragmas_applied(self, temp_db_path) -> None:
+        """Test that pooled connections are tuned once on open."""
+        db = SQLiteDB(db_path=temp_db_path)
+        try:
+            assert (await db.fetch_one("PRAGMA journal_mode"))["journal_mode"] == "wal"
+            assert (await db.fetch_one("PRAGMA synchronous"))["synchronous"] == 1
+            assert (await db.fetch_one("PRAGMA foreign_keys"))["foreign_keys"] == 1
+            assert (await db.fetch_one("PRAGMA busy_timeout"))["timeout"] == 5000
+        finally:
+            await db.close()
+
+    async def test_connections_reused_and_bounded(self, temp_db_path) -> None:
+        """Test that concurrent reads share a bounded set of connections."""
+        db = SQLiteDB(db_path=temp_db_path, read_pool_size=2)
+        try:
+            await db.initialize_schema()
+            await asyncio.gather(*(db.fetch_all("SELECT * FROM databases") for _ in range(20)))
+
+            assert len(db._readers) == 2
+            assert db._writer is not None
+        finally:
+            await db.close()
+
+    async def test_failed_write_rolls_back(self, temp_db_path) -> None:
+        """Test that a failed write leaves the shared writer usable."""
+        db = SQLiteDB(db_path=temp_db_path)
+        try:
+            await db.initialize_schema()
+            await db.execute(
+                "INSERT INTO databases (name, url, db_type) VALUES ('a', 'sqlite://', 'sqlite')"
+            )
+            with pytest.raises(sqlite3.IntegrityError):
+                await db.execute(
+                    "INSERT INTO databases (name, url, db_type) VALUES ('a', 'sqlite://', 'sqlite')"
+                )
+            cursor = await db.execute(
+                "INSERT INTO databases (name, url, db_type) VALUES ('b', 'sqlite://', 'sqlite')"
+            )
+
+            assert cursor.lastrowid == 2
+            assert len(await db.fetch_all("SELECT id FROM databases")) == 2
+        finally:
+            await db.close()
+
+    async def test_readers_are_read_only(self, temp_db_path) -> None:
+        """Test that reads never go through a connection that can write."""
+        db = SQLiteDB(db_path=temp_db_path)
+        try:
+            await db.initialize_schema()
+
+            with pytest.raises(sqlite3.OperationalError, match="readonly|read-only|read only"):
+                await db.fetch_all(
+                    "INSERT INTO databases (name, url, db_type) VALUES ('a', 'sqlite://', 'sqlite') "
+                    "RETURNING id"
+                )
+
+            # A read is served while the writer holds an open transaction
+            async with db.transaction() as conn:
+                await conn.execute(
+                    "INSERT INTO databases (name, url, db_type) VALUES ('b', 'sqlite://', 'sqlite')"
+                )
+                rows = await asyncio.wait_for(db.fetch_all("SELECT name FROM databases"), 1)
+                assert rows == []
+
+            assert await db.fetch_all("SELECT name FROM databases") == [{"name": "b"}]
+        finally:
+            await db.close()
+
+    async def test_fetch_models_builds_typed_rows(self, temp_db_path) -> None:
+        """Test that typed fetches parse stored timestamps and booleans."""
+        from datetime import datetime
+
+        from pydantic import BaseModel
+
+        class Row(BaseModel):
+            name: str
+            created_at: datetime
+            last_connected_at: datetime | None
+            is_active: bool
+
+        db = SQLiteDB(db_path=temp_db_path)
+        try:
+            await db.initialize_schema()
+            await db.execute(
+                "INSERT INTO databases (name, url, db_type, created_at) "
+                "VALUES ('a', 'sqlite://', 'sqlite', '2026-01-02 03:04:05.123456')"
+            )
+
+            rows = await db.fetch_models(
+                "SELECT name, created_at, last_connected_at, is_active FROM databases",
+                None,
+                Row,
+            )
+
+            assert rows == [
+                Row(
+                    name="a",
+                    created_at=datetime(2026, 1, 2, 3, 4, 5, 123456),
+                    last_connected_at=None,
+                    is_active=True,
+                )
+            ]
+        finally:
+            await db.close()
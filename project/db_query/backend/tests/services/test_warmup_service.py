@@ -0,0 +1,63 @@
+"""Unit tests for the startup warm-up service."""
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.core.engine_registry import get_engine_registry
+from src.models.database import DatabaseCreateRequest
+from src.services.db_service import DatabaseService
+from src.services.warmup_service import WarmupService
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+class TestWarmupService:
+    """Test suite for WarmupService."""
+
+    async def test_warm_up_builds_engine_and_metadata(self, temp_db_path) -> None:
+        """Test that warm-up registers engines and caches metadata."""
+        target_path = temp_db_path.with_name(temp_db_path.stem + "_warm.db")
+        seed = create_engine(f"sqlite:///{target_path}")
+        with seed.begin() as conn:
+            conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+        seed.dispose()
+
+        try:
+            db_service = DatabaseService()
+            database = await db_service.create_database(
+                DatabaseCreateRequest(name="warm", url=f"sqlite:///{target_path}")
+            )
+            await db_service.create_database(
+                DatabaseCreateRequest(name="broken", url=f"sqlite:///{target_path}")
+            )
+            # Point the second database at a path that cannot be opened
+            await db_service.db.execute(
+                "UPDATE databases SET url = 'sqlite:////nonexistent/dir/x.db' WHERE name = 'broken'"
+            )
+            db_service.descriptors.invalidate(name="broken")
+
+            warmup = WarmupService(concurrency=2)
+            assert not warmup.ready
+            await warmup.warm_up()
+
+            status = warmup.get_status()
+            assert warmup.ready
+            assert status["status"] == "ready"
+            assert status["databases"] == 2
+            assert status["warmed"] == 1
+            assert status["failed"] == ["broken"]
+            assert database.id in get_engine_registry()
+
+            warmed = await db_service.get_database_by_name("warm")
+            assert "items" in warmed.metadata_json
+        finally:
+            get_engine_registry().dispose_all()
+            target_path.unlink(missing_ok=True)
+
+    async def test_mark_ready_without_warm_up(self) -> None:
+        """Test that readiness can be reported when warm-up is disabled."""
+        warmup = WarmupService()
+
+        assert warmup.get_status()["status"] == "warming_up"
+        warmup.mark_ready()
+        assert warmup.get_status()["status"] == "ready"
@@ -5,6 +5,7 @@ from typing import Any
 from unittest.mock import MagicMock
 
 from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
 
 
 class DatabaseTestHelper:
@@ -19,7 +20,12 @@ class DatabaseTestHelper:
         """
         from src.models.database import DatabaseDetail
 
-        engine = create_engine("sqlite:///:memory:")
+        # One connection shared by all threads, as sync engines are used from worker threads
+        engine = create_engine(
+            "sqlite:///:memory:",
+            poolclass=StaticPool,
+            connect_args={"check_same_thread": False},
+        )
 
         # Create test schema
         with engine.connect() as conn: